@@ -1,11 +1,43 @@
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta
+from functools import lru_cache
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
+from core_allocator import CoreAllocator
+from jobs import (
+    DEFAULT_MAX_FINISHED_JOBS,
+    DEFAULT_MAX_QUEUED_JOBS,
+    DEFAULT_MAX_WORKERS,
+    EVENT_DONE,
+    EVENT_SOLUTION,
+    JOB_SUCCEEDED,
+    DuplicateJobError,
+    JobManager,
+    QueueFullError,
+)
 from jsonschema import Draft202012Validator
+from result_cache import (
+    DEFAULT_CHUNK_CACHE_SIZE,
+    DEFAULT_RESULT_CACHE_SIZE,
+    ResultCache,
+    planning_cache_key,
+)
+from solver.availability import AvailabilityTensor
+from solver.calendar import Calendar, format_day_label
+from solver.compiled_config import CompiledConfig, compile_config, config_content_hash
 from solver.engine import generate_planning as generate_planning_engine
+from solver.engine import preflight_planning
+from solver.preview import preview_planning
+from solver.pool import (
+    DEFAULT_SOLVER_PROCESS_CPUS,
+    DEFAULT_SOLVER_PROCESSES,
+    SolverPool,
+    SolverWorkerError,
+)
 
 app = Flask(__name__)
 CORS(app)
@@ -15,8 +47,31 @@ CONFIG_PATH = os.path.join(BASE_DIR, "config.json")
 DEFAULT_CONFIG_PATH = os.path.join(BASE_DIR, "config.example.json")
 CONFIG_SCHEMA_PATH = os.path.join(BASE_DIR, "config.schema.json")
 _active_config = None
+_compiled_config = None
+_job_manager = None
+_result_cache = None
+_chunk_cache = None
+_plan_history = None
+_solver_pool = None
+_core_allocator = None
 config = None
 
+SSE_KEEPALIVE_SECONDS = 15
+CANCEL_WAIT_SECONDS = 5
+DEFAULT_RECONCILIATION_MAX_TIME_SECONDS = 60
+
+CHUNK_PHASE_RELAXED = "relaxed"
+CHUNK_PHASE_BOUNDARY_CHECK = "boundary_check"
+CHUNK_PHASE_BOUNDARY_REPAIR = "boundary_repair"
+
+HINT_SOURCE_DRAFT = "draft"
+HINT_SOURCE_PREVIOUS_PLAN = "previous_plan"
+HINT_SOURCE_PREVIOUS_WEEK = "previous_week"
+
+PLANNING_MODE_SOLVE = "solve"
+PLANNING_MODE_PREVIEW = "preview"
+PLANNING_MODES = (PLANNING_MODE_SOLVE, PLANNING_MODE_PREVIEW)
+
 
 def _load_json_file(path):
     with open(path, "r", encoding="utf-8") as json_file:
@@ -72,9 +127,22 @@ def save_config(config_data):
     os.replace(temp_path, CONFIG_PATH)
 
 
+def _compile_active_config(config_data):
+    # Reuse the compiled config when the installed content has not changed.
+    content_hash = config_content_hash(config_data)
+    if _compiled_config is not None and _compiled_config.content_hash == content_hash:
+        return replace(_compiled_config, config=config_data)
+    try:
+        return compile_config(config_data, content_hash)
+    except (KeyError, TypeError, ValueError):
+        # Invalid configs are reported when a request needs the compiled config.
+        return None
+
+
 def set_active_config(config_data):
-    global _active_config, config
+    global _active_config, _compiled_config, config
     _active_config = config_data
+    _compiled_config = _compile_active_config(config_data)
     config = config_data
 
 
@@ -82,14 +150,110 @@ def get_active_config():
     global _active_config, config
     if _active_config is None:
         try:
-            _active_config = load_config()
+            set_active_config(load_config())
         except FileNotFoundError:
-            _active_config = load_default_config()
-        config = _active_config
+            set_active_config(load_default_config())
     return _active_config
 
 
-FRENCH_WEEKDAY_ABBREVIATIONS = ["Lun", "Mar", "Mer", "Jeu", "Ven", "Sam", "Dim"]
+def get_compiled_config():
+    """Returns the compiled form of the active config, compiling it if needed."""
+    global _compiled_config
+    runtime_config = get_active_config()
+    if _compiled_config is None or _compiled_config.config is not runtime_config:
+        _compiled_config = compile_config(runtime_config)
+    return _compiled_config
+
+
+def get_job_manager():
+    """Returns the background planning job pool, created from the `server` config section."""
+    global _job_manager
+    if _job_manager is None:
+        server_config = get_active_config().get("server", {})
+        _job_manager = JobManager(
+            max_workers=int(server_config.get("max_workers", DEFAULT_MAX_WORKERS)),
+            max_finished_jobs=int(
+                server_config.get("max_finished_jobs", DEFAULT_MAX_FINISHED_JOBS)
+            ),
+            max_queued_jobs=int(server_config.get("max_queued_jobs", DEFAULT_MAX_QUEUED_JOBS)),
+        )
+    return _job_manager
+
+
+def get_core_allocator():
+    """Returns the allocator sharing `server.cpu_cores` between concurrent searches."""
+    global _core_allocator
+    if _core_allocator is None:
+        server_config = get_active_config().get("server", {})
+        _core_allocator = CoreAllocator(server_config.get("cpu_cores"))
+    return _core_allocator
+
+
+def get_result_cache():
+    """Returns the planning result cache, created from the `server` config section."""
+    global _result_cache
+    if _result_cache is None:
+        server_config = get_active_config().get("server", {})
+        cache_dir = server_config.get("result_cache_dir")
+        if cache_dir is not None:
+            cache_dir = os.path.join(BASE_DIR, cache_dir)
+        _result_cache = ResultCache(
+            max_entries=int(server_config.get("result_cache_size", DEFAULT_RESULT_CACHE_SIZE)),
+            directory=cache_dir,
+        )
+    return _result_cache
+
+
+def get_chunk_cache():
+    """Returns the cache of solved monthly chunks, created from the `server` config section."""
+    global _chunk_cache
+    if _chunk_cache is None:
+        server_config = get_active_config().get("server", {})
+        cache_dir = server_config.get("result_cache_dir")
+        if cache_dir is not None:
+            cache_dir = os.path.join(BASE_DIR, cache_dir, "chunks")
+        _chunk_cache = ResultCache(
+            max_entries=int(server_config.get("chunk_cache_size", DEFAULT_CHUNK_CACHE_SIZE)),
+            directory=cache_dir,
+        )
+    return _chunk_cache
+
+
+def get_plan_history():
+    """
+    Returns the last planning solved for each chunk dates, used as warm-start hints.
+
+    Unlike the chunk cache, it is kept when the configuration changes.
+    """
+    global _plan_history
+    if _plan_history is None:
+        server_config = get_active_config().get("server", {})
+        _plan_history = ResultCache(
+            max_entries=int(server_config.get("chunk_cache_size", DEFAULT_CHUNK_CACHE_SIZE))
+        )
+    return _plan_history
+
+
+def get_solver_pool():
+    """
+    Returns the solver process pool, created from the `server` config section.
+
+    Returns None when `server.solver_processes` is 0: searches then run in the
+    Flask process.
+    """
+    global _solver_pool
+    if _solver_pool is None:
+        server_config = get_active_config().get("server", {})
+        processes = int(server_config.get("solver_processes", DEFAULT_SOLVER_PROCESSES))
+        if processes <= 0:
+            return None
+        _solver_pool = SolverPool(
+            processes,
+            cpus_per_process=int(
+                server_config.get("solver_process_cpus", DEFAULT_SOLVER_PROCESS_CPUS)
+            ),
+        )
+    return _solver_pool
 
 
 @app.route("/")
@@ -127,58 +291,100 @@ def update_config_route():
 
     save_config(payload)
     set_active_config(payload)
+    get_result_cache().clear()
+    get_chunk_cache().clear()
     return jsonify(payload)
 
 
-@app.route("/generate-planning", methods=["POST"])
-def generate_planning_route():
-    payload, payload_error = parse_json_object_payload()
-    if payload_error is not None:
-        return payload_error
+@dataclass
+class PlanningRequest:
+    """
+    A validated planning request, ready to be solved.
+
+    Attributes:
+        compiled_config (CompiledConfig): The compiled active configuration.
+        start_date (datetime): First planned day.
+        end_date (datetime): Last planned day.
+        initial_shifts (dict): Validated initial shifts of the first chunk.
+        calendar (Calendar): Calendar of the week before ``start_date`` and the planned days.
+        availability (AvailabilityTensor): Agent availability over ``calendar``.
+        draft_planning (dict): Validated draft shifts, used as solver hints.
+        mode (str): "solve" to run CP-SAT, "preview" for a fast approximate planning.
+    """
+    compiled_config: CompiledConfig
+    start_date: datetime
+    end_date: datetime
+    initial_shifts: dict
+    calendar: Calendar
+    availability: AvailabilityTensor
+    draft_planning: dict = field(default_factory=dict)
+    mode: str = PLANNING_MODE_SOLVE
 
-    runtime_config = get_active_config()
 
-    # Retrieving data from the JSON file
-    agents = runtime_config["agents"]
-    vacations = runtime_config["vacations"]
-    vacation_durations = runtime_config["vacation_durations"]
-    holidays = runtime_config["holidays"]
-    unavailable = {}
-    dayOff = {}
-    training = {}
+def validate_shift_table(shift_table, field_name, shift_name, compiled_config):
+    """
+    Validates a table of [day, vacation] shifts per agent name.
+
+    :param shift_table: The table read from the payload.
+    :param field_name: The payload field holding the table, used in error messages.
+    :type field_name: str
+    :param shift_name: The name of one shift of the table, used in error messages.
+    :type shift_name: str
+    :param compiled_config: The compiled active configuration.
+    :type compiled_config: CompiledConfig
+    :return: None, or an (error body, status code) pair.
+    :rtype: Tuple[dict, int] | None
+    """
+    if not isinstance(shift_table, dict):
+        return {"error": f"{field_name} must be an object"}, 400
 
-    # Retrieve agent training days and store them in a dictionary {agent: [days]}.
-    for agent in agents:
-        if "training" in agent:
-            training[agent["name"]] = agent["training"]
+    valid_agents = compiled_config.agent_index
+    valid_vacations = compiled_config.vacation_index
+    for agent_name, shifts in shift_table.items():
+        if not isinstance(shifts, list):
+            return {"error": f"{field_name} for {agent_name} must be a list"}, 400
+        if agent_name not in valid_agents:
+            return {"error": f"Invalid agent: {agent_name}"}, 400
+        for shift in shifts:
+            if (
+                not isinstance(shift, (list, tuple))
+                or len(shift) != 2
+                or not isinstance(shift[0], str)
+                or not isinstance(shift[1], str)
+            ):
+                return (
+                    {"error": f"Each {shift_name} must be [day, vacation] with string values"},
+                    400,
+                )
+            _, vacation = shift
+            if vacation not in valid_vacations:
+                return {"error": f"Invalid vacation: {vacation}"}, 400
+    return None
 
-    # Retrieve agent unavailability days and store them in a dictionary {agent: [days]}.
-    for agent in agents:
-        if "unavailable" in agent:
-            unavailable[agent["name"]] = agent["unavailable"]
 
-    # Recovering employees' leave days
-    for agent in agents:
-        # Check if the agent has leave days
-        if "vacations" in agent:
-            dayOff[agent["name"]] = []
-            # Browse each leave day period
-            for vac in agent["vacations"]:
-                # Check if the leave period is a dictionary and contains the start and end keys
-                if isinstance(vac, dict) and "start" in vac and "end" in vac:
-                    # Store leave days in a dictionary {agent: [start, end]}
-                    dayOff[agent["name"]].append([vac["start"], vac["end"]])
+def prepare_planning_request(payload):
+    """
+    Validates a planning payload against the active configuration.
+
+    :param payload: The JSON payload of the request.
+    :type payload: dict
+    :return: The planning request and None, or None and an (error body, status code) pair.
+    :rtype: Tuple[PlanningRequest | None, Tuple[dict, int] | None]
+    """
+    try:
+        compiled_config = get_compiled_config()
+    except ValueError as exc:
+        return None, ({"error": str(exc)}, 400)
 
     # Retrieve start and end dates
     # Check whether the dates are present in the payload
     if "start_date" not in payload or "end_date" not in payload:
-        return jsonify({"error": "Missing start_date or end_date"}), 400
-    
+        return None, ({"error": "Missing start_date or end_date"}, 400)
+
     # Check that the dates are valid
     if not is_valid_date(payload["start_date"]) or not is_valid_date(payload["end_date"]):
-        return jsonify({"error": "Invalid date format. Use YYYY-MM-DD."}), 400
+        return None, ({"error": "Invalid date format. Use YYYY-MM-DD."}, 400)
 
-    # Retrieve the complete schedule in several periods
     start_date = datetime.strptime(
         payload["start_date"], "%Y-%m-%d"
     )  # Format date / ISO 8601
@@ -186,76 +392,219 @@ def generate_planning_route():
         payload["end_date"], "%Y-%m-%d"
     )  # Format date / ISO 8601
     if end_date < start_date:
-        return jsonify({"error": "end_date must be greater than or equal to start_date"}), 400
-
-    periods = split_date_range_by_month(start_date, end_date)
-
-    full_planning = {}
-    for agent in agents:
-        agent_name = agent["name"]
-        full_planning[agent_name] = []
+        return None, ({"error": "end_date must be greater than or equal to start_date"}, 400)
 
     # Retrieve initial shifts, if supplied otherwise default to an empty dictionary
     initial_shifts = payload.get("initial_shifts", {})
-    if not isinstance(initial_shifts, dict):
-        return jsonify({"error": "initial_shifts must be an object"}), 400
+    shifts_error = validate_shift_table(
+        initial_shifts, "initial_shifts", "initial shift", compiled_config
+    )
+    if shifts_error is not None:
+        return None, shifts_error
+
+    # An optional draft planning, used as a solver hint only
+    draft_planning = payload.get("draft_planning", {})
+    draft_error = validate_shift_table(
+        draft_planning, "draft_planning", "draft shift", compiled_config
+    )
+    if draft_error is not None:
+        return None, draft_error
+
+    mode = payload.get("mode", PLANNING_MODE_SOLVE)
+    if mode not in PLANNING_MODES:
+        return None, ({"error": "mode must be one of: " + ", ".join(PLANNING_MODES)}, 400)
+
+    # Build the typed calendar and the agent availability once per request,
+    # including the week before the first chunk.
+    holidays = compiled_config.config["holidays"]
+    request_calendar = Calendar.from_range(start_date - timedelta(days=7), end_date, holidays)
+    request_availability = AvailabilityTensor.build(compiled_config.agents, request_calendar)
+
+    planning_request = PlanningRequest(
+        compiled_config=compiled_config,
+        start_date=start_date,
+        end_date=end_date,
+        initial_shifts=initial_shifts,
+        calendar=request_calendar,
+        availability=request_availability,
+        draft_planning=draft_planning,
+        mode=mode,
+    )
+    preflight_error = preflight_planning_request(planning_request)
+    if preflight_error is not None:
+        return None, preflight_error
+    return planning_request, None
 
-    # Validate initial shifts
-    valid_agents = [agent["name"] for agent in agents]
-    valid_vacations = vacations
-    for agent_name, shifts in initial_shifts.items():
-        if not isinstance(shifts, list):
-            return jsonify({"error": f"initial_shifts for {agent_name} must be a list"}), 400
-        if agent_name not in valid_agents:
-            return jsonify({"error": f"Invalid agent: {agent_name}"}), 400
-        for shift in shifts:
-            if (
-                not isinstance(shift, (list, tuple))
-                or len(shift) != 2
-                or not isinstance(shift[0], str)
-                or not isinstance(shift[1], str)
-            ):
-                return (
-                    jsonify(
-                        {
-                            "error": (
-                                "Each initial shift must be [day, vacation] with string values"
-                            )
-                        }
-                    ),
-                    400,
-                )
-            _, vacation = shift
-            if vacation not in valid_vacations:
-                return jsonify({"error": f"Invalid vacation: {vacation}"}), 400
 
-    for chunk_start, chunk_end in periods:
-        # Convert the start and end dates into strings
-        start_date_str = chunk_start.strftime("%Y-%m-%d")
-        end_date_str = chunk_end.strftime("%Y-%m-%d")
+def preflight_planning_request(planning_request):
+    """
+    Rejects a request whose chunks fail a necessary condition of feasibility.
 
-        # Calculate the list of days from dates
-        week_schedule = get_week_schedule(start_date_str, end_date_str)
-        previous_week_schedule = get_previous_week_schedule(start_date_str)
+    Each monthly chunk is checked by ``solver.engine.preflight_planning`` before any
+    model is built or any job is queued, so an impossible configuration is answered
+    in milliseconds. Chunks after the first are checked without their previous week,
+    which is not planned yet; the engine checks them again once it is.
 
-        # Calling up the schedule generation function
+    :param planning_request: The validated planning request.
+    :type planning_request: PlanningRequest
+    :return: None, or an (error body, status code) pair listing the failed checks.
+    :rtype: Tuple[dict, int] | None
+    """
+    compiled_config = planning_request.compiled_config
+    runtime_config = compiled_config.config
+    periods = split_date_range_by_month(planning_request.start_date, planning_request.end_date)
+    issues = []
+    for chunk_idx in range(len(periods)):
+        chunk_info = _chunk_info(chunk_idx, periods)
+        chunk_availability = _chunk_availability(planning_request, chunk_info)
+        chunk_calendar = chunk_availability.calendar
         try:
-            result = generate_planning(
-                agents,
-                vacations,
-                week_schedule,
-                dayOff,
-                previous_week_schedule,
-                initial_shifts,
-                planning_start_date=start_date_str,
-                runtime_config=runtime_config,
+            chunk_issues = preflight_planning(
+                runtime_config["agents"],
+                runtime_config["vacations"],
+                chunk_calendar.labels[7:],
+                compiled_config.day_off,
+                chunk_calendar.labels[:7],
+                planning_request.initial_shifts if chunk_idx == 0 else {},
+                runtime_config,
+                planning_start_date=chunk_info["chunk_start"],
+                calendar=chunk_calendar,
+                availability=chunk_availability,
+                compiled_config=compiled_config,
             )
         except ValueError as exc:
-            return jsonify({"error": str(exc)}), 400
+            return {"error": str(exc)}, 400
+        issues.extend(
+            {"chunk_start": chunk_info["chunk_start"], "chunk_end": chunk_info["chunk_end"], **issue}
+            for issue in chunk_issues
+        )
+    if not issues:
+        return None
+    return {
+        "error": f"Planning is infeasible: {len(issues)} preflight check(s) failed",
+        "issues": issues,
+    }, 400
+
+
+def planning_request_cache_key(planning_request):
+    """Returns the result cache key of a validated planning request."""
+    return planning_cache_key(
+        planning_request.compiled_config.content_hash,
+        planning_request.start_date.strftime("%Y-%m-%d"),
+        planning_request.end_date.strftime("%Y-%m-%d"),
+        planning_request.initial_shifts,
+    )
+
+
+def run_planning_request(planning_request, on_solution=None, control=None):
+    """
+    Solves a prepared planning request, one monthly chunk after the other.
+
+    Once ``control`` is cancelled, the running chunk stops with its best solution so
+    far and the remaining chunks are skipped; the chunks planned until then are
+    returned with ``"cancelled": true``. ``"solver_runs"`` reports, for each solved chunk,
+    the solver status and the rule that stopped its search.
+
+    Each chunk solution is memoized by the config hash, the chunk dates and the shifts
+    carried into the chunk, so a request overlapping or extending an earlier one only
+    solves its new chunks; ``"solver_runs"`` marks reused chunks with ``"cached": true``.
+
+    With ``solver.parallel_chunks``, all chunks are first solved at the same time with
+    relaxed boundaries (``_solve_relaxed_chunks``), then each boundary is reconciled
+    in order (``_reconcile_chunk``); ``"solver_runs"`` entries then carry a ``"phase"``.
+
+    In ``"preview"`` mode, each chunk is planned by ``solver.preview.preview_planning``
+    instead of CP-SAT, without the chunk cache, and the response is marked
+    ``"preview": true``: the planning is approximate, never proven optimal.
+
+    :param planning_request: The validated planning request.
+    :type planning_request: PlanningRequest
+    :param on_solution: Called with each improving solution of each chunk, tagged with
+        the chunk index and dates (see ``solver.engine.PlanningSolutionCallback``).
+    :type on_solution: Callable[[dict], None] | None
+    :param control: Cancels the solves of the request from another thread.
+    :type control: SolveControl | None
+    :return: The response body and its HTTP status code.
+    :rtype: Tuple[dict, int]
+    """
+    compiled_config = planning_request.compiled_config
+    runtime_config = compiled_config.config
+
+    # Agent dates, index maps and per-agent day lists are compiled once per config
+    agents = runtime_config["agents"]
+    vacation_durations = runtime_config["vacation_durations"]
+    holidays = runtime_config["holidays"]
+    unavailable = compiled_config.unavailable
+    dayOff = compiled_config.day_off
+    training = compiled_config.training
+
+    # Retrieve the complete schedule in several periods
+    periods = split_date_range_by_month(planning_request.start_date, planning_request.end_date)
+
+    full_planning = {}
+    for agent in agents:
+        agent_name = agent["name"]
+        full_planning[agent_name] = []
+
+    solver_config = runtime_config.get("solver", {})
+    preview = planning_request.mode == PLANNING_MODE_PREVIEW
+    parallel = (
+        bool(solver_config.get("parallel_chunks", False)) and len(periods) > 1 and not preview
+    )
+    solver_runs = []
+    if parallel:
+        relaxed_results, error = _solve_relaxed_chunks(
+            planning_request, periods, solver_runs, on_solution=on_solution, control=control
+        )
+        if error is not None:
+            return error
+
+    initial_shifts = planning_request.initial_shifts
+    for chunk_idx, (chunk_start, chunk_end) in enumerate(periods):
+        chunk_info = _chunk_info(chunk_idx, periods)
+        if parallel and chunk_idx == 0:
+            # The first chunk already read the request's own previous week
+            result = relaxed_results[0]
+        elif control is not None and control.cancelled:
+            # Do not start another chunk once the request is cancelled
+            break
+        elif parallel:
+            result, error = _reconcile_chunk(
+                planning_request,
+                chunk_info,
+                initial_shifts,
+                relaxed_results[chunk_idx],
+                solver_runs,
+                on_solution=on_solution,
+                control=control,
+            )
+            if error is not None:
+                return error
+        elif preview:
+            result, error = _preview_chunk(
+                planning_request, chunk_info, initial_shifts, solver_runs, on_solution=on_solution
+            )
+            if error is not None:
+                return error
+        else:
+            result, error = _plan_chunk(
+                planning_request,
+                chunk_info,
+                initial_shifts,
+                solver_runs,
+                on_solution=on_solution,
+                control=control,
+            )
+            if error is not None:
+                return error
+
+        # A chunk stopped before its first solution ends a cancelled request
+        if "info" in result and control is not None and control.cancelled:
+            break
 
         # If the result is a dict with an info key, return a 400 error.
         if "info" in result:
-            return jsonify(result), 400
+            return result, 400
 
         # Accumulate the results of each period in the full planning
         for name, shifts in result.items():
@@ -265,37 +614,685 @@ def generate_planning_route():
             full_planning[name].extend(shifts)
 
         # Prepare initial_shifts for the next iteration
-        # Recalculate the previous_week_schedule for the day following chunk_end
-        next_start = chunk_end + timedelta(days=1)
-        next_previous = get_previous_week_schedule(next_start.strftime("%Y-%m-%d"))
-
-        new_intial_shifts = {}
-        for name, shifts in full_planning.items():
-            # Only keep shifts from the previous week
-            selected = []
-            for day, vacation in shifts:
-                if day in next_previous:
-                    selected.append((day, vacation))
-            if selected:
-                new_intial_shifts[name] = selected
-
-        initial_shifts = new_intial_shifts
+        initial_shifts = _carried_shifts(planning_request, full_planning, chunk_end)
 
     # Once all segments have been calculated, return everything
-    original_week_schedule = get_week_schedule(
-        payload["start_date"], payload["end_date"]
+    original_week_schedule = planning_request.calendar.labels[7:]
+    body = {
+        "planning": full_planning,
+        "vacation_durations": vacation_durations,
+        "week_schedule": original_week_schedule,
+        "holidays": holidays,
+        "unavailable": unavailable,
+        "dayOff": dayOff,
+        "training": training,
+        "solver_runs": solver_runs,
+    }
+    if preview:
+        body["preview"] = True
+    if control is not None and control.cancelled:
+        body["cancelled"] = True
+    return body, 200
+
+
+def _chunk_info(chunk_idx, periods):
+    chunk_start, chunk_end = periods[chunk_idx]
+    return {
+        "chunk": chunk_idx,
+        "chunks": len(periods),
+        "chunk_start": chunk_start.strftime("%Y-%m-%d"),
+        "chunk_end": chunk_end.strftime("%Y-%m-%d"),
+    }
+
+
+def _carried_shifts(planning_request, planning, chunk_end):
+    """
+    Returns the shifts of ``planning`` carried into the chunk following ``chunk_end``.
+
+    :param planning_request: The validated planning request.
+    :type planning_request: PlanningRequest
+    :param planning: The planning of the chunks solved so far.
+    :type planning: dict
+    :param chunk_end: Last day of the previous chunk.
+    :type chunk_end: datetime
+    :return: The initial shifts of the next chunk, per agent name.
+    :rtype: dict
+    """
+    # The previous week of the day following chunk_end ends on chunk_end
+    next_previous = planning_request.calendar.between(
+        chunk_end - timedelta(days=6), chunk_end
+    ).labels
+
+    carried_shifts = {}
+    for name, shifts in planning.items():
+        # Only keep shifts from the previous week
+        selected = []
+        for day, vacation in shifts:
+            if day in next_previous:
+                selected.append((day, vacation))
+        if selected:
+            carried_shifts[name] = selected
+    return carried_shifts
+
+
+def _warm_start_hint(planning_request, chunk_info, initial_shifts):
+    """
+    Picks the closest prior planning of a chunk, to hint its solve.
+
+    In order of preference: the shifts of the request's ``draft_planning`` within the
+    chunk, the last planning solved for the same chunk dates (possibly under another
+    configuration), or, when ``solver.greedy_hint`` is off, the shifts carried in from
+    the previous week repeated on the same weekdays. Otherwise the engine hints the
+    solve with its greedy planning.
+
+    :param planning_request: The validated planning request.
+    :type planning_request: PlanningRequest
+    :param chunk_info: Chunk index and dates (see ``_chunk_info``).
+    :type chunk_info: dict
+    :param initial_shifts: Shifts carried into the chunk from its previous week.
+    :type initial_shifts: dict
+    :return: The hint and its source ("draft", "previous_plan" or "previous_week"), or (None, None).
+    :rtype: Tuple[dict | None, str | None]
+    """
+    chunk_start = datetime.strptime(chunk_info["chunk_start"], "%Y-%m-%d")
+    chunk_end = datetime.strptime(chunk_info["chunk_end"], "%Y-%m-%d")
+    chunk_days = planning_request.calendar.between(chunk_start, chunk_end).days
+
+    chunk_labels = {day.label for day in chunk_days}
+    draft = {
+        name: [(day, vacation) for day, vacation in shifts if day in chunk_labels]
+        for name, shifts in planning_request.draft_planning.items()
+    }
+    if any(draft.values()):
+        return draft, HINT_SOURCE_DRAFT
+
+    previous_plan = get_plan_history().get(
+        f"{chunk_info['chunk_start']}_{chunk_info['chunk_end']}"
+    )
+    if previous_plan is not None:
+        return previous_plan, HINT_SOURCE_PREVIOUS_PLAN
+    if planning_request.compiled_config.config.get("solver", {}).get("greedy_hint", True):
+        return None, None
+
+    previous_weekdays = {
+        day.label: day.weekday
+        for day in planning_request.calendar.between(
+            chunk_start - timedelta(days=7), chunk_start - timedelta(days=1)
+        ).days
+    }
+    rotation = {}
+    for name, shifts in initial_shifts.items():
+        by_weekday = {
+            previous_weekdays[day]: vacation for day, vacation in shifts if day in previous_weekdays
+        }
+        rotation[name] = [
+            (day.label, by_weekday[day.weekday]) for day in chunk_days if day.weekday in by_weekday
+        ]
+    if any(rotation.values()):
+        return rotation, HINT_SOURCE_PREVIOUS_WEEK
+    return None, None
+
+
+def _plan_chunk(
+    planning_request,
+    chunk_info,
+    initial_shifts,
+    solver_runs,
+    on_solution=None,
+    control=None,
+    phase=None,
+    **solve_kwargs,
+):
+    """
+    Returns the planning of a chunk, reused from the chunk cache or solved.
+
+    A chunk is reused when it was already solved with the same config and carried-in
+    shifts. Solved chunks are cached, unless the request was cancelled.
+
+    :param planning_request: The validated planning request.
+    :type planning_request: PlanningRequest
+    :param chunk_info: Chunk index and dates (see ``_chunk_info``).
+    :type chunk_info: dict
+    :param initial_shifts: Shifts carried into the chunk from its previous week.
+    :type initial_shifts: dict
+    :param solver_runs: Receives the solver summary of the chunk.
+    :type solver_runs: list
+    :param on_solution: Called with each improving solution of the chunk.
+    :type on_solution: Callable[[dict], None] | None
+    :param control: Cancels the solve from another thread.
+    :type control: SolveControl | None
+    :param phase: Step of a parallel solve, added to the solver summary.
+    :type phase: str | None
+    :return: The chunk result (an "info" dict when no solution was found) and None, or None and an (error body, status code) pair.
+    :rtype: Tuple[dict | None, Tuple[dict, int] | None]
+    """
+    compiled_config = planning_request.compiled_config
+    chunk_cache = get_chunk_cache()
+    chunk_key = planning_cache_key(
+        compiled_config.content_hash,
+        chunk_info["chunk_start"],
+        chunk_info["chunk_end"],
+        initial_shifts,
+    )
+    result = chunk_cache.get(chunk_key)
+    if result is not None:
+        run = {
+            "chunk_start": chunk_info["chunk_start"],
+            "chunk_end": chunk_info["chunk_end"],
+            "cached": True,
+        }
+        if phase is not None:
+            run["phase"] = phase
+        solver_runs.append(run)
+        if on_solution is not None:
+            on_solution(
+                {
+                    **chunk_info,
+                    "objective": None,
+                    "best_bound": None,
+                    "elapsed": 0,
+                    "planning": result,
+                    "cached": True,
+                }
+            )
+        return result, None
+
+    hint_source = None
+    solver_config = compiled_config.config.get("solver", {})
+    if "hint" not in solve_kwargs and solver_config.get("warm_start", True):
+        solve_kwargs["hint"], hint_source = _warm_start_hint(
+            planning_request, chunk_info, initial_shifts
+        )
+
+    result, error = _solve_chunk(
+        planning_request,
+        chunk_info,
+        initial_shifts,
+        solver_runs,
+        on_solution=on_solution,
+        control=control,
+        phase=phase,
+        hint_source=hint_source,
+        **solve_kwargs,
+    )
+    if error is not None:
+        return None, error
+    # A cancelled search may have stopped early, so its chunk is not reused
+    if "info" not in result and (control is None or not control.cancelled):
+        chunk_cache.put(chunk_key, result)
+        get_plan_history().put(f"{chunk_info['chunk_start']}_{chunk_info['chunk_end']}", result)
+    return result, None
+
+
+def _solve_relaxed_chunks(planning_request, periods, solver_runs, on_solution=None, control=None):
+    """
+    Solves every chunk of a request at the same time (``solver.parallel_chunks``).
+
+    The first chunk reads the request's own previous week. The other chunks are
+    solved with an unknown previous week, so continuity rules ignore their boundary
+    until ``_reconcile_chunk`` checks it. Each chunk counts as a request of its own
+    in the core allocator.
+
+    :param planning_request: The validated planning request.
+    :type planning_request: PlanningRequest
+    :param periods: The (start, end) dates of the chunks.
+    :type periods: List[Tuple[datetime, datetime]]
+    :param solver_runs: Receives the solver summaries, in chunk order.
+    :type solver_runs: list
+    :param on_solution: Called with each improving solution of each chunk.
+    :type on_solution: Callable[[dict], None] | None
+    :param control: Cancels the solves from another thread.
+    :type control: SolveControl | None
+    :return: The chunk results and None, or None and an (error body, status code) pair.
+    :rtype: Tuple[List[dict] | None, Tuple[dict, int] | None]
+    """
+    allocator = get_core_allocator()
+    chunk_runs = [[] for _ in periods]
+
+    def solve_relaxed(chunk_idx):
+        initial_shifts = planning_request.initial_shifts if chunk_idx == 0 else {}
+        with allocator.session():
+            return _plan_chunk(
+                planning_request,
+                _chunk_info(chunk_idx, periods),
+                initial_shifts,
+                chunk_runs[chunk_idx],
+                on_solution=on_solution,
+                control=control,
+                phase=CHUNK_PHASE_RELAXED,
+            )
+
+    with ThreadPoolExecutor(
+        max_workers=len(periods), thread_name_prefix="planning-chunk"
+    ) as executor:
+        outcomes = list(executor.map(solve_relaxed, range(len(periods))))
+
+    for runs in chunk_runs:
+        solver_runs.extend(runs)
+    for _, error in outcomes:
+        if error is not None:
+            return None, error
+    return [result for result, _ in outcomes], None
+
+
+def _reconcile_chunk(
+    planning_request,
+    chunk_info,
+    initial_shifts,
+    relaxed_result,
+    solver_runs,
+    on_solution=None,
+    control=None,
+):
+    """
+    Repairs the boundary of a chunk solved by ``_solve_relaxed_chunks``.
+
+    The relaxed planning is first checked against the shifts carried in from the
+    final planning of the previous chunk, with every cell fixed to its relaxed value.
+    When the continuity rules reject it, the chunk is solved again from that
+    planning as a hint, within ``solver.reconciliation_max_time_seconds``.
+
+    :param planning_request: The validated planning request.
+    :type planning_request: PlanningRequest
+    :param chunk_info: Chunk index and dates (see ``_chunk_info``).
+    :type chunk_info: dict
+    :param initial_shifts: Shifts carried into the chunk from the previous chunk.
+    :type initial_shifts: dict
+    :param relaxed_result: The planning of the chunk solved with an unknown previous week.
+    :type relaxed_result: dict
+    :param solver_runs: Receives the solver summaries of the chunk.
+    :type solver_runs: list
+    :param on_solution: Called with each improving solution of the repair solve.
+    :type on_solution: Callable[[dict], None] | None
+    :param control: Cancels the solves from another thread.
+    :type control: SolveControl | None
+    :return: The chunk result and None, or None and an (error body, status code) pair.
+    :rtype: Tuple[dict | None, Tuple[dict, int] | None]
+    """
+    # Without carried-in shifts the relaxed boundary is the real one
+    if "info" in relaxed_result or not initial_shifts:
+        return relaxed_result, None
+
+    checked, error = _plan_chunk(
+        planning_request,
+        chunk_info,
+        initial_shifts,
+        solver_runs,
+        control=control,
+        phase=CHUNK_PHASE_BOUNDARY_CHECK,
+        hint=relaxed_result,
+        fix_hint=True,
     )
-    return jsonify(
+    if error is not None or "info" not in checked:
+        return checked, error
+
+    solver_config = planning_request.compiled_config.config.get("solver", {})
+    return _plan_chunk(
+        planning_request,
+        chunk_info,
+        initial_shifts,
+        solver_runs,
+        on_solution=on_solution,
+        control=control,
+        phase=CHUNK_PHASE_BOUNDARY_REPAIR,
+        hint=relaxed_result,
+        max_time_seconds=solver_config.get(
+            "reconciliation_max_time_seconds", DEFAULT_RECONCILIATION_MAX_TIME_SECONDS
+        ),
+    )
+
+
+def _chunk_availability(planning_request, chunk_info):
+    """Slices the previous week and the days of a chunk out of the request availability."""
+    chunk_start = datetime.strptime(chunk_info["chunk_start"], "%Y-%m-%d")
+    chunk_end = datetime.strptime(chunk_info["chunk_end"], "%Y-%m-%d")
+    return planning_request.availability.between(chunk_start - timedelta(days=7), chunk_end)
+
+
+def _preview_chunk(planning_request, chunk_info, initial_shifts, solver_runs, on_solution=None):
+    """
+    Plans one monthly chunk of a preview request, without CP-SAT.
+
+    :param planning_request: The validated planning request.
+    :type planning_request: PlanningRequest
+    :param chunk_info: Chunk index and dates, added to the reported planning.
+    :type chunk_info: dict
+    :param initial_shifts: Shifts carried into the chunk from its previous week.
+    :type initial_shifts: dict
+    :param solver_runs: Receives the preview summary of the chunk.
+    :type solver_runs: list
+    :param on_solution: Called once with the planning of the chunk.
+    :type on_solution: Callable[[dict], None] | None
+    :return: The chunk planning and None, or None and an (error body, status code) pair.
+    :rtype: Tuple[dict | None, Tuple[dict, int] | None]
+    """
+    compiled_config = planning_request.compiled_config
+    runtime_config = compiled_config.config
+    chunk_availability = _chunk_availability(planning_request, chunk_info)
+    chunk_calendar = chunk_availability.calendar
+    summaries = []
+    try:
+        result = preview_planning(
+            runtime_config["agents"],
+            runtime_config["vacations"],
+            chunk_calendar.labels[7:],
+            compiled_config.day_off,
+            chunk_calendar.labels[:7],
+            initial_shifts,
+            runtime_config,
+            planning_start_date=chunk_info["chunk_start"],
+            calendar=chunk_calendar,
+            availability=chunk_availability,
+            compiled_config=compiled_config,
+            on_finish=summaries.append,
+        )
+    except ValueError as exc:
+        return None, ({"error": str(exc)}, 400)
+
+    summary = summaries[0]
+    solver_runs.append(
         {
-            "planning": full_planning,
-            "vacation_durations": vacation_durations,
-            "week_schedule": original_week_schedule,
-            "holidays": holidays,
-            "unavailable": unavailable,
-            "dayOff": dayOff,
-            "training": training,
+            "chunk_start": chunk_info["chunk_start"],
+            "chunk_end": chunk_info["chunk_end"],
+            "cached": False,
+            **summary,
         }
     )
+    if on_solution is not None:
+        on_solution(
+            {
+                **chunk_info,
+                "objective": summary["objective"],
+                "best_bound": None,
+                "elapsed": summary["elapsed"],
+                "planning": result,
+            }
+        )
+    return result, None
+
+
+def _solve_chunk(
+    planning_request,
+    chunk_info,
+    initial_shifts,
+    solver_runs,
+    on_solution=None,
+    control=None,
+    phase=None,
+    hint_source=None,
+    **solve_kwargs,
+):
+    """
+    Solves one monthly chunk of a planning request.
+
+    :param planning_request: The validated planning request.
+    :type planning_request: PlanningRequest
+    :param chunk_info: Chunk index and dates, added to each reported solution.
+    :type chunk_info: dict
+    :param initial_shifts: Shifts carried into the chunk from its previous week.
+    :type initial_shifts: dict
+    :param solver_runs: Receives the solver summary of the chunk.
+    :type solver_runs: list
+    :param on_solution: Called with each improving solution of the chunk.
+    :type on_solution: Callable[[dict], None] | None
+    :param control: Cancels the solve from another thread.
+    :type control: SolveControl | None
+    :param phase: Step of a parallel solve, added to the solver summary.
+    :type phase: str | None
+    :param hint_source: Where the warm-start hint comes from, added to the solver summary.
+    :type hint_source: str | None
+    :return: The chunk result and None, or None and an (error body, status code) pair.
+    :rtype: Tuple[dict | None, Tuple[dict, int] | None]
+    """
+    compiled_config = planning_request.compiled_config
+    runtime_config = compiled_config.config
+
+    chunk_on_solution = None
+    if on_solution is not None:
+        def chunk_on_solution(solution):
+            on_solution({**chunk_info, **solution})
+
+    def chunk_on_finish(summary):
+        run = {
+            "chunk_start": chunk_info["chunk_start"],
+            "chunk_end": chunk_info["chunk_end"],
+            "cached": False,
+            **summary,
+        }
+        if phase is not None:
+            run["phase"] = phase
+        if hint_source is not None:
+            # A chunk failing its preflight checks stops before the hint is applied
+            run.setdefault("hint", {})["source"] = hint_source
+        solver_runs.append(run)
+
+    chunk_availability = _chunk_availability(planning_request, chunk_info)
+    chunk_calendar = chunk_availability.calendar
+    previous_week_schedule = chunk_calendar.labels[:7]
+    week_schedule = chunk_calendar.labels[7:]
+
+    # Concurrent requests share the CPU instead of each taking every core
+    requested_workers = int(runtime_config.get("solver", {}).get("num_search_workers", 0))
+
+    # Calling up the schedule generation function
+    try:
+        with get_core_allocator().allocate(requested_workers) as search_workers:
+            result = generate_planning(
+                runtime_config["agents"],
+                runtime_config["vacations"],
+                week_schedule,
+                compiled_config.day_off,
+                previous_week_schedule,
+                initial_shifts,
+                planning_start_date=chunk_info["chunk_start"],
+                runtime_config=runtime_config,
+                calendar=chunk_calendar,
+                availability=chunk_availability,
+                compiled_config=compiled_config,
+                on_solution=chunk_on_solution,
+                control=control,
+                on_finish=chunk_on_finish,
+                num_search_workers=search_workers,
+                **solve_kwargs,
+            )
+    except ValueError as exc:
+        return None, ({"error": str(exc)}, 400)
+    except SolverWorkerError as exc:
+        return None, ({"error": str(exc)}, 500)
+    return result, None
+
+
+def run_planning_job(job, planning_request, stream_solutions=True):
+    """
+    Solves a planning request on the job pool, publishing its improving solutions.
+
+    :param job: The job running the request.
+    :type job: PlanningJob
+    :param planning_request: The validated planning request.
+    :type planning_request: PlanningRequest
+    :param stream_solutions: Whether to publish a "solution" event per improving solution.
+    :type stream_solutions: bool
+    :return: The response body and its HTTP status code.
+    :rtype: Tuple[dict, int]
+    """
+    on_solution = None
+    if stream_solutions:
+        def on_solution(solution):
+            job.publish(EVENT_SOLUTION, solution)
+    with get_core_allocator().session():
+        return run_planning_request(
+            planning_request, on_solution=on_solution, control=job.control
+        )
+
+
+def parse_request_id(payload):
+    """
+    Reads the optional client-chosen ``request_id`` of a planning payload.
+
+    The id names the planning job, so the client can cancel a solve it started with
+    ``DELETE /planning-jobs/<request_id>``, including a synchronous one.
+
+    :param payload: The JSON payload of the request.
+    :type payload: dict
+    :return: The request id (None when absent) and an optional (error body, status code) pair.
+    :rtype: Tuple[str | None, Tuple[dict, int] | None]
+    """
+    request_id = payload.get("request_id")
+    if request_id is None:
+        return None, None
+    if not isinstance(request_id, str) or not request_id.strip() or "/" in request_id:
+        return None, ({"error": "request_id must be a non-empty string without '/'"}, 400)
+    return request_id, None
+
+
+def parse_planning_payload(payload):
+    """
+    Validates a planning payload and its optional ``request_id``.
+
+    :param payload: The JSON payload of the request.
+    :type payload: dict
+    :return: The request id, the planning request and an optional (error body, status code) pair.
+    :rtype: Tuple[str | None, PlanningRequest | None, Tuple[dict, int] | None]
+    """
+    request_id, request_id_error = parse_request_id(payload)
+    if request_id_error is not None:
+        return None, None, request_id_error
+
+    planning_request, request_error = prepare_planning_request(payload)
+    if request_error is not None:
+        return None, None, request_error
+    return request_id, planning_request, None
+
+
+def submit_planning_job(planning_request, request_id=None, **kwargs):
+    """
+    Queues the job of a validated planning request.
+
+    :param planning_request: The validated planning request.
+    :type planning_request: PlanningRequest
+    :param request_id: The client-chosen job id, if any.
+    :type request_id: str | None
+    :return: The queued job and None, or None and an (error body, status code, headers) triple.
+    :rtype: Tuple[PlanningJob | None, Tuple[dict, int, dict] | None]
+    """
+    try:
+        job = get_job_manager().submit(
+            run_planning_job, planning_request, job_id=request_id, **kwargs
+        )
+    except DuplicateJobError as exc:
+        return None, ({"error": str(exc)}, 409, {})
+    except QueueFullError as exc:
+        return None, ({"error": str(exc)}, 429, {"Retry-After": str(exc.retry_after)})
+    return job, None
+
+
+def format_sse_event(event_id, event_type, data):
+    return f"id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.route("/generate-planning", methods=["POST"])
+def generate_planning_route():
+    payload, payload_error = parse_json_object_payload()
+    if payload_error is not None:
+        return payload_error
+
+    request_id, planning_request, request_error = parse_planning_payload(payload)
+    if request_error is not None:
+        body, status_code = request_error
+        return jsonify(body), status_code
+
+    # Previews are answered at once, outside the job pool and the result cache
+    if planning_request.mode == PLANNING_MODE_PREVIEW:
+        body, status_code = run_planning_request(planning_request)
+        return jsonify(body), status_code
+
+    # Identical requests against an unchanged config are answered from the cache
+    result_cache = get_result_cache()
+    cache_key = planning_request_cache_key(planning_request)
+    cached_body = result_cache.get(cache_key)
+    if cached_body is not None:
+        return jsonify({**cached_body, "cached": True}), 200
+
+    # Synchronous wrapper: solve on the job pool and wait for the result
+    job, job_error = submit_planning_job(planning_request, request_id, stream_solutions=False)
+    if job_error is not None:
+        body, status_code, headers = job_error
+        return jsonify(body), status_code, headers
+
+    job.wait()
+    # Cancelled and failed solves are not cached
+    if job.status == JOB_SUCCEEDED and job.status_code == 200:
+        result_cache.put(cache_key, job.result)
+        return jsonify({**job.result, "cached": False}), 200
+    return jsonify(job.result), job.status_code
+
+
+@app.route("/planning-jobs", methods=["POST"])
+def create_planning_job_route():
+    payload, payload_error = parse_json_object_payload()
+    if payload_error is not None:
+        return payload_error
+
+    request_id, planning_request, request_error = parse_planning_payload(payload)
+    if request_error is not None:
+        body, status_code = request_error
+        return jsonify(body), status_code
+
+    job, job_error = submit_planning_job(planning_request, request_id)
+    if job_error is not None:
+        body, status_code, headers = job_error
+        return jsonify(body), status_code, headers
+
+    return jsonify(job.to_dict()), 202, {"Location": f"/planning-jobs/{job.id}"}
+
+
+@app.route("/planning-jobs/<job_id>", methods=["GET"])
+def get_planning_job_route(job_id):
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown planning job: {job_id}"}), 404
+    return jsonify(job.to_dict())
+
+
+@app.route("/planning-jobs/<job_id>", methods=["DELETE"])
+def cancel_planning_job_route(job_id):
+    job = get_job_manager().cancel(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown planning job: {job_id}"}), 404
+
+    # A stopped search returns quickly; report the job as still running otherwise
+    job.wait(timeout=CANCEL_WAIT_SECONDS)
+    return jsonify(job.to_dict()), 200 if job.finished else 202
+
+
+@app.route("/planning-jobs/<job_id>/events", methods=["GET"])
+def stream_planning_job_events_route(job_id):
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown planning job: {job_id}"}), 404
+
+    # Resume after the last event the client received, if it reconnects
+    last_event_id = request.headers.get("Last-Event-ID", "")
+    start = int(last_event_id) + 1 if last_event_id.isdigit() else 0
+
+    def stream():
+        position = start
+        while True:
+            events = job.wait_for_events(position, timeout=SSE_KEEPALIVE_SECONDS)
+            if not events:
+                yield ": keep-alive\n\n"
+                continue
+            for event_type, data in events:
+                yield format_sse_event(position, event_type, data)
+                position += 1
+                if event_type == EVENT_DONE:
+                    return
+
+    return Response(
+        stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 def is_valid_date(date_str):
@@ -386,11 +1383,6 @@ def get_week_schedule(start_date_str, end_date_str):
     ]  # Format : Shortened day + Date (e.g. Lun 25-12)
 
 
-def format_day_label(day_date):
-    day_name = FRENCH_WEEKDAY_ABBREVIATIONS[day_date.weekday()]
-    return f"{day_name}. {day_date.strftime('%d-%m')}"
-
-
 def split_into_weeks(week_schedule):
     # Divide the list of days into calendar weeks (Monday to Sunday)
     weeks = []
@@ -450,6 +1442,11 @@ def _resolve_day_date_from_reference(day_part, reference_date):
     return min(candidates, key=lambda candidate: abs((candidate - reference_date).days))
 
 
+@lru_cache(maxsize=4096)
+def _parse_day_off_date(date_str):
+    return datetime.strptime(date_str, "%d-%m-%Y")
+
+
 def is_vacation_day(agent_name, day, dayOff, planning_start_date=None):
     """Checks whether the day corresponds to leave for the agent,
     by checking all the periods defined in dayOff."""
@@ -458,8 +1455,8 @@ def is_vacation_day(agent_name, day, dayOff, planning_start_date=None):
         for period in dayOff[agent_name]:
             vacation_start, vacation_end = period  # Extract the start and end dates
             # Convert holiday dates and the day into datetime objects for comparison
-            vacation_start_date = datetime.strptime(vacation_start, "%d-%m-%Y")
-            vacation_end_date = datetime.strptime(vacation_end, "%d-%m-%Y")
+            vacation_start_date = _parse_day_off_date(vacation_start)
+            vacation_end_date = _parse_day_off_date(vacation_end)
             try:
                 if planning_start_date is not None:
                     if isinstance(planning_start_date, str):
@@ -534,6 +1531,16 @@ def generate_planning(
     initial_shifts,
     planning_start_date=None,
     runtime_config=None,
+    calendar=None,
+    availability=None,
+    compiled_config=None,
+    on_solution=None,
+    control=None,
+    on_finish=None,
+    num_search_workers=None,
+    max_time_seconds=None,
+    hint=None,
+    fix_hint=False,
 ):
     # Public facade kept stable for existing route and tests.
     effective_runtime_config = runtime_config or get_active_config()
@@ -546,6 +1553,17 @@ def generate_planning(
         initial_shifts=initial_shifts,
         runtime_config=effective_runtime_config,
         planning_start_date=planning_start_date,
+        calendar=calendar,
+        availability=availability,
+        compiled_config=compiled_config,
+        on_solution=on_solution,
+        control=control,
+        on_finish=on_finish,
+        solver_pool=get_solver_pool(),
+        num_search_workers=num_search_workers,
+        max_time_seconds=max_time_seconds,
+        hint=hint,
+        fix_hint=fix_hint,
     )
 
 set_active_config(get_active_config())
@@ -0,0 +1,134 @@
+"""
+Time-to-first-solution benchmark of the greedy hint.
+
+Solves the same synthetic team twice, without a hint (``solver.greedy_hint: false``)
+and hinted with the greedy constructor (``solver/greedy.py``), and reports for each
+run when the first solution was found, counted from the start of
+``generate_planning`` so model build and hint construction are included, its
+objective and the best objective once the search stops. The preview planning of
+``mode: "preview"`` (``solver/preview.py``) is timed first, for comparison. Staffing
+grows with the team, one agent per shift for every ten agents, so larger teams stay
+feasible.
+
+Usage (from backend/):
+    python -m benchmarks.bench_first_solution --agents 60 --days 28 --max-time 30
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from app import get_week_schedule
+from benchmarks.bench_model_build import VACATIONS, build_runtime_config
+from solver.engine import _build_context, generate_planning
+from solver.greedy import construct_planning
+from solver.preview import preview_planning
+
+
+def _run(runtime_config, week_schedule, previous_week_schedule, start_date, greedy_hint):
+    runtime_config = {
+        **runtime_config,
+        "solver": {**runtime_config["solver"], "greedy_hint": greedy_hint},
+    }
+    solutions = []
+    summaries = []
+    started = time.perf_counter()
+
+    def on_solution(solution):
+        solutions.append({**solution, "wall_time": time.perf_counter() - started})
+
+    generate_planning(
+        agents=runtime_config["agents"],
+        vacations=VACATIONS,
+        week_schedule=week_schedule,
+        dayOff={},
+        previous_week_schedule=previous_week_schedule,
+        initial_shifts={},
+        runtime_config=runtime_config,
+        planning_start_date=start_date,
+        on_solution=on_solution,
+        on_finish=summaries.append,
+    )
+    total = time.perf_counter() - started
+    summary = summaries[0]
+    label = "greedy hint" if greedy_hint else "no hint"
+    if not solutions:
+        print(f"{label:<12} no solution ({summary['status']}) after {total:.2f} s")
+        return
+    first = solutions[0]
+    print(
+        f"{label:<12} first solution {first['wall_time']:7.2f} s  objective {first['objective']:9.0f}"
+        f"   final {summary['objective']:9.0f} ({summary['stop_reason']}, {total:.2f} s)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--agents", type=int, default=60)
+    parser.add_argument("--days", type=int, default=28)
+    parser.add_argument("--start-date", default="2026-02-02")
+    parser.add_argument("--max-time", type=float, default=30)
+    args = parser.parse_args()
+
+    start = datetime.strptime(args.start_date, "%Y-%m-%d")
+    end = start + timedelta(days=args.days - 1)
+    week_schedule = get_week_schedule(start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
+    previous_week_schedule = get_week_schedule(
+        (start - timedelta(days=7)).strftime("%Y-%m-%d"),
+        (start - timedelta(days=1)).strftime("%Y-%m-%d"),
+    )
+    runtime_config = build_runtime_config(args.agents)
+    staffing = max(1, args.agents // 10)
+    runtime_config["staffing_requirements"] = {vacation: staffing for vacation in VACATIONS}
+    runtime_config["solver"] = {
+        **runtime_config["solver"],
+        "max_time_seconds": args.max_time,
+        "relative_gap_limit": 0.01,
+    }
+
+    ctx = _build_context(
+        runtime_config["agents"],
+        VACATIONS,
+        week_schedule,
+        {},
+        previous_week_schedule,
+        {},
+        runtime_config,
+        start.strftime("%Y-%m-%d"),
+    )
+    started = time.perf_counter()
+    greedy = construct_planning(ctx)
+    elapsed = time.perf_counter() - started
+    print(
+        f"{args.agents} agents x {len(week_schedule)} days, {staffing} agent(s) per shift"
+    )
+    print(f"greedy construction {elapsed * 1000:.1f} ms, {greedy.unfilled} unfilled slot(s)")
+    summaries = []
+    preview_planning(
+        runtime_config["agents"],
+        VACATIONS,
+        week_schedule,
+        {},
+        previous_week_schedule,
+        {},
+        runtime_config,
+        start.strftime("%Y-%m-%d"),
+        on_finish=summaries.append,
+    )
+    preview = summaries[0]
+    print(
+        f"{'preview':<12} planning       {preview['elapsed']:7.2f} s  objective {preview['objective']:9.0f}"
+        f"   ({preview['moves']} moves, {preview['stop_reason']})"
+    )
+    for greedy_hint in (False, True):
+        _run(
+            runtime_config,
+            week_schedule,
+            previous_week_schedule,
+            start.strftime("%Y-%m-%d"),
+            greedy_hint,
+        )
+
+
+if __name__ == "__main__":
+    main()
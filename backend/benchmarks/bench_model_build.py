@@ -0,0 +1,170 @@
+"""
+Model-build benchmark for the planning variable store.
+
+Compares the historical dict store keyed by (agent, day, vacation) label tuples with
+the integer-indexed PlanningTensor on the same core constraints (one shift per day,
+daily coverage and the preference objective), then times a full engine build and
+reports its constraint counts by type.
+
+Usage (from backend/):
+    python -m benchmarks.bench_model_build --agents 200 --days 365 [--memory]
+"""
+
+import argparse
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from ortools.sat.python import cp_model
+
+from app import get_week_schedule
+from solver.constraints.encoding import constraint_counts
+from solver.engine import _build_context
+from solver.tensor import PlanningTensor
+
+VACATIONS = ["Jour", "Nuit", "CDP"]
+
+
+def build_runtime_config(agent_count):
+    agents = [
+        {
+            "name": f"Agent{idx + 1}",
+            "preferences": {"preferred": [VACATIONS[idx % 3]], "avoid": [VACATIONS[(idx + 1) % 3]]},
+            "restriction": [],
+            "unavailable": [],
+            "training": [],
+            "exclusion": [],
+            "vacations": [],
+        }
+        for idx in range(agent_count)
+    ]
+    return {
+        "agents": agents,
+        "vacations": VACATIONS,
+        "vacation_durations": {"Jour": 12, "Nuit": 12, "CDP": 5.5, "Conge": 7},
+        "staffing_requirements": {"Jour": 1, "Nuit": 1, "CDP": 1},
+        "holidays": [],
+        "solver": {"min_free_weekends_per_horizon": 0},
+    }
+
+
+def _dict_store_build(agent_names, days):
+    model = cp_model.CpModel()
+    planning = {}
+    for agent_name in agent_names:
+        for day in days:
+            for vacation in VACATIONS:
+                planning[(agent_name, day, vacation)] = model.NewBoolVar(
+                    f"planning_{agent_name}_{day}_{vacation}"
+                )
+    for agent_name in agent_names:
+        for day in days:
+            model.Add(sum(planning[(agent_name, day, vacation)] for vacation in VACATIONS) <= 1)
+    for day in days:
+        for vacation in VACATIONS:
+            model.Add(sum(planning[(agent_name, day, vacation)] for agent_name in agent_names) == 1)
+    model.Maximize(
+        cp_model.LinearExpr.Sum(
+            [
+                planning[(agent_name, day, vacation)] * 100
+                for agent_name in agent_names
+                for day in days
+                for vacation in VACATIONS
+            ]
+        )
+    )
+    return model
+
+
+def _tensor_store_build(agent_names, days):
+    model = cp_model.CpModel()
+    planning = PlanningTensor(agent_names, days, VACATIONS)
+    for agent_idx, agent_name in enumerate(agent_names):
+        for day_idx, day in enumerate(days):
+            for vacation_idx, vacation in enumerate(VACATIONS):
+                planning.set_at(
+                    agent_idx,
+                    day_idx,
+                    vacation_idx,
+                    model.NewBoolVar(f"planning_{agent_name}_{day}_{vacation}"),
+                )
+    for agent_idx in range(len(agent_names)):
+        for day_idx in range(len(days)):
+            model.Add(sum(planning.day_cells(agent_idx, day_idx)) <= 1)
+    for day_idx in range(len(days)):
+        for vacation_idx in range(len(VACATIONS)):
+            model.Add(cp_model.LinearExpr.Sum(planning.column(day_idx, vacation_idx)) == 1)
+    model.Maximize(cp_model.LinearExpr.Sum(planning.values()) * 100)
+    return model
+
+
+def measure(label, fn, *args, trace_memory=False):
+    started = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - started
+
+    peak_text = ""
+    if trace_memory:
+        # tracemalloc slows allocations down a lot, so memory is measured on a second run.
+        tracemalloc.start()
+        fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_text = f"   peak {peak / 1024 / 1024:8.1f} MiB"
+    print(f"{label:<28} {elapsed:8.3f} s{peak_text}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--agents", type=int, default=200)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--start-date", default="2026-01-05")
+    parser.add_argument("--memory", action="store_true", help="also report peak Python memory")
+    args = parser.parse_args()
+
+    start = datetime.strptime(args.start_date, "%Y-%m-%d")
+    end = start + timedelta(days=args.days - 1)
+    week_schedule = get_week_schedule(start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
+    previous_week_schedule = get_week_schedule(
+        (start - timedelta(days=7)).strftime("%Y-%m-%d"),
+        (start - timedelta(days=1)).strftime("%Y-%m-%d"),
+    )
+    runtime_config = build_runtime_config(args.agents)
+    agent_names = [agent["name"] for agent in runtime_config["agents"]]
+
+    print(f"{args.agents} agents x {len(week_schedule)} days x {len(VACATIONS)} vacations")
+    measure(
+        "dict store (core rules)",
+        _dict_store_build,
+        agent_names,
+        week_schedule,
+        trace_memory=args.memory,
+    )
+    measure(
+        "tensor store (core rules)",
+        _tensor_store_build,
+        agent_names,
+        week_schedule,
+        trace_memory=args.memory,
+    )
+    ctx = measure(
+        "full engine build",
+        _build_context,
+        runtime_config["agents"],
+        VACATIONS,
+        week_schedule,
+        {},
+        previous_week_schedule,
+        {},
+        runtime_config,
+        start.strftime("%Y-%m-%d"),
+        trace_memory=args.memory,
+    )
+    print(f"{len(ctx.model.Proto().variables)} variables")
+    for constraint_type, count in constraint_counts(ctx.model).items():
+        print(f"  {constraint_type:<26} {count:8d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import os
+import threading
+from contextlib import contextmanager
+
+
+def default_cpu_cores() -> int:
+    """Returns the number of CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class CoreAllocator:
+    """
+    Shares a budget of CPU cores between the CP-SAT searches running at the same time.
+
+    Each planning request opens a ``session`` for its whole duration, and each of its
+    chunk solves asks ``allocate`` for search workers. A solve is granted at most
+    the cores still free and at most its fair share, ``total_cores`` divided by the
+    number of open sessions; it waits while no core is free. The grant is released
+    when the solve ends, so shares are rebalanced between chunks as requests come
+    and go, and concurrent searches never oversubscribe the CPU.
+
+    Attributes:
+        total_cores (int): Number of cores shared between the searches.
+    """
+
+    def __init__(self, total_cores: int | None = None):
+        self.total_cores = max(1, total_cores or default_cpu_cores())
+        self._condition = threading.Condition()
+        self._sessions = 0
+        self._cores_in_use = 0
+
+    @property
+    def cores_in_use(self) -> int:
+        with self._condition:
+            return self._cores_in_use
+
+    @contextmanager
+    def session(self):
+        """Counts a planning request in the fair share while it runs."""
+        with self._condition:
+            self._sessions += 1
+        try:
+            yield self
+        finally:
+            with self._condition:
+                self._sessions -= 1
+                self._condition.notify_all()
+
+    def acquire(self, requested: int = 0) -> int:
+        """
+        Waits for a free core and grants search workers to a solve.
+
+        :param requested: The configured ``num_search_workers``; 0 asks for every core.
+        :type requested: int
+        :return: The number of search workers the solve may use, at least 1.
+        :rtype: int
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._cores_in_use < self.total_cores)
+            free_cores = self.total_cores - self._cores_in_use
+            fair_share = max(1, self.total_cores // max(1, self._sessions))
+            wanted = requested if requested > 0 else self.total_cores
+            granted = max(1, min(wanted, free_cores, fair_share))
+            self._cores_in_use += granted
+            return granted
+
+    def release(self, granted: int) -> None:
+        with self._condition:
+            self._cores_in_use -= granted
+            self._condition.notify_all()
+
+    @contextmanager
+    def allocate(self, requested: int = 0):
+        """
+        Grants search workers for the duration of a solve (see ``acquire``).
+
+        :param requested: The configured ``num_search_workers``; 0 asks for every core.
+        :type requested: int
+        """
+        granted = self.acquire(requested)
+        try:
+            yield granted
+        finally:
+            self.release(granted)
@@ -0,0 +1,273 @@
+import math
+import threading
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from solver.control import SolveControl
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_JOB_STATUSES = (JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED)
+
+EVENT_STATUS = "status"
+EVENT_SOLUTION = "solution"
+EVENT_DONE = "done"
+
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_MAX_FINISHED_JOBS = 100
+DEFAULT_MAX_QUEUED_JOBS = 16
+DEFAULT_RETRY_AFTER_SECONDS = 10
+RECENT_DURATIONS = 20
+
+
+class DuplicateJobError(ValueError):
+    """Raised when a job id is already used by an unfinished job."""
+
+
+class QueueFullError(RuntimeError):
+    """
+    Raised when a job is submitted while ``max_queued_jobs`` jobs already wait.
+
+    Attributes:
+        retry_after (int): Estimated seconds until a queued job starts.
+    """
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _isoformat(moment):
+    return moment.isoformat() if moment is not None else None
+
+
+@dataclass
+class PlanningJob:
+    """
+    A planning request solved in the background.
+
+    Progress is recorded as an ordered list of ``(event_type, data)`` events: a
+    "status" event when a worker starts the job, a "solution" event for each
+    improving solution and a final "done" event holding the finished job.
+
+    Attributes:
+        id (str): Job identifier returned to the client.
+        status (str): "queued", "running", "succeeded", "failed" or "cancelled".
+        created_at (datetime): Submission time (UTC).
+        started_at (datetime | None): Time a worker picked the job up.
+        finished_at (datetime | None): Time the job finished.
+        result (dict | None): Response body of the finished job.
+        status_code (int | None): HTTP status code matching ``result``.
+        future (Future | None): Future of the worker task.
+        control (SolveControl): Stops the solves of the job when it is cancelled.
+        events (List[Tuple[str, dict]]): Progress events, in publication order.
+    """
+    id: str
+    status: str = JOB_QUEUED
+    created_at: datetime = field(default_factory=_now)
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    result: dict | None = None
+    status_code: int | None = None
+    future: Future | None = field(default=None, repr=False)
+    control: SolveControl = field(default_factory=SolveControl, repr=False)
+    events: list = field(default_factory=list, repr=False)
+    _condition: threading.Condition = field(default_factory=threading.Condition, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_JOB_STATUSES
+
+    def to_dict(self) -> dict:
+        job_dict = {
+            "job_id": self.id,
+            "status": self.status,
+            "created_at": _isoformat(self.created_at),
+            "started_at": _isoformat(self.started_at),
+            "finished_at": _isoformat(self.finished_at),
+        }
+        if self.finished:
+            job_dict["status_code"] = self.status_code
+            job_dict["result"] = self.result
+        return job_dict
+
+    def publish(self, event_type: str, data: dict) -> None:
+        """Appends a progress event and wakes up the readers waiting for it."""
+        with self._condition:
+            self.events.append((event_type, data))
+            self._condition.notify_all()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Waits until the job has finished.
+
+        :param timeout: Maximum time to wait, in seconds.
+        :type timeout: float | None
+        :return: Whether the job has finished.
+        :rtype: bool
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self.finished, timeout=timeout)
+
+    def wait_for_events(self, start: int, timeout: float | None = None) -> list:
+        """
+        Returns the events published from position ``start``, waiting for new ones.
+
+        :param start: Position of the first event to return.
+        :type start: int
+        :param timeout: Maximum time to wait for a new event, in seconds.
+        :type timeout: float | None
+        :return: The new ``(event_type, data)`` events, empty if the wait timed out.
+        :rtype: List[Tuple[str, dict]]
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: len(self.events) > start, timeout=timeout)
+            return self.events[start:]
+
+
+class JobManager:
+    """
+    Runs planning jobs on a bounded pool of background worker threads.
+
+    Jobs are kept in memory. Once more than ``max_finished_jobs`` jobs have finished,
+    the oldest finished ones are forgotten. At most ``max_queued_jobs`` jobs wait for
+    a worker; further submissions are rejected with ``QueueFullError``.
+
+    Attributes:
+        max_workers (int): Number of worker threads.
+        max_finished_jobs (int): Number of finished jobs kept for status queries.
+        max_queued_jobs (int | None): Number of jobs allowed to wait, None for no limit.
+    """
+
+    def __init__(
+        self,
+        max_workers=DEFAULT_MAX_WORKERS,
+        max_finished_jobs=DEFAULT_MAX_FINISHED_JOBS,
+        max_queued_jobs=None,
+    ):
+        self.max_workers = max_workers
+        self.max_finished_jobs = max_finished_jobs
+        self.max_queued_jobs = max_queued_jobs
+        self._durations = deque(maxlen=RECENT_DURATIONS)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="planning-job"
+        )
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, job_id: str | None = None, **kwargs) -> PlanningJob:
+        """
+        Queues a job running ``fn(job, *args, **kwargs)``.
+
+        ``fn`` receives the job to publish progress events and to read its
+        ``control``, and returns a ``(body, status_code)`` pair; a status code of 400
+        or more marks the job as failed. Unexpected exceptions fail the job with a
+        500 status.
+
+        :param fn: The function solving the request.
+        :type fn: Callable[..., Tuple[dict, int]]
+        :param job_id: Client-chosen job id, a random id when None.
+        :type job_id: str | None
+        :return: The queued job.
+        :rtype: PlanningJob
+        :raises DuplicateJobError: If ``job_id`` is used by an unfinished job.
+        :raises QueueFullError: If ``max_queued_jobs`` jobs are already waiting.
+        """
+        job = PlanningJob(id=job_id or uuid.uuid4().hex)
+        with self._lock:
+            existing = self._jobs.get(job.id)
+            if existing is not None and not existing.finished:
+                raise DuplicateJobError(f"Planning job {job.id} is already running")
+            if self.max_queued_jobs is not None:
+                unfinished = sum(1 for other in self._jobs.values() if not other.finished)
+                # The first max_workers unfinished jobs run, the others wait
+                waiting = unfinished - self.max_workers
+                if waiting >= self.max_queued_jobs:
+                    raise QueueFullError(
+                        "Too many planning requests are waiting; retry later",
+                        self._estimate_wait(waiting),
+                    )
+            self._jobs.pop(job.id, None)
+            self._jobs[job.id] = job
+        job.future = self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def get(self, job_id: str) -> PlanningJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> PlanningJob | None:
+        """
+        Cancels a job.
+
+        A queued job never starts. A running job has its live search stopped and
+        no further chunk started; it then finishes with the best solution found so
+        far. Finished jobs are left unchanged.
+
+        :param job_id: The id of the job to cancel.
+        :type job_id: str
+        :return: The job, or None if the id is unknown.
+        :rtype: PlanningJob | None
+        """
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return job
+
+        job.control.cancel()
+        if job.future is not None and job.future.cancel():
+            job.result = {"error": "Planning job was cancelled before it started"}
+            job.status_code = 409
+            job.finished_at = _now()
+            job.status = JOB_CANCELLED
+            job.publish(EVENT_DONE, job.to_dict())
+            self._forget_old_jobs()
+        return job
+
+    def _estimate_wait(self, waiting: int) -> int:
+        # Called with the lock held: the queue ahead drains max_workers jobs at a time
+        if not self._durations:
+            return DEFAULT_RETRY_AFTER_SECONDS
+        mean_duration = sum(self._durations) / len(self._durations)
+        rounds = waiting // self.max_workers + 1
+        return max(1, math.ceil(mean_duration * rounds))
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job: PlanningJob, fn, args, kwargs) -> PlanningJob:
+        job.started_at = _now()
+        job.status = JOB_RUNNING
+        job.publish(EVENT_STATUS, {"status": JOB_RUNNING})
+        try:
+            body, status_code = fn(job, *args, **kwargs)
+        except Exception as exc:  # noqa: BLE001 - reported through the job status
+            body, status_code = {"error": str(exc)}, 500
+
+        job.result = body
+        job.status_code = status_code
+        job.finished_at = _now()
+        with self._lock:
+            self._durations.append((job.finished_at - job.started_at).total_seconds())
+        if job.control.cancelled:
+            job.status = JOB_CANCELLED
+        else:
+            job.status = JOB_SUCCEEDED if status_code < 400 else JOB_FAILED
+        job.publish(EVENT_DONE, job.to_dict())
+        self._forget_old_jobs()
+        return job
+
+    def _forget_old_jobs(self) -> None:
+        with self._lock:
+            finished_ids = [job_id for job_id, job in self._jobs.items() if job.finished]
+            for job_id in finished_ids[: max(0, len(finished_ids) - self.max_finished_jobs)]:
+                del self._jobs[job_id]
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+DEFAULT_RESULT_CACHE_SIZE = 32
+DEFAULT_CHUNK_CACHE_SIZE = 64
+
+
+def planning_cache_key(config_hash: str, start_date: str, end_date: str, initial_shifts: dict) -> str:
+    """
+    Returns the cache key of a planning request.
+
+    The key is the SHA-256 hash of a canonical JSON form of the request: agents and
+    their initial shifts are sorted, so equivalent payloads share a key. Solver
+    settings are covered by the configuration content hash.
+
+    :param config_hash: Content hash of the active configuration.
+    :type config_hash: str
+    :param start_date: First planned day (YYYY-MM-DD).
+    :type start_date: str
+    :param end_date: Last planned day (YYYY-MM-DD).
+    :type end_date: str
+    :param initial_shifts: Validated initial shifts, per agent name.
+    :type initial_shifts: dict
+    :return: The hexadecimal cache key.
+    :rtype: str
+    """
+    canonical_shifts = {
+        agent_name: sorted([day, vacation] for day, vacation in shifts)
+        for agent_name, shifts in initial_shifts.items()
+        if shifts
+    }
+    canonical = json.dumps(
+        {
+            "config": config_hash,
+            "start_date": start_date,
+            "end_date": end_date,
+            "initial_shifts": canonical_shifts,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier cache of planning results (whole responses or monthly chunk solutions).
+
+    The memory tier keeps the ``max_entries`` most recently used results. When
+    ``directory`` is set, every result is also written there as ``<key>.json`` and
+    read back on a memory miss, so entries survive restarts.
+
+    Attributes:
+        max_entries (int): Size of the memory tier; 0 disables the cache.
+        directory (str | None): Directory of the on-disk tier, None to disable it.
+    """
+
+    def __init__(self, max_entries=DEFAULT_RESULT_CACHE_SIZE, directory=None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: str) -> dict | None:
+        """
+        Returns the cached response of a key, or None on a miss.
+
+        :param key: The cache key (see ``planning_cache_key``).
+        :type key: str
+        :return: The cached response body.
+        :rtype: dict | None
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+                return body
+
+        body = self._read(key)
+        if body is not None:
+            self._remember(key, body)
+        return body
+
+    def put(self, key: str, body: dict) -> None:
+        """
+        Stores a response body.
+
+        :param key: The cache key (see ``planning_cache_key``).
+        :type key: str
+        :param body: The response body; it must not be modified afterwards.
+        :type body: dict
+        """
+        if not self.enabled:
+            return
+        self._remember(key, body)
+        self._write(key, body)
+
+    def clear(self) -> None:
+        """Forgets every entry, on disk too."""
+        with self._lock:
+            self._entries.clear()
+        if self.directory is None or not os.path.isdir(self.directory):
+            return
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith(".json"):
+                try:
+                    os.remove(os.path.join(self.directory, file_name))
+                except OSError:
+                    pass
+
+    def _remember(self, key: str, body: dict) -> None:
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read(self, key: str) -> dict | None:
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, key: str, body: dict) -> None:
+        if self.directory is None:
+            return
+        # The disk tier is best effort: a failed write only costs a later solve
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            temp_path = f"{self._path(key)}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as cache_file:
+                json.dump(body, cache_file, ensure_ascii=False)
+            os.replace(temp_path, self._path(key))
+        except (OSError, TypeError, ValueError) as exc:
+            print("Result cache write failed:", exc)
@@ -0,0 +1,122 @@
+from calendar import isleap
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .calendar import Calendar
+from .compiled_config import AgentRecord
+
+LEAVE = 0
+UNAVAILABLE = 1
+TRAINING = 2
+EXCLUSION = 3
+HOLIDAY = 4
+STATUSES = ("leave", "unavailable", "training", "exclusion", "holiday")
+
+_DATE_STATUSES = ((UNAVAILABLE, "unavailable"), (TRAINING, "training"), (EXCLUSION, "exclusion"))
+
+
+class AvailabilityTensor:
+    """
+    Boolean agent availability tensor shared by the hard constraints.
+
+    ``statuses[agent_idx, day_idx, status]`` is True when the agent has the given
+    status (``LEAVE``, ``UNAVAILABLE``, ``TRAINING``, ``EXCLUSION`` or ``HOLIDAY``) on
+    that calendar day. It is built from the parsed dates of the compiled agent records,
+    and day indices are aligned with the calendar (and so with ``ctx.planning.days``).
+
+    Attributes:
+        calendar (Calendar): The calendar of the day axis.
+        agents (List[str]): Agent names, in index order.
+        agent_index (Dict[str, int]): Agent name to agent index.
+        statuses (np.ndarray): Boolean array of shape (agents, days, len(STATUSES)).
+    """
+
+    __slots__ = ("calendar", "agents", "agent_index", "statuses")
+
+    def __init__(self, calendar: Calendar, agents: Sequence[str], statuses: np.ndarray):
+        self.calendar = calendar
+        self.agents = list(agents)
+        self.agent_index: Dict[str, int] = {name: idx for idx, name in enumerate(self.agents)}
+        self.statuses = statuses
+
+    @classmethod
+    def build(cls, agents: Sequence[AgentRecord], calendar: Calendar) -> "AvailabilityTensor":
+        """
+        Builds the availability tensor of the compiled agents over a calendar.
+
+        :param agents: The compiled agent records.
+        :type agents: Sequence[AgentRecord]
+        :param calendar: The calendar of the day axis.
+        :type calendar: Calendar
+        :return: The availability tensor.
+        :rtype: AvailabilityTensor
+        """
+        statuses = np.zeros((len(agents), len(calendar), len(STATUSES)), dtype=bool)
+        statuses[:, :, HOLIDAY] = [day.is_holiday for day in calendar]
+
+        # Dates are matched in bulk: full ordinals for an anchored calendar,
+        # month * 100 + day keys otherwise.
+        month_days = np.array([day.month * 100 + day.day for day in calendar], dtype=np.int32)
+        if calendar.anchored:
+            ordinals = np.array([day.date.toordinal() for day in calendar], dtype=np.int64)
+            date_index = {day.date: day.index for day in calendar}
+        else:
+            date_index = {}
+            for day in calendar:
+                date_index.setdefault((day.month, day.day), []).append(day.index)
+
+        for agent_idx, agent in enumerate(agents):
+            for status, key in _DATE_STATUSES:
+                for agent_date in getattr(agent, key):
+                    if calendar.anchored:
+                        day_idx = date_index.get(agent_date)
+                        if day_idx is not None:
+                            statuses[agent_idx, day_idx, status] = True
+                    else:
+                        for day_idx in date_index.get((agent_date.month, agent_date.day), ()):
+                            statuses[agent_idx, day_idx, status] = True
+
+            for start, end in agent.leave_periods:
+                if calendar.anchored:
+                    covered = (ordinals >= start.toordinal()) & (ordinals <= end.toordinal())
+                else:
+                    # Unanchored days are dated in the year the leave starts.
+                    covered = month_days >= start.month * 100 + start.day
+                    if end.year == start.year:
+                        covered &= month_days <= end.month * 100 + end.day
+                    elif end.year < start.year:
+                        covered[:] = False
+                    if not isleap(start.year):
+                        covered &= month_days != 229
+                statuses[agent_idx, :, LEAVE] |= covered
+
+        return cls(calendar, [agent.name for agent in agents], statuses)
+
+    @property
+    def shape(self):
+        return self.statuses.shape
+
+    def slice(self, start: int = 0, stop: Optional[int] = None) -> "AvailabilityTensor":
+        """Returns the tensor of a day range, aligned with ``calendar.slice(start, stop)``."""
+        return AvailabilityTensor(
+            self.calendar.slice(start, stop), self.agents, self.statuses[:, start:stop]
+        )
+
+    def between(self, start, end) -> "AvailabilityTensor":
+        """Returns the tensor of a date range, aligned with ``calendar.between(start, end)``."""
+        sub_calendar = self.calendar.between(start, end)
+        if not len(sub_calendar):
+            return AvailabilityTensor(sub_calendar, self.agents, self.statuses[:, :0])
+        first = self.calendar.indices_on(sub_calendar[0].date)[0]
+        return AvailabilityTensor(
+            sub_calendar, self.agents, self.statuses[:, first:first + len(sub_calendar)]
+        )
+
+    def has(self, agent_idx: int, day_idx: int, status: int) -> bool:
+        return bool(self.statuses[agent_idx, day_idx, status])
+
+    def days_with(self, agent_idx: int, status: int, start: int = 0) -> List[int]:
+        """Returns the day indices, from ``start``, where the agent has the given status."""
+        day_indices = np.flatnonzero(self.statuses[agent_idx, start:, status])
+        return [int(day_idx) + start for day_idx in day_indices]
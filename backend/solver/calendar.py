@@ -0,0 +1,352 @@
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .utils import FRENCH_WEEKDAY_ABBREVIATIONS, weekday_index
+
+SATURDAY = 5
+SUNDAY = 6
+
+
+def format_day_label(day_date: date) -> str:
+    """
+    Formats a date as a day label.
+
+    :param day_date: The date to format.
+    :type day_date: date
+    :return: The day label in the format "Day. dd-mm" (e.g. "Lun. 25-12").
+    :rtype: str
+    """
+    day_name = FRENCH_WEEKDAY_ABBREVIATIONS[day_date.weekday()]
+    return f"{day_name}. {day_date.strftime('%d-%m')}"
+
+
+def _as_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    raise ValueError("planning_start_date must be YYYY-MM-DD or datetime")
+
+
+@dataclass(frozen=True, slots=True)
+class CalendarDay:
+    """
+    One day of a calendar.
+
+    Attributes:
+        index (int): Position of the day in the calendar.
+        label (str): Day label used at the API boundary (e.g. "Lun. 25-12").
+        day (int): Day of the month.
+        month (int): Month number.
+        weekday (int): Weekday index, from 0 (Monday) to 6 (Sunday).
+        week (int): Ordinal of the Monday-to-Sunday week within the calendar.
+        period (int): Ordinal of the month within the calendar.
+        is_holiday (bool): True if the day is a configured holiday.
+        date (date | None): Full date, or None when the calendar is not anchored to a year.
+    """
+    index: int
+    label: str
+    day: int
+    month: int
+    weekday: int
+    week: int
+    period: int
+    is_holiday: bool
+    date: Optional[date] = None
+
+    @property
+    def is_weekend(self) -> bool:
+        return self.weekday >= SATURDAY
+
+    @property
+    def iso_week(self) -> Optional[Tuple[int, int]]:
+        if self.date is None:
+            return None
+        return tuple(self.date.isocalendar())[:2]
+
+
+@dataclass(frozen=True)
+class Calendar:
+    """
+    Immutable, integer-indexed model of the planning days.
+
+    A calendar is built once per request and sliced per planning chunk. Day indices
+    are aligned with the day axis of ``ctx.planning``, so constraint code works on
+    integer indices and reads weekday, week, month and holiday flags from here
+    instead of parsing day labels.
+
+    A calendar built from full dates is anchored: agent dates are matched on the
+    exact date, so horizons longer than a year are unambiguous. A calendar built
+    from labels alone matches agent dates on the day and month.
+
+    Attributes:
+        days (Tuple[CalendarDay, ...]): The calendar days, in index order.
+        anchored (bool): True if every day carries its full date.
+    """
+    days: Tuple[CalendarDay, ...]
+    anchored: bool = False
+    _label_index: Dict[str, int] = field(default=None, init=False, repr=False, compare=False)
+    _date_index: Dict[date, int] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(
+            self, "_label_index", {day.label: day.index for day in self.days}
+        )
+        object.__setattr__(
+            self,
+            "_date_index",
+            {day.date: day.index for day in self.days if day.date is not None},
+        )
+
+    @classmethod
+    def _build(
+        cls,
+        entries: Sequence[Tuple[str, int, int, int, Optional[date]]],
+        holidays: Iterable[str],
+        anchored: bool,
+    ) -> "Calendar":
+        holiday_tokens = set(holidays)
+        days = []
+        week = period = 0
+        previous = None
+        for index, (label, day, month, weekday, day_date) in enumerate(entries):
+            if previous is not None:
+                if day_date is not None and previous.date is not None:
+                    new_week = (
+                        day_date.isocalendar()[:2] != previous.date.isocalendar()[:2]
+                    )
+                    new_period = (day_date.year, month) != (previous.date.year, previous.month)
+                else:
+                    new_week = previous.weekday == SUNDAY or weekday <= previous.weekday
+                    new_period = month != previous.month
+                week += int(new_week)
+                period += int(new_period)
+            previous = CalendarDay(
+                index=index,
+                label=label,
+                day=day,
+                month=month,
+                weekday=weekday,
+                week=week,
+                period=period,
+                is_holiday=f"{day:02d}-{month:02d}" in holiday_tokens,
+                date=day_date,
+            )
+            days.append(previous)
+        return cls(days=tuple(days), anchored=anchored)
+
+    @classmethod
+    def from_range(cls, start, end, holidays: Iterable[str] = ()) -> "Calendar":
+        """
+        Builds an anchored calendar covering every date from start to end, inclusive.
+
+        :param start: The first date (date, datetime or "YYYY-MM-DD").
+        :param end: The last date (date, datetime or "YYYY-MM-DD").
+        :param holidays: Holidays in the format "dd-mm".
+        :type holidays: Iterable[str]
+        :return: The calendar.
+        :rtype: Calendar
+        """
+        start_date = _as_date(start)
+        end_date = _as_date(end)
+        entries = []
+        for offset in range((end_date - start_date).days + 1):
+            day_date = start_date + timedelta(days=offset)
+            entries.append(
+                (format_day_label(day_date), day_date.day, day_date.month, day_date.weekday(), day_date)
+            )
+        return cls._build(entries, holidays, anchored=True)
+
+    @classmethod
+    def from_labels(
+        cls,
+        labels: Sequence[str],
+        start_date=None,
+        start_index: int = 0,
+        holidays: Iterable[str] = (),
+    ) -> "Calendar":
+        """
+        Builds a calendar from day labels.
+
+        When ``start_date`` is given, it is the date of the label at ``start_index``
+        and the other labels are dated by position, which anchors the calendar.
+
+        :param labels: Day labels in the format "Day. dd-mm".
+        :type labels: Sequence[str]
+        :param start_date: The date of the label at ``start_index`` (date, datetime or "YYYY-MM-DD").
+        :param start_index: The index of the label dated by ``start_date``.
+        :type start_index: int
+        :param holidays: Holidays in the format "dd-mm".
+        :type holidays: Iterable[str]
+        :return: The calendar.
+        :rtype: Calendar
+        """
+        first_date = None
+        if start_date is not None:
+            first_date = _as_date(start_date) - timedelta(days=start_index)
+
+        entries = []
+        for index, label in enumerate(labels):
+            day, month = (int(part) for part in label.split(" ")[1].split("-"))
+            day_date = first_date + timedelta(days=index) if first_date is not None else None
+            entries.append((label, day, month, weekday_index(label), day_date))
+        return cls._build(entries, holidays, anchored=first_date is not None)
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def __getitem__(self, index: int) -> CalendarDay:
+        return self.days[index]
+
+    def __iter__(self):
+        return iter(self.days)
+
+    @property
+    def labels(self) -> List[str]:
+        return [day.label for day in self.days]
+
+    def index_of(self, label: str) -> int:
+        return self._label_index[label]
+
+    def slice(self, start: int = 0, stop: Optional[int] = None) -> "Calendar":
+        """
+        Returns the sub-calendar of a day range, re-indexed from zero.
+
+        :param start: The first day index.
+        :type start: int
+        :param stop: The day index after the last one, or None for the end.
+        :type stop: int | None
+        :return: The sub-calendar.
+        :rtype: Calendar
+        """
+        days = self.days[start:stop]
+        base_week = days[0].week if days else 0
+        base_period = days[0].period if days else 0
+        return Calendar(
+            days=tuple(
+                CalendarDay(
+                    index=index,
+                    label=day.label,
+                    day=day.day,
+                    month=day.month,
+                    weekday=day.weekday,
+                    week=day.week - base_week,
+                    period=day.period - base_period,
+                    is_holiday=day.is_holiday,
+                    date=day.date,
+                )
+                for index, day in enumerate(days)
+            ),
+            anchored=self.anchored,
+        )
+
+    def between(self, start, end) -> "Calendar":
+        """
+        Returns the sub-calendar from start to end, inclusive, of an anchored calendar.
+
+        :param start: The first date (date, datetime or "YYYY-MM-DD").
+        :param end: The last date (date, datetime or "YYYY-MM-DD").
+        :return: The sub-calendar.
+        :rtype: Calendar
+        """
+        start_date = _as_date(start)
+        end_date = _as_date(end)
+        indices = [
+            day.index for day in self.days if day.date is not None and start_date <= day.date <= end_date
+        ]
+        if not indices:
+            return Calendar(days=(), anchored=self.anchored)
+        return self.slice(indices[0], indices[-1] + 1)
+
+    def _group(self, key: str, start: int, stop: Optional[int]) -> List[List[int]]:
+        groups: List[List[int]] = []
+        previous_key = None
+        for day in self.days[start:stop]:
+            group_key = getattr(day, key)
+            if not groups or group_key != previous_key:
+                groups.append([])
+            groups[-1].append(day.index)
+            previous_key = group_key
+        return groups
+
+    def weeks(self, start: int = 0, stop: Optional[int] = None) -> List[List[int]]:
+        """Returns the day indices of each Monday-to-Sunday week over a day range."""
+        return self._group("week", start, stop)
+
+    def periods(self, start: int = 0, stop: Optional[int] = None) -> List[List[int]]:
+        """Returns the day indices of each month over a day range."""
+        return self._group("period", start, stop)
+
+    def follows(self, index: int) -> bool:
+        """Returns True if the day at index is the day after the previous calendar day."""
+        if index <= 0 or index >= len(self.days):
+            return False
+        previous, current = self.days[index - 1], self.days[index]
+        if previous.date is not None and current.date is not None:
+            return (current.date - previous.date).days == 1
+        return (previous.weekday + 1) % 7 == current.weekday
+
+    def weekend_pairs(self, start: int = 0, stop: Optional[int] = None) -> List[Tuple[int, int]]:
+        """Returns the (Saturday, Sunday) index pairs of consecutive days over a day range."""
+        stop = len(self.days) if stop is None else stop
+        return [
+            (index, index + 1)
+            for index in range(start, stop - 1)
+            if self.days[index].weekday == SATURDAY and self.days[index + 1].weekday == SUNDAY
+        ]
+
+    def indices_on(self, value: date, start: int = 0) -> List[int]:
+        """
+        Returns the indices of the days matching a date.
+
+        An anchored calendar matches the exact date, otherwise the day and month are matched.
+
+        :param value: The date to look up.
+        :type value: date
+        :param start: The first day index to consider.
+        :type start: int
+        :return: The matching day indices.
+        :rtype: List[int]
+        """
+        value = _as_date(value)
+        if self.anchored:
+            index = self._date_index.get(value)
+            return [index] if index is not None and index >= start else []
+        return [
+            day.index
+            for day in self.days[start:]
+            if day.day == value.day and day.month == value.month
+        ]
+
+    def indices_between(self, first: date, last: date, start: int = 0) -> List[int]:
+        """
+        Returns the indices of the days within a date range, inclusive.
+
+        An anchored calendar compares full dates. Otherwise each day is dated in the
+        year of ``first``, as leave periods have always been matched.
+
+        :param first: The first date of the range.
+        :type first: date
+        :param last: The last date of the range.
+        :type last: date
+        :param start: The first day index to consider.
+        :type start: int
+        :return: The matching day indices.
+        :rtype: List[int]
+        """
+        first = _as_date(first)
+        last = _as_date(last)
+        indices = []
+        for day in self.days[start:]:
+            day_date = day.date
+            if day_date is None:
+                try:
+                    day_date = date(first.year, day.month, day.day)
+                except ValueError:
+                    continue
+            if first <= day_date <= last:
+                indices.append(day.index)
+        return indices
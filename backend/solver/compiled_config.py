@@ -0,0 +1,170 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Sequence, Tuple
+
+from .utils import parse_agent_date
+
+
+def config_content_hash(config: dict) -> str:
+    """
+    Returns the SHA-256 hash of a configuration's canonical JSON form.
+
+    :param config: The runtime configuration.
+    :type config: dict
+    :return: The hexadecimal content hash.
+    :rtype: str
+    """
+    canonical = json.dumps(config, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class AgentRecord:
+    """
+    Compiled, read-only view of one configured agent.
+
+    Attributes:
+        index (int): Position of the agent in the configuration.
+        name (str): Agent name.
+        unavailable (Tuple[date, ...]): Parsed unavailable dates.
+        training (Tuple[date, ...]): Parsed training dates.
+        exclusion (Tuple[date, ...]): Parsed exclusion dates.
+        leave_periods (Tuple[Tuple[date, date], ...]): Parsed (start, end) leave periods.
+        preferred_mask (int): Bitmask of preferred vacation indices.
+        avoid_mask (int): Bitmask of avoided vacation indices.
+        restriction_mask (int): Bitmask of restricted vacation indices.
+    """
+    index: int
+    name: str
+    unavailable: Tuple[date, ...] = ()
+    training: Tuple[date, ...] = ()
+    exclusion: Tuple[date, ...] = ()
+    leave_periods: Tuple[Tuple[date, date], ...] = ()
+    preferred_mask: int = 0
+    avoid_mask: int = 0
+    restriction_mask: int = 0
+
+
+def _vacation_mask(vacation_index: Dict[str, int], vacations) -> int:
+    mask = 0
+    for vacation in vacations or []:
+        vacation_idx = vacation_index.get(vacation)
+        if vacation_idx is not None:
+            mask |= 1 << vacation_idx
+    return mask
+
+
+def _parse_dates(agent_name: str, key: str, values) -> Tuple[date, ...]:
+    try:
+        return tuple(parse_agent_date(value) for value in values or [])
+    except (TypeError, ValueError) as exc:
+        raise ValueError(
+            f"Invalid {key} date for agent {agent_name}: expected dd-mm-YYYY"
+        ) from exc
+
+
+@dataclass(frozen=True)
+class CompiledConfig:
+    """
+    Runtime configuration compiled once when it is installed.
+
+    Agent dates are parsed, agents and vacations are mapped to dense indices, and
+    preferences and restrictions are stored as vacation bitmasks. The object is
+    tagged with the content hash of the source configuration, so unchanged
+    configurations are never recompiled.
+
+    Attributes:
+        config (dict): The source runtime configuration.
+        content_hash (str): SHA-256 hash of the source configuration.
+        vacations (Tuple[str, ...]): Configured vacations, in index order.
+        vacation_index (Dict[str, int]): Vacation name to vacation index.
+        agents (Tuple[AgentRecord, ...]): Compiled agents, in index order.
+        agent_index (Dict[str, int]): Agent name to agent index.
+        holidays (frozenset): Holidays in the format "dd-mm".
+        unavailable (Dict[str, List[str]]): Raw unavailable dates per agent, as returned by the API.
+        training (Dict[str, List[str]]): Raw training dates per agent, as returned by the API.
+        day_off (Dict[str, List[List[str]]]): Raw [start, end] leave periods per agent, as returned by the API.
+    """
+    config: dict
+    content_hash: str
+    vacations: Tuple[str, ...]
+    vacation_index: Dict[str, int]
+    agents: Tuple[AgentRecord, ...]
+    agent_index: Dict[str, int]
+    holidays: frozenset = field(default_factory=frozenset)
+    unavailable: Dict[str, List[str]] = field(default_factory=dict)
+    training: Dict[str, List[str]] = field(default_factory=dict)
+    day_off: Dict[str, List[List[str]]] = field(default_factory=dict)
+
+    def vacation_mask(self, vacations: Sequence[str]) -> int:
+        return _vacation_mask(self.vacation_index, vacations)
+
+    def agent(self, name: str) -> AgentRecord | None:
+        agent_idx = self.agent_index.get(name)
+        return None if agent_idx is None else self.agents[agent_idx]
+
+
+def compile_config(config: dict, content_hash: str | None = None) -> CompiledConfig:
+    """
+    Compiles a runtime configuration.
+
+    :param config: The runtime configuration.
+    :type config: dict
+    :param content_hash: The content hash of the configuration, if already computed.
+    :type content_hash: str | None
+    :return: The compiled configuration.
+    :rtype: CompiledConfig
+    :raises ValueError: If an agent date is not in the format dd-mm-YYYY.
+    """
+    vacations = tuple(config.get("vacations", []))
+    vacation_index = {vacation: idx for idx, vacation in enumerate(vacations)}
+
+    agents = []
+    unavailable = {}
+    training = {}
+    day_off = {}
+    for agent_idx, agent in enumerate(config.get("agents", [])):
+        name = agent["name"]
+        leave_periods = []
+        if "vacations" in agent:
+            day_off[name] = []
+            vacations_periods = agent["vacations"] if isinstance(agent["vacations"], list) else []
+            for vac in vacations_periods:
+                if isinstance(vac, dict) and "start" in vac and "end" in vac:
+                    day_off[name].append([vac["start"], vac["end"]])
+                    start, end = _parse_dates(name, "vacations", [vac["start"], vac["end"]])
+                    leave_periods.append((start, end))
+        if "training" in agent:
+            training[name] = agent["training"]
+        if "unavailable" in agent:
+            unavailable[name] = agent["unavailable"]
+
+        preferences = agent.get("preferences", {})
+        agents.append(
+            AgentRecord(
+                index=agent_idx,
+                name=name,
+                unavailable=_parse_dates(name, "unavailable", agent.get("unavailable")),
+                training=_parse_dates(name, "training", agent.get("training")),
+                exclusion=_parse_dates(name, "exclusion", agent.get("exclusion")),
+                leave_periods=tuple(leave_periods),
+                preferred_mask=_vacation_mask(vacation_index, preferences.get("preferred")),
+                avoid_mask=_vacation_mask(vacation_index, preferences.get("avoid")),
+                restriction_mask=_vacation_mask(vacation_index, agent.get("restriction")),
+            )
+        )
+
+    return CompiledConfig(
+        config=config,
+        content_hash=content_hash or config_content_hash(config),
+        vacations=vacations,
+        vacation_index=vacation_index,
+        agents=tuple(agents),
+        agent_index={record.name: record.index for record in agents},
+        holidays=frozenset(config.get("holidays", [])),
+        unavailable=unavailable,
+        training=training,
+        day_off=day_off,
+    )
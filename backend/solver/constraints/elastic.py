@@ -0,0 +1,119 @@
+from dataclasses import dataclass, field
+from typing import List
+
+from ortools.sat.python import cp_model
+
+from ..context import SolverContext
+
+CAP_GLOBAL_GAP = "global_max_gap"
+CAP_PERIOD_GAP = "period_max_gap"
+CAP_WEEKLY_HOURS = "max_weekly_hours"
+
+
+@dataclass
+class CapExcess:
+    """
+    A cap made elastic: the capped value may exceed its limit by a penalized slack.
+
+    Attributes:
+        cap (str): The setting of the cap ("global_max_gap", "period_max_gap" or "max_weekly_hours").
+        value (cp_model.LinearExpr): The capped value, in hours * 10.
+        limit (int): The configured limit, in hours * 10.
+        excess (cp_model.IntVar): The slack over the limit, penalized by the objective.
+        days (List[int]): Day indices the cap applies to.
+        agents (List[int]): Agent indices the cap applies to, empty for gaps between agents.
+    """
+    cap: str
+    value: cp_model.LinearExpr
+    limit: int
+    excess: cp_model.IntVar
+    days: List[int]
+    agents: List[int] = field(default_factory=list)
+
+
+def is_elastic(ctx: SolverContext, cap: str) -> bool:
+    """
+    Checks if a cap is elastic in the solver settings.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :param cap: The setting of the cap.
+    :type cap: str
+    :return: True if the cap may be exceeded with a penalty, False if it is a hard cap.
+    :rtype: bool
+    """
+    if cap == CAP_WEEKLY_HOURS:
+        return ctx.elastic_max_weekly_hours
+    return ctx.elastic_gaps
+
+
+def add_cap(
+    ctx: SolverContext,
+    cap: str,
+    value,
+    limit: int,
+    upper: int,
+    days: List[int],
+    agents: List[int] | None = None,
+) -> None:
+    """
+    Keeps a value at most its limit, as a hard constraint or through a penalized slack.
+
+    When the cap is elastic, ``value <= limit + excess`` is added instead with an
+    ``excess`` variable in ``[0, upper]``, and the excess is recorded in
+    ``ctx.cap_excesses`` for the objective and the solve summary.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :param cap: The setting of the cap.
+    :type cap: str
+    :param value: The capped value, in hours * 10.
+    :type value: cp_model.LinearExpr
+    :param limit: The configured limit, in hours * 10.
+    :type limit: int
+    :param upper: The largest excess the slack may take, at least the largest reachable value.
+    :type upper: int
+    :param days: Day indices the cap applies to.
+    :type days: List[int]
+    :param agents: Agent indices the cap applies to, None for gaps between agents.
+    :type agents: List[int] | None
+    """
+    if not is_elastic(ctx, cap):
+        ctx.model.Add(value <= limit)
+        return
+
+    excess = ctx.model.NewIntVar(0, upper, f"excess_{cap}_{len(ctx.cap_excesses)}")
+    ctx.model.Add(value <= limit + excess)
+    ctx.cap_excesses.append(CapExcess(cap, value, limit, excess, list(days), list(agents or [])))
+
+
+def cap_excess_report(ctx: SolverContext, solution) -> List[dict]:
+    """
+    Reads how far a solution exceeds each elastic cap.
+
+    Excesses are computed from the capped values rather than the slacks, which a
+    penalty weight of zero leaves loose. The balance gaps tie their bounds to the
+    actual minimum and maximum paid hours when elastic, so their values are exact.
+
+    :param ctx: The solver context holding the elastic caps.
+    :type ctx: SolverContext
+    :param solution: A solved ``cp_model.CpSolver`` (or the pool's ``RemoteSolver``).
+    :return: The exceeded caps, with their "cap", "agents", "days" (first and last labels) and the "limit", "value" and "excess" in hours.
+    :rtype: List[dict]
+    """
+    report = []
+    for record in ctx.cap_excesses:
+        value = solution.Value(record.value)
+        if value <= record.limit:
+            continue
+        report.append(
+            {
+                "cap": record.cap,
+                "agents": [ctx.agents[agent_idx]["name"] for agent_idx in record.agents],
+                "days": [ctx.calendar.labels[record.days[0]], ctx.calendar.labels[record.days[-1]]],
+                "limit": record.limit / 10,
+                "value": value / 10,
+                "excess": (value - record.limit) / 10,
+            }
+        )
+    return report
@@ -0,0 +1,176 @@
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+from ortools.sat.python import cp_model
+
+from ..domain import is_fixed
+
+
+def split_literals(cells: Iterable) -> Tuple[List, int]:
+    """
+    Splits planning cells into solver literals and the count of cells fixed to one.
+
+    Cells fixed to zero by the domain pre-pass are dropped.
+
+    :param cells: Planning cells (BoolVars or integer constants).
+    :type cells: Iterable
+    :return: The solver literals and the number of cells fixed to one.
+    :rtype: Tuple[List, int]
+    """
+    literals = []
+    ones = 0
+    for cell in cells:
+        if is_fixed(cell):
+            ones += int(cell)
+        else:
+            literals.append(cell)
+    return literals, ones
+
+
+def add_false(model: cp_model.CpModel, literals: Iterable) -> None:
+    """Forces every literal to false."""
+    literals = list(literals)
+    if literals:
+        model.AddBoolAnd([literal.Not() for literal in literals])
+
+
+def add_at_most_one(model: cp_model.CpModel, cells: Iterable) -> None:
+    """
+    Allows at most one of the given cells to be true.
+
+    :param model: The CP-SAT model.
+    :type model: cp_model.CpModel
+    :param cells: Planning cells (BoolVars or integer constants).
+    :type cells: Iterable
+    """
+    literals, ones = split_literals(cells)
+    if ones > 1:
+        model.AddBoolOr([])
+    elif ones == 1:
+        add_false(model, literals)
+    elif len(literals) > 1:
+        model.AddAtMostOne(literals)
+
+
+def add_exactly_one(model: cp_model.CpModel, cells: Iterable) -> None:
+    """
+    Requires exactly one of the given cells to be true.
+
+    :param model: The CP-SAT model.
+    :type model: cp_model.CpModel
+    :param cells: Planning cells (BoolVars or integer constants).
+    :type cells: Iterable
+    """
+    literals, ones = split_literals(cells)
+    if ones > 1:
+        model.AddBoolOr([])
+    elif ones == 1:
+        add_false(model, literals)
+    else:
+        model.AddExactlyOne(literals)
+
+
+def add_at_least_one(model: cp_model.CpModel, cells: Iterable) -> None:
+    """
+    Requires at least one of the given cells to be true.
+
+    :param model: The CP-SAT model.
+    :type model: cp_model.CpModel
+    :param cells: Planning cells (BoolVars or integer constants).
+    :type cells: Iterable
+    """
+    literals, ones = split_literals(cells)
+    if ones == 0:
+        model.AddBoolOr(literals)
+
+
+def add_not_all(model: cp_model.CpModel, cells: Iterable) -> None:
+    """
+    Forbids the given cells from all being true at once.
+
+    :param model: The CP-SAT model.
+    :type model: cp_model.CpModel
+    :param cells: Planning cells (BoolVars or integer constants).
+    :type cells: Iterable
+    """
+    literals = []
+    for cell in cells:
+        if is_fixed(cell):
+            if cell == 0:
+                return
+        else:
+            literals.append(cell.Not())
+    model.AddBoolOr(literals)
+
+
+def add_or_equality(model: cp_model.CpModel, target, cells: Iterable) -> None:
+    """
+    Links a Boolean variable to the disjunction of the given cells.
+
+    ``target`` is true if and only if at least one of the cells is true. The link
+    is two enforced clauses rather than a pair of reified linear sums.
+
+    :param model: The CP-SAT model.
+    :type model: cp_model.CpModel
+    :param target: The Boolean variable to link.
+    :type target: cp_model.IntVar
+    :param cells: Planning cells (BoolVars or integer constants).
+    :type cells: Iterable
+    """
+    literals, ones = split_literals(cells)
+    if ones:
+        model.AddBoolAnd([target])
+    elif not literals:
+        model.AddBoolAnd([target.Not()])
+    else:
+        model.AddBoolOr(literals).OnlyEnforceIf(target)
+        model.AddBoolAnd([literal.Not() for literal in literals]).OnlyEnforceIf(target.Not())
+
+
+def add_same_truth(model: cp_model.CpModel, left_cells: Iterable, right_cells: Iterable) -> None:
+    """
+    Requires the left cells and the right cells to be either both worked or both free.
+
+    "Worked" means that at least one of the cells is true. Each direction is an
+    enforced clause: when none of one side is true, none of the other side is.
+
+    :param model: The CP-SAT model.
+    :type model: cp_model.CpModel
+    :param left_cells: Planning cells (BoolVars or integer constants).
+    :type left_cells: Iterable
+    :param right_cells: Planning cells (BoolVars or integer constants).
+    :type right_cells: Iterable
+    """
+    left, left_ones = split_literals(left_cells)
+    right, right_ones = split_literals(right_cells)
+    for source, source_ones, target, target_ones in (
+        (left, left_ones, right, right_ones),
+        (right, right_ones, left, left_ones),
+    ):
+        if source_ones:
+            continue
+        if target_ones:
+            model.AddBoolOr(source)
+        elif not target:
+            continue
+        elif source:
+            model.AddBoolAnd([literal.Not() for literal in target]).OnlyEnforceIf(
+                [literal.Not() for literal in source]
+            )
+        else:
+            add_false(model, target)
+
+
+def constraint_counts(model: cp_model.CpModel) -> Dict[str, int]:
+    """
+    Counts the constraints of a model by type, read from its proto.
+
+    :param model: The CP-SAT model.
+    :type model: cp_model.CpModel
+    :return: The number of constraints per type (e.g. "linear", "at_most_one").
+    :rtype: Dict[str, int]
+    """
+    counts = Counter(
+        constraint.WhichOneof("constraint") for constraint in model.Proto().constraints
+    )
+    return dict(sorted(counts.items()))
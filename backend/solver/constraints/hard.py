@@ -1,9 +1,32 @@
 from collections import defaultdict
-from datetime import datetime, timedelta
+from typing import Iterable
 
+from ortools.sat.python import cp_model
+
+from ..calendar import SATURDAY
 from ..context import SolverContext
+from ..domain import (
+    Cell,
+    exclusion_cells,
+    is_fixed,
+    leave_cells,
+    leave_days,
+    night_before_training_cells,
+    night_before_unavailable_cells,
+    pre_post_training_cells,
+    restriction_cells,
+    training_cells,
+    unavailable_cells,
+)
 from ..registry import ConstraintRegistry
-from ..utils import day_token
+from .encoding import (
+    add_at_least_one,
+    add_at_most_one,
+    add_exactly_one,
+    add_false,
+    add_not_all,
+    add_same_truth,
+)
 
 DAY_SHIFT = "Jour"
 NIGHT_SHIFT = "Nuit"
@@ -24,6 +47,40 @@ def _has_shift(ctx: SolverContext, shift_name: str) -> bool:
     return shift_name in ctx.vacations
 
 
+def _forbid_cells(ctx: SolverContext, cells: Iterable[Cell]) -> None:
+    """
+    Forbids the given planning cells.
+
+    Cells already fixed to zero by the domain pre-pass are skipped, and the
+    remaining variables are forbidden by a single clause set instead of one
+    linear constraint per cell.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :param cells: The (agent, day, vacation) index cells to forbid.
+    :type cells: Iterable[Cell]
+    """
+    planning_vars = (ctx.planning.at(*cell) for cell in cells)
+    add_false(ctx.model, (var for var in planning_vars if not is_fixed(var)))
+
+
+def _continuity_start(ctx: SolverContext, lookback: int) -> int:
+    """
+    Returns the first day index read by a continuity rule.
+
+    A rule looking back ``lookback`` days may start that many days before the first
+    planned day, but never before the fixed previous-week days it can read.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :param lookback: The number of days the rule looks back.
+    :type lookback: int
+    :return: The first day index.
+    :rtype: int
+    """
+    return max(ctx.continuity_start, ctx.planned_day_offset - lookback)
+
+
 def register(registry: ConstraintRegistry) -> None:
     """
     Registers all the hard constraints to the given registry.
@@ -74,6 +131,7 @@ def apply_initial_shifts(ctx: SolverContext) -> None:
     to lists of tuples, where each tuple contains a day and a vacation type.
     The function will only apply the shifts if the agent name is valid,
     the vacation type is valid, and the day is in the previous week's schedule.
+    Shifts already fixed by the previous-week assignment table need no constraint.
 
     :param ctx: The solver context containing the problem data and the model.
     :type ctx: SolverContext
@@ -86,7 +144,10 @@ def apply_initial_shifts(ctx: SolverContext) -> None:
                 and vacation in ctx.vacations
                 and day in ctx.previous_week_schedule
             ):
-                ctx.model.Add(ctx.planning[(agent_name, day, vacation)] == 1)
+                planning_var = ctx.planning[(agent_name, day, vacation)]
+                if is_fixed(planning_var) and planning_var == 1:
+                    continue
+                ctx.model.Add(planning_var == 1)
 
 
 def limit_one_shift_per_day(ctx: SolverContext) -> None:
@@ -101,13 +162,10 @@ def limit_one_shift_per_day(ctx: SolverContext) -> None:
     :param ctx: The solver context containing the problem data and the model.
     :type ctx: SolverContext
     """
-    for agent in ctx.agents:
-        agent_name = agent["name"]
-        for day in ctx.week_schedule:
-            ctx.model.Add(
-                sum(ctx.planning[(agent_name, day, vacation)] for vacation in ctx.vacations)
-                <= 1
-            )
+    planning = ctx.planning
+    for agent_idx in range(len(planning.agents)):
+        for day_idx in range(ctx.planned_day_offset, len(planning.days)):
+            add_at_most_one(ctx.model, planning.day_cells(agent_idx, day_idx))
 
 
 def require_at_least_one_shift_per_agent(ctx: SolverContext) -> None:
@@ -121,16 +179,9 @@ def require_at_least_one_shift_per_agent(ctx: SolverContext) -> None:
     :param ctx: The solver context containing the problem data and the model.
     :type ctx: SolverContext
     """
-    for agent in ctx.agents:
-        agent_name = agent["name"]
-        ctx.model.Add(
-            sum(
-                ctx.planning[(agent_name, day, vacation)]
-                for day in ctx.week_schedule
-                for vacation in ctx.vacations
-            )
-            >= 1
-        )
+    planning = ctx.planning
+    for agent_idx in range(len(planning.agents)):
+        add_at_least_one(ctx.model, planning.agent_slice(agent_idx, ctx.planned_day_offset))
 
 
 def cover_daily_shifts(ctx: SolverContext) -> None:
@@ -148,49 +199,48 @@ def cover_daily_shifts(ctx: SolverContext) -> None:
     :param ctx: The solver context containing the problem data and the model.
     :type ctx: SolverContext
     """
-    for day in ctx.week_schedule:
-        day_date = day.split(" ")[1]
-        day_is_weekend = day.startswith(("Sam", "Dim"))
-        for vacation in ctx.vacations:
+    planning = ctx.planning
+    for day_idx in range(ctx.planned_day_offset, len(ctx.calendar)):
+        day = ctx.calendar[day_idx]
+        for vacation_idx, vacation in enumerate(ctx.vacations):
             required_agents = ctx.staffing_requirements.get(vacation, 1)
-            if vacation == CDP_SHIFT and (day_is_weekend or day_date in ctx.holidays):
-                ctx.model.Add(
-                    sum(ctx.planning[(agent["name"], day, CDP_SHIFT)] for agent in ctx.agents)
-                    == 0
+            if vacation == CDP_SHIFT and (day.is_weekend or day.is_holiday):
+                required_agents = 0
+
+            if required_agents == 0:
+                _forbid_cells(
+                    ctx,
+                    ((agent_idx, day_idx, vacation_idx) for agent_idx in range(len(ctx.agents))),
                 )
+            elif required_agents == 1:
+                add_exactly_one(ctx.model, planning.column(day_idx, vacation_idx))
             else:
                 ctx.model.Add(
-                    sum(
-                        ctx.planning[(agent["name"], day, vacation)]
-                        for agent in ctx.agents
-                    )
+                    cp_model.LinearExpr.Sum(planning.column(day_idx, vacation_idx))
                     == required_agents
                 )
 
+
 def enforce_full_weekend_composition(ctx: SolverContext) -> None:
     """
     Ensures weekend assignments are made as full weekends (Saturday + Sunday) per agent.
 
     For each Saturday/Sunday pair in the planning horizon and for each agent, this
     constraint enforces that the agent either works both days or none of them.
-    
+    A Saturday at the end of the fixed previous week is read as a known constant.
+    Since an agent works at most one shift per day, the rule is encoded as clauses.
+
     :param ctx: The solver context containing the problem data and the model.
     :type ctx: SolverContext
     """
-    for day_idx, day in enumerate(ctx.week_schedule[:-1]):
-        next_day = ctx.week_schedule[day_idx + 1]
-        if not (day.startswith("Sam") and next_day.startswith("Dim")):
-            continue
-
-        for agent in ctx.agents:
-            agent_name = agent["name"]
-            saturday_work = sum(
-                ctx.planning[(agent_name, day, vacation)] for vacation in ctx.vacations
-            )
-            sunday_work = sum(
-                ctx.planning[(agent_name, next_day, vacation)] for vacation in ctx.vacations
+    planning = ctx.planning
+    for saturday, sunday in ctx.calendar.weekend_pairs(_continuity_start(ctx, 1)):
+        for agent_idx in range(len(planning.agents)):
+            add_same_truth(
+                ctx.model,
+                planning.day_cells(agent_idx, saturday),
+                planning.day_cells(agent_idx, sunday),
             )
-            ctx.model.Add(saturday_work == sunday_work)
 
 
 def enforce_min_free_weekends_per_horizon(ctx: SolverContext) -> None:
@@ -198,7 +248,9 @@ def enforce_min_free_weekends_per_horizon(ctx: SolverContext) -> None:
     Enforces a minimum number of fully free weekends per agent on the planning horizon.
 
     A weekend is considered free for an agent if the agent works neither Saturday nor Sunday
-    on the corresponding Saturday/Sunday pair.
+    on the corresponding Saturday/Sunday pair. Full weekend composition makes both days
+    equal, so worked weekends are counted with the shared ``ctx.derived.works_weekend``
+    literals.
 
     :param ctx: The solver context containing the problem data and the model.
     :type ctx: SolverContext
@@ -207,12 +259,7 @@ def enforce_min_free_weekends_per_horizon(ctx: SolverContext) -> None:
     if min_free_weekends == 0:
         return
 
-    weekend_pairs = []
-    for day_idx, day in enumerate(ctx.week_schedule[:-1]):
-        next_day = ctx.week_schedule[day_idx + 1]
-        if day.startswith("Sam") and next_day.startswith("Dim"):
-            weekend_pairs.append((day, next_day))
-
+    weekend_pairs = ctx.calendar.weekend_pairs(ctx.planned_day_offset)
     total_weekends = len(weekend_pairs)
     if total_weekends == 0:
         return
@@ -224,35 +271,25 @@ def enforce_min_free_weekends_per_horizon(ctx: SolverContext) -> None:
             f"requested={min_free_weekends}, available_weekends={total_weekends}"
         )
 
-    for agent in ctx.agents:
-        agent_name = agent["name"]
-        worked_weekend_vars = []
-
-        for saturday, sunday in weekend_pairs:
-            works_weekend = ctx.model.NewBoolVar(
-                f"{agent_name}_works_weekend_hard_{saturday}_{sunday}"
-            )
-            saturday_work = sum(
-                ctx.planning[(agent_name, saturday, vacation)] for vacation in ctx.vacations
-            )
-            sunday_work = sum(
-                ctx.planning[(agent_name, sunday, vacation)] for vacation in ctx.vacations
-            )
-            ctx.model.Add(saturday_work == 1).OnlyEnforceIf(works_weekend)
-            ctx.model.Add(sunday_work == 1).OnlyEnforceIf(works_weekend)
-            ctx.model.Add(saturday_work == 0).OnlyEnforceIf(works_weekend.Not())
-            ctx.model.Add(sunday_work == 0).OnlyEnforceIf(works_weekend.Not())
-            worked_weekend_vars.append(works_weekend)
-
+    for agent_idx in range(len(ctx.planning.agents)):
+        worked_weekend_vars = [
+            ctx.derived.works_weekend(agent_idx, saturday, sunday)
+            for saturday, sunday in weekend_pairs
+        ]
         ctx.model.Add(sum(worked_weekend_vars) <= max_worked_weekends)
 
+
 def avoid_day_after_night(ctx: SolverContext) -> None:
     """
     Avoids assigning a day shift after a night shift.
 
     This constraint is applied per agent and per day in the week's schedule.
     For each agent, it ensures that if the agent is assigned a night shift on a given day,
-    the agent is not assigned a day shift on the next day.
+    the agent is not assigned a day shift on the next day. A night on the last day of the
+    fixed previous week is read as a known constant.
+
+    The night and the next day's other shifts are grouped in a single AtMostOne
+    constraint instead of one enforced linear constraint per shift.
 
     :param ctx: The solver context containing the problem data and the model.
     :type ctx: SolverContext
@@ -260,17 +297,20 @@ def avoid_day_after_night(ctx: SolverContext) -> None:
     if not _has_shift(ctx, NIGHT_SHIFT):
         return
 
-    for agent in ctx.agents:
-        agent_name = agent["name"]
-        for day_idx, day in enumerate(ctx.week_schedule[:-1]):
-            next_day = ctx.week_schedule[day_idx + 1]
-            night_var = ctx.planning[(agent_name, day, NIGHT_SHIFT)]
-            for vacation in ctx.vacations:
-                if vacation == NIGHT_SHIFT:
-                    continue
-                ctx.model.Add(ctx.planning[(agent_name, next_day, vacation)] == 0).OnlyEnforceIf(
-                    night_var
-                )
+    planning = ctx.planning
+    night_idx = planning.vacation_index[NIGHT_SHIFT]
+    for agent_idx in range(len(planning.agents)):
+        for day_idx in range(_continuity_start(ctx, 1), len(planning.days) - 1):
+            night_var = planning.at(agent_idx, day_idx, night_idx)
+            if is_fixed(night_var) and night_var == 0:
+                continue
+            next_vars = [
+                next_var
+                for vacation_idx, next_var in enumerate(planning.day_cells(agent_idx, day_idx + 1))
+                if vacation_idx != night_idx and not is_fixed(next_var)
+            ]
+            if next_vars:
+                add_at_most_one(ctx.model, [night_var] + next_vars)
 
 
 def limit_cdp_per_week(ctx: SolverContext) -> None:
@@ -288,10 +328,12 @@ def limit_cdp_per_week(ctx: SolverContext) -> None:
     if not _has_shift(ctx, CDP_SHIFT):
         return
 
-    for agent in ctx.agents:
-        agent_name = agent["name"]
-        for week in ctx.weeks_split:
-            ctx.model.Add(sum(ctx.planning[(agent_name, day, CDP_SHIFT)] for day in week) <= 2)
+    planning = ctx.planning
+    cdp_idx = planning.vacation_index[CDP_SHIFT]
+    weeks = ctx.calendar.weeks(ctx.planned_day_offset)
+    for agent_idx in range(len(planning.agents)):
+        for week in weeks:
+            ctx.model.Add(sum(planning.at(agent_idx, day_idx, cdp_idx) for day_idx in week) <= 2)
 
 
 def block_unavailable_days(ctx: SolverContext) -> None:
@@ -306,14 +348,7 @@ def block_unavailable_days(ctx: SolverContext) -> None:
     :param ctx: The solver context containing the problem data and the model.
     :type ctx: SolverContext
     """
-    for agent in ctx.agents:
-        agent_name = agent["name"]
-        unavailable_days = [day_token(date) for date in agent.get("unavailable", [])]
-        for unavailable_day in unavailable_days:
-            for day in ctx.week_schedule:
-                if unavailable_day in day:
-                    for vacation in ctx.vacations:
-                        ctx.model.Add(ctx.planning[(agent_name, day, vacation)] == 0)
+    _forbid_cells(ctx, unavailable_cells(ctx))
 
 
 def block_training_days(ctx: SolverContext) -> None:
@@ -328,14 +363,7 @@ def block_training_days(ctx: SolverContext) -> None:
     :param ctx: The solver context containing the problem data and the model.
     :type ctx: SolverContext
     """
-    for agent in ctx.agents:
-        agent_name = agent["name"]
-        training_days = [day_token(date) for date in agent.get("training", [])]
-        for training_day in training_days:
-            for day in ctx.week_schedule:
-                if training_day in day:
-                    for vacation in ctx.vacations:
-                        ctx.model.Add(ctx.planning[(agent_name, day, vacation)] == 0)
+    _forbid_cells(ctx, training_cells(ctx))
 
 
 def block_leave_and_compute_paid_hours(ctx: SolverContext) -> None:
@@ -355,51 +383,12 @@ def block_leave_and_compute_paid_hours(ctx: SolverContext) -> None:
 
     :return: None
     """
-    date_format_full = "%d-%m-%Y"
     leave_paid_hours_by_day = defaultdict(int)
+    for agent_idx, day_idx in leave_days(ctx):
+        if ctx.calendar[day_idx].weekday < 6:
+            leave_paid_hours_by_day[(agent_idx, day_idx)] = ctx.conge_duration
 
-    for agent in ctx.agents:
-        agent_name = agent["name"]
-        vacations_periods = agent.get("vacations", [])
-        if not isinstance(vacations_periods, list):
-            continue
-
-        for vac in vacations_periods:
-            if not (isinstance(vac, dict) and "start" in vac and "end" in vac):
-                continue
-
-            vacation_start = datetime.strptime(vac["start"], date_format_full)
-            vacation_end = datetime.strptime(vac["end"], date_format_full)
-
-            for day_str in ctx.week_schedule:
-                day_date = ctx.day_dates.get(day_str)
-                if day_date is None:
-                    day_part = day_str.split(" ")[1]
-                    try:
-                        day_date = datetime.strptime(
-                            f"{day_part}-{vacation_start.year}", date_format_full
-                        )
-                    except ValueError:
-                        continue
-
-                if vacation_start <= day_date <= vacation_end:
-                    for vacation in ctx.vacations:
-                        ctx.model.Add(ctx.planning[(agent_name, day_str, vacation)] == 0)
-                    if day_date.weekday() < 6:
-                        leave_paid_hours_by_day[(agent_name, day_str)] = ctx.conge_duration
-
-            if vacation_start.weekday() == 0:
-                previous_saturday = vacation_start - timedelta(days=2)
-                previous_sunday = vacation_start - timedelta(days=1)
-                for weekend_day in [previous_saturday, previous_sunday]:
-                    weekend_str = weekend_day.strftime("%a %d-%m").capitalize()
-                    if (
-                        weekend_str in ctx.week_schedule
-                        or weekend_str in ctx.previous_week_schedule
-                    ):
-                        for vacation in ctx.vacations:
-                            ctx.model.Add(ctx.planning[(agent_name, weekend_str, vacation)] == 0)
-
+    _forbid_cells(ctx, leave_cells(ctx))
     ctx.leave_paid_hours_by_day = leave_paid_hours_by_day
 
 
@@ -407,7 +396,8 @@ def limit_day_shifts_per_week(ctx: SolverContext) -> None:
     """
     Limits the number of day shifts per week to three.
 
-    This constraint is applied per agent and per week in the week's schedule.
+    This constraint is applied per agent and per calendar week (ISO week when the
+    calendar is anchored) in the week's schedule.
     For each agent, it ensures that the sum of all day shift variables for that agent
     on that week is less than or equal to three. This prevents the agent from being
     assigned more than three day shifts per week.
@@ -418,18 +408,14 @@ def limit_day_shifts_per_week(ctx: SolverContext) -> None:
     if not _has_shift(ctx, DAY_SHIFT):
         return
 
-    week_days = [
-        (day, datetime.strptime(day.split(" ")[1], "%d-%m")) for day in ctx.week_schedule
-    ]
-    weeks_dict = defaultdict(list)
-    for day_str, day_date in week_days:
-        week_number = day_date.isocalendar()[:2]
-        weeks_dict[week_number].append(day_str)
-
-    for agent in ctx.agents:
-        agent_name = agent["name"]
-        for days in weeks_dict.values():
-            ctx.model.Add(sum(ctx.planning[(agent_name, day, DAY_SHIFT)] for day in days) <= 3)
+    planning = ctx.planning
+    day_shift_idx = planning.vacation_index[DAY_SHIFT]
+    weeks = ctx.calendar.weeks(ctx.planned_day_offset)
+    for agent_idx in range(len(planning.agents)):
+        for week in weeks:
+            ctx.model.Add(
+                sum(planning.at(agent_idx, day_idx, day_shift_idx) for day_idx in week) <= 3
+            )
 
 
 def block_night_before_unavailable(ctx: SolverContext) -> None:
@@ -443,16 +429,7 @@ def block_night_before_unavailable(ctx: SolverContext) -> None:
     :param ctx: The solver context containing the problem data and the model.
     :type ctx: SolverContext
     """
-    if not _has_shift(ctx, NIGHT_SHIFT):
-        return
-
-    for agent in ctx.agents:
-        agent_name = agent["name"]
-        unavailable_days = [day_token(date) for date in agent.get("unavailable", [])]
-        for day_idx, day in enumerate(ctx.week_schedule[:-1]):
-            next_day = ctx.week_schedule[day_idx + 1]
-            if any(unavailable_day in next_day for unavailable_day in unavailable_days):
-                ctx.model.Add(ctx.planning[(agent_name, day, NIGHT_SHIFT)] == 0)
+    _forbid_cells(ctx, night_before_unavailable_cells(ctx))
 
 
 def block_night_before_training(ctx: SolverContext) -> None:
@@ -466,16 +443,7 @@ def block_night_before_training(ctx: SolverContext) -> None:
     :param ctx: The solver context containing the problem data and the model.
     :type ctx: SolverContext
     """
-    if not _has_shift(ctx, NIGHT_SHIFT):
-        return
-
-    for agent in ctx.agents:
-        agent_name = agent["name"]
-        training_days = [day_token(date) for date in agent.get("training", [])]
-        for day_idx, day in enumerate(ctx.week_schedule[:-1]):
-            next_day = ctx.week_schedule[day_idx + 1]
-            if any(training_day in next_day for training_day in training_days):
-                ctx.model.Add(ctx.planning[(agent_name, day, NIGHT_SHIFT)] == 0)
+    _forbid_cells(ctx, night_before_training_cells(ctx))
 
 
 def limit_pre_post_training(ctx: SolverContext) -> None:
@@ -490,31 +458,7 @@ def limit_pre_post_training(ctx: SolverContext) -> None:
     :param ctx: The solver context containing the problem data and the model.
     :type ctx: SolverContext
     """
-    if not _has_shift(ctx, CDP_SHIFT):
-        return
-
-    for agent in ctx.agents:
-        agent_name = agent["name"]
-        training_days = [day_token(date) for date in agent.get("training", [])]
-
-        for day_idx, day in enumerate(ctx.week_schedule):
-            if not any(training_day in day for training_day in training_days):
-                continue
-
-            if day_idx > 0:
-                previous_day = ctx.week_schedule[day_idx - 1]
-                for vacation in ctx.vacations:
-                    if vacation != CDP_SHIFT:
-                        ctx.model.Add(ctx.planning[(agent_name, previous_day, vacation)] == 0)
-
-            if day_idx < len(ctx.week_schedule) - 1:
-                next_day = ctx.week_schedule[day_idx + 1]
-                allowed_vacations = [CDP_SHIFT]
-                if _has_shift(ctx, NIGHT_SHIFT):
-                    allowed_vacations.append(NIGHT_SHIFT)
-                for vacation in ctx.vacations:
-                    if vacation not in allowed_vacations:
-                        ctx.model.Add(ctx.planning[(agent_name, next_day, vacation)] == 0)
+    _forbid_cells(ctx, pre_post_training_cells(ctx))
 
 
 def block_exclusion_days(ctx: SolverContext) -> None:
@@ -529,15 +473,7 @@ def block_exclusion_days(ctx: SolverContext) -> None:
     :param ctx: The solver context containing the problem data and the model.
     :type ctx: SolverContext
     """
-    for agent in ctx.agents:
-        agent_name = agent["name"]
-        exclusion_days = [day_token(date) for date in agent.get("exclusion", [])]
-        for exclusion_day in exclusion_days:
-            for day_str in ctx.week_schedule:
-                day_date = day_str.split(" ")[1]
-                if exclusion_day == day_date:
-                    for vacation in ctx.vacations:
-                        ctx.model.Add(ctx.planning[(agent_name, day_str, vacation)] == 0)
+    _forbid_cells(ctx, exclusion_cells(ctx))
 
 
 def block_monday_night_after_weekend_nights(ctx: SolverContext) -> None:
@@ -547,6 +483,7 @@ def block_monday_night_after_weekend_nights(ctx: SolverContext) -> None:
     This constraint is applied per agent and per day in the week's schedule.
     For each agent, it ensures that if the agent is assigned a night shift on a Saturday,
     the agent is not assigned a night shift on the following Monday.
+    Weekend nights from the fixed previous week are read as known constants.
 
     :param ctx: The solver context containing the problem data and the model.
     :type ctx: SolverContext
@@ -554,22 +491,20 @@ def block_monday_night_after_weekend_nights(ctx: SolverContext) -> None:
     if not _has_shift(ctx, NIGHT_SHIFT):
         return
 
-    for agent in ctx.agents:
-        agent_name = agent["name"]
-        for day_idx, day in enumerate(ctx.week_schedule[:-2]):
-            if "Sam" in day:
-                sunday_idx = day_idx + 1
-                monday_idx = day_idx + 2
-                if sunday_idx < len(ctx.week_schedule) and monday_idx < len(ctx.week_schedule):
-                    sunday = ctx.week_schedule[sunday_idx]
-                    monday = ctx.week_schedule[monday_idx]
-                    saturday_night = ctx.planning[(agent_name, day, NIGHT_SHIFT)]
-                    sunday_night = ctx.planning[(agent_name, sunday, NIGHT_SHIFT)]
-                    ctx.model.Add(
-                        ctx.planning[(agent_name, monday, NIGHT_SHIFT)] == 0
-                    ).OnlyEnforceIf(
-                        [saturday_night, sunday_night]
-                    )
+    planning = ctx.planning
+    night_idx = planning.vacation_index[NIGHT_SHIFT]
+    for agent_idx in range(len(planning.agents)):
+        for day_idx in range(_continuity_start(ctx, 2), len(planning.days) - 2):
+            if ctx.calendar[day_idx].weekday == SATURDAY:
+                saturday_night = planning.at(agent_idx, day_idx, night_idx)
+                sunday_night = planning.at(agent_idx, day_idx + 1, night_idx)
+                monday_night = planning.at(agent_idx, day_idx + 2, night_idx)
+                weekend_nights = [saturday_night, sunday_night]
+                if is_fixed(monday_night) or any(
+                    is_fixed(var) and var == 0 for var in weekend_nights
+                ):
+                    continue
+                add_not_all(ctx.model, weekend_nights + [monday_night])
 
 
 def apply_agent_restrictions(ctx: SolverContext) -> None:
@@ -583,9 +518,4 @@ def apply_agent_restrictions(ctx: SolverContext) -> None:
     :param ctx: The solver context containing the problem data and the model.
     :type ctx: SolverContext
     """
-    for agent in ctx.agents:
-        agent_name = agent["name"]
-        restricted_vacations = agent.get("restriction", [])
-        for day in ctx.week_schedule:
-            for restricted_vacation in restricted_vacations:
-                ctx.model.Add(ctx.planning[(agent_name, day, restricted_vacation)] == 0)
+    _forbid_cells(ctx, restriction_cells(ctx))
@@ -1,5 +1,6 @@
 from ..context import SolverContext
 from ..registry import ConstraintRegistry
+from .elastic import CAP_WEEKLY_HOURS, add_cap
 
 DAY_SHIFT = "Jour"
 NIGHT_SHIFT = "Nuit"
@@ -27,24 +28,37 @@ def limit_weekly_nights_and_hours(ctx: SolverContext) -> None:
     For each agent, it allows at most 3 night shifts per week and caps worked
     hours using solver.max_weekly_hours. The worked-hours cap counts all
     configured vacations assigned by the solver and does not include paid leave.
+    With ``solver.elastic_max_weekly_hours``, the hours cap may be exceeded by a
+    slack penalized in the objective.
 
     :param ctx: The solver context containing the problem data and the model.
     :type ctx: SolverContext
     """
-    for agent in ctx.agents:
-        agent_name = agent["name"]
-
-        for week in ctx.weeks_split:
-            if NIGHT_SHIFT in ctx.vacations:
+    planning = ctx.planning
+    durations = [ctx.shift_durations[vacation] for vacation in planning.vacations]
+    night_idx = planning.vacation_index.get(NIGHT_SHIFT)
+    weeks = ctx.calendar.weeks(ctx.planned_day_offset)
+    for agent_idx in range(len(planning.agents)):
+        for week in weeks:
+            if night_idx is not None:
                 ctx.model.Add(
-                    sum(ctx.planning[(agent_name, day, NIGHT_SHIFT)] for day in week) <= 3
+                    sum(planning.at(agent_idx, day_idx, night_idx) for day_idx in week) <= 3
                 )
 
             total_hours = sum(
                 sum(
-                    ctx.planning[(agent_name, day, vacation)] * ctx.shift_durations[vacation]
-                    for vacation in ctx.vacations
+                    cell * duration
+                    for cell, duration in zip(planning.day_cells(agent_idx, day_idx), durations)
                 )
-                for day in week
+                for day_idx in week
+            )
+            # One shift a day: the week cannot hold more than its days of the longest shift
+            add_cap(
+                ctx,
+                CAP_WEEKLY_HOURS,
+                total_hours,
+                ctx.max_weekly_hours,
+                len(week) * max(durations, default=0),
+                week,
+                [agent_idx],
             )
-            ctx.model.Add(total_hours <= ctx.max_weekly_hours)
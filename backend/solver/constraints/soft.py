@@ -1,31 +1,25 @@
 from ortools.sat.python import cp_model
 
+from ..calendar import SATURDAY
 from ..context import SolverContext
 from ..registry import ConstraintRegistry
-from ..utils import split_by_month_or_period
+from .elastic import CAP_GLOBAL_GAP, CAP_PERIOD_GAP, add_cap, is_elastic
 
 CDP_SHIFT = "CDP"
 
+# Upper bounds of the min and max paid-hour variables, in hours * 10. A gap between
+# them, and so its excess over an elastic cap, cannot exceed them either.
+HORIZON_HOURS_BOUND = 10000
+PERIOD_HOURS_BOUND = 100000
 
-def _assignment_sum(ctx: SolverContext, agent_name: str, day: str, vacations: list[str]) -> int:
-    """
-    Computes the sum of assignments for a given agent, day, and list of vacations.
-
-    :param ctx: The solver context containing the problem data and the model.
-    :type ctx: SolverContext
-    :param agent_name: The name of the agent.
-    :type agent_name: str
-    :param day: The day of the week.
-    :type day: str
-    :param vacations: A list of vacations.
-    :type vacations: list[str]
-    :return: The sum of assignments for the given agent, day, and list of vacations.
-    :rtype: int
-    """
-    relevant = [vacation for vacation in vacations if vacation in ctx.vacations]
-    if not relevant:
-        return 0
-    return sum(ctx.planning[(agent_name, day, vacation)] for vacation in relevant)
+WEEKEND_FAIRNESS_QUADRATIC = "quadratic"
+WEEKEND_FAIRNESS_TABLE = "table"
+WEEKEND_FAIRNESS_SPREAD = "spread"
+WEEKEND_FAIRNESS_MODES = (
+    WEEKEND_FAIRNESS_QUADRATIC,
+    WEEKEND_FAIRNESS_TABLE,
+    WEEKEND_FAIRNESS_SPREAD,
+)
 
 
 def _working_vacations(ctx: SolverContext) -> list[str]:
@@ -43,6 +37,33 @@ def _working_vacations(ctx: SolverContext) -> list[str]:
     return list(ctx.vacations)
 
 
+def _paid_hours_expr(ctx: SolverContext, agent_idx: int, days: list[int]):
+    """
+    Builds the paid hours of an agent over the given days, in hours * 10.
+
+    Paid hours are the worked shift durations plus the paid leave hours.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :param agent_idx: The index of the agent.
+    :type agent_idx: int
+    :param days: The day indices to sum over.
+    :type days: list[int]
+    :return: The paid hours expression.
+    :rtype: cp_model.LinearExpr
+    """
+    planning = ctx.planning
+    durations = [ctx.shift_durations[vacation] for vacation in planning.vacations]
+    cells = []
+    weights = []
+    leave_hours = 0
+    for day_idx in days:
+        cells.extend(planning.day_cells(agent_idx, day_idx))
+        weights.extend(durations)
+        leave_hours += ctx.leave_paid_hours_by_day[(agent_idx, day_idx)]
+    return cp_model.LinearExpr.WeightedSum(cells, weights) + leave_hours
+
+
 def register(registry: ConstraintRegistry) -> None:
     """
     Registers the soft constraints for the solver.
@@ -60,38 +81,52 @@ def register(registry: ConstraintRegistry) -> None:
     registry.register_soft(balance_full_weekends)
 
 
+def _bound_hours(ctx: SolverContext, cap: str, min_hours, max_hours, hours: list) -> None:
+    """
+    Keeps the paid hours of every agent between ``min_hours`` and ``max_hours``.
+
+    One-sided bounds are enough for a hard gap. An elastic gap ties them to the actual
+    minimum and maximum, so ``cap_excess_report`` reads the real gap even when a zero
+    penalty weight lets the bounds drift apart.
+    """
+    if is_elastic(ctx, cap):
+        ctx.model.AddMinEquality(min_hours, hours)
+        ctx.model.AddMaxEquality(max_hours, hours)
+        return
+    for agent_hours in hours:
+        ctx.model.Add(min_hours <= agent_hours)
+        ctx.model.Add(agent_hours <= max_hours)
+
+
 def balance_paid_hours(ctx: SolverContext) -> None:
     """
     Balances paid hours across all agents in the week's schedule.
 
     This constraint ensures that the difference between the maximum and minimum paid hours
-    across all agents is less than or equal to the global maximum gap.
+    across all agents is less than or equal to the global maximum gap. With
+    ``solver.elastic_gaps``, the gap may exceed it by a slack penalized in the objective.
 
     :param ctx: The solver context containing the problem data and the model.
     :type ctx: SolverContext
     """
+    planned_days = list(range(ctx.planned_day_offset, len(ctx.calendar)))
     paid_hours = {}
-    for agent in ctx.agents:
-        agent_name = agent["name"]
-        paid_hours[agent_name] = cp_model.LinearExpr.Sum(
-            list(
-                sum(
-                    ctx.planning[(agent_name, day, vacation)] * ctx.shift_durations[vacation]
-                    for vacation in ctx.vacations
-                )
-                + ctx.leave_paid_hours_by_day[(agent_name, day)]
-                for day in ctx.week_schedule
-            )
-        )
+    for agent_idx, agent in enumerate(ctx.agents):
+        paid_hours[agent["name"]] = _paid_hours_expr(ctx, agent_idx, planned_days)
 
-    min_hours = ctx.model.NewIntVar(0, 10000, "min_hours")
-    max_hours = ctx.model.NewIntVar(0, 10000, "max_hours")
+    min_hours = ctx.model.NewIntVar(0, HORIZON_HOURS_BOUND, "min_hours")
+    max_hours = ctx.model.NewIntVar(0, HORIZON_HOURS_BOUND, "max_hours")
 
-    for agent_name in paid_hours:
-        ctx.model.Add(min_hours <= paid_hours[agent_name])
-        ctx.model.Add(paid_hours[agent_name] <= max_hours)
+    _bound_hours(ctx, CAP_GLOBAL_GAP, min_hours, max_hours, list(paid_hours.values()))
 
-    ctx.model.Add(max_hours - min_hours <= ctx.global_max_gap)
+    add_cap(
+        ctx,
+        CAP_GLOBAL_GAP,
+        max_hours - min_hours,
+        ctx.global_max_gap,
+        HORIZON_HOURS_BOUND,
+        planned_days,
+    )
 
 
 def balance_paid_hours_by_period(ctx: SolverContext) -> None:
@@ -100,39 +135,37 @@ def balance_paid_hours_by_period(ctx: SolverContext) -> None:
 
     This constraint is applied by splitting the week's schedule into periods (either months or periods).
     For each period, it ensures that the difference between the maximum and minimum paid hours
-    across all agents is less than or equal to the period's maximum gap.
+    across all agents is less than or equal to the period's maximum gap. With
+    ``solver.elastic_gaps``, each gap may exceed it by a slack penalized in the objective.
 
     :param ctx: The solver context containing the problem data and the model.
     :type ctx: SolverContext
     """
-    periods = split_by_month_or_period(ctx.week_schedule)
+    periods = ctx.calendar.periods(ctx.planned_day_offset)
 
     period_balancing_terms = []
     for period_idx, period in enumerate(periods):
         period_total_hours = {}
-        for agent in ctx.agents:
-            agent_name = agent["name"]
-            period_total_hours[agent_name] = cp_model.LinearExpr.Sum(
-                list(
-                    sum(
-                        ctx.planning[(agent_name, day, vacation)] * ctx.shift_durations[vacation]
-                        for vacation in ctx.vacations
-                    )
-                    + ctx.leave_paid_hours_by_day[(agent_name, day)]
-                    for day in period
-                )
-            )
+        for agent_idx, agent in enumerate(ctx.agents):
+            period_total_hours[agent["name"]] = _paid_hours_expr(ctx, agent_idx, period)
 
-        min_period_hours = ctx.model.NewIntVar(0, 100000, f"min_hours_period_{period_idx}")
-        max_period_hours = ctx.model.NewIntVar(0, 100000, f"max_hours_period_{period_idx}")
-        for agent in ctx.agents:
-            agent_name = agent["name"]
-            ctx.model.Add(min_period_hours <= period_total_hours[agent_name])
-            ctx.model.Add(period_total_hours[agent_name] <= max_period_hours)
+        min_period_hours = ctx.model.NewIntVar(
+            0, PERIOD_HOURS_BOUND, f"min_hours_period_{period_idx}"
+        )
+        max_period_hours = ctx.model.NewIntVar(
+            0, PERIOD_HOURS_BOUND, f"max_hours_period_{period_idx}"
+        )
+        _bound_hours(
+            ctx,
+            CAP_PERIOD_GAP,
+            min_period_hours,
+            max_period_hours,
+            list(period_total_hours.values()),
+        )
 
-        period_gap = ctx.model.NewIntVar(0, 100000, f"period_gap_{period_idx}")
+        period_gap = ctx.model.NewIntVar(0, PERIOD_HOURS_BOUND, f"period_gap_{period_idx}")
         ctx.model.Add(period_gap == max_period_hours - min_period_hours)
-        ctx.model.Add(period_gap <= ctx.period_max_gap)
+        add_cap(ctx, CAP_PERIOD_GAP, period_gap, ctx.period_max_gap, PERIOD_HOURS_BOUND, period)
         period_balancing_terms.append(period_gap)
 
     ctx.period_balancing_objective = cp_model.LinearExpr.Sum(period_balancing_terms)
@@ -142,83 +175,143 @@ def balance_full_weekends(ctx: SolverContext) -> None:
     """
     Balances full weekends (Saturday and Sunday) among agents.
 
-    For each pair of Saturday and Sunday, adds a boolean variable to indicate if the
-    agent works on that weekend. Adds constraints to ensure that the variable is
-    only true if the agent works on both Saturday and Sunday.
+    For each pair of Saturday and Sunday, reads the shared ``ctx.derived.works_weekend``
+    literal, which is true only if the agent works on both Saturday and Sunday.
 
     For each agent, adds a integer variable to count the number of weekends the agent
     works. Adds constraints to ensure that the variable is equal to the sum of the
     boolean variables representing the agent's work on each weekend.
 
-    Adds a minimization objective to minimize the difference between the maximum and
-    minimum number of weekends worked by all agents. Adds a quadratic objective to
-    minimize the squared difference between the number of weekends worked by each agent
-    and the target number of weekends per agent.
+    The fairness term depends on ``ctx.weekend_fairness_mode``:
+    - "quadratic": squared difference between the weekends worked by each agent and
+      the target number of weekends per agent, built with a product constraint.
+    - "table": the same squared difference, read from a precomputed table with an
+      element constraint (same objective values, no non-linear constraint).
+    - "spread": difference between the maximum and minimum number of weekends worked.
 
     :param ctx: The solver context containing the problem data and the model.
     :type ctx: SolverContext
     """
-    total_weekends = sum(1 for day in ctx.week_schedule if "Sam" in day)
+    planned_days = ctx.calendar.days[ctx.planned_day_offset:]
+    total_weekends = sum(1 for day in planned_days if day.weekday == SATURDAY)
+    weekend_pairs = ctx.calendar.weekend_pairs(ctx.planned_day_offset)
     target_weekends_per_agent = total_weekends // len(ctx.agents)
-    working_vacations = _working_vacations(ctx)
+    working_vacations = [ctx.planning.vacation_index[vacation] for vacation in _working_vacations(ctx)]
 
     weekends_worked = {}
-    for agent in ctx.agents:
+    for agent_idx, agent in enumerate(ctx.agents):
         agent_name = agent["name"]
         weekends_worked[agent_name] = ctx.model.NewIntVar(
             0, total_weekends, f"weekends_worked_{agent_name}"
         )
 
-        weekend_count = []
-        for day_idx, day in enumerate(ctx.week_schedule):
-            if (
-                "Sam" in day
-                and day_idx + 1 < len(ctx.week_schedule)
-                and "Dim" in ctx.week_schedule[day_idx + 1]
-            ):
-                saturday = day
-                sunday = ctx.week_schedule[day_idx + 1]
-
-                saturday_work = ctx.model.NewBoolVar(f"{agent_name}_works_saturday_{saturday}")
-                sunday_work = ctx.model.NewBoolVar(f"{agent_name}_works_sunday_{sunday}")
-
-                ctx.model.Add(
-                    _assignment_sum(ctx, agent_name, saturday, working_vacations) > 0
-                ).OnlyEnforceIf(saturday_work)
-                ctx.model.Add(
-                    _assignment_sum(ctx, agent_name, saturday, working_vacations) == 0
-                ).OnlyEnforceIf(saturday_work.Not())
-
-                ctx.model.Add(
-                    _assignment_sum(ctx, agent_name, sunday, working_vacations) > 0
-                ).OnlyEnforceIf(sunday_work)
-                ctx.model.Add(
-                    _assignment_sum(ctx, agent_name, sunday, working_vacations) == 0
-                ).OnlyEnforceIf(sunday_work.Not())
-
-                works_weekend = ctx.model.NewBoolVar(
-                    f"{agent_name}_works_weekend_{saturday}_{sunday}"
-                )
-                ctx.model.AddBoolAnd([saturday_work, sunday_work]).OnlyEnforceIf(works_weekend)
-                ctx.model.AddBoolOr([saturday_work.Not(), sunday_work.Not()]).OnlyEnforceIf(
-                    works_weekend.Not()
-                )
-                weekend_count.append(works_weekend)
+        weekend_count = [
+            ctx.derived.works_weekend(agent_idx, saturday_idx, sunday_idx, working_vacations)
+            for saturday_idx, sunday_idx in weekend_pairs
+        ]
 
         ctx.model.Add(weekends_worked[agent_name] == sum(weekend_count))
 
+    if ctx.weekend_fairness_mode == WEEKEND_FAIRNESS_SPREAD:
+        ctx.weekend_balancing_objective = _weekend_spread(ctx, weekends_worked, total_weekends)
+        return
+
     weekend_balancing_terms = []
     for agent in ctx.agents:
         agent_name = agent["name"]
-        difference = ctx.model.NewIntVar(
-            -2 * total_weekends, 2 * total_weekends, f"difference_weekends_{agent_name}"
-        )
-        squared_difference = ctx.model.NewIntVar(
-            0, (total_weekends * 2) ** 2, f"squared_difference_weekends_{agent_name}"
-        )
-
-        ctx.model.Add(difference == weekends_worked[agent_name] - target_weekends_per_agent)
-        ctx.model.AddMultiplicationEquality(squared_difference, [difference, difference])
+        if ctx.weekend_fairness_mode == WEEKEND_FAIRNESS_TABLE:
+            squared_difference = _squared_difference_by_table(
+                ctx, agent_name, weekends_worked[agent_name], total_weekends, target_weekends_per_agent
+            )
+        else:
+            squared_difference = _squared_difference_by_product(
+                ctx, agent_name, weekends_worked[agent_name], total_weekends, target_weekends_per_agent
+            )
         weekend_balancing_terms.append(squared_difference)
 
     ctx.weekend_balancing_objective = cp_model.LinearExpr.Sum(weekend_balancing_terms)
+
+
+def _squared_difference_by_product(
+    ctx: SolverContext, agent_name: str, weekends_worked, total_weekends: int, target: int
+):
+    """
+    Returns the squared distance to the weekend target, built with a product constraint.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :param agent_name: The name of the agent.
+    :type agent_name: str
+    :param weekends_worked: The number of weekends worked by the agent.
+    :type weekends_worked: cp_model.IntVar
+    :param total_weekends: The number of weekends in the planning horizon.
+    :type total_weekends: int
+    :param target: The target number of weekends per agent.
+    :type target: int
+    :return: The squared difference variable.
+    :rtype: cp_model.IntVar
+    """
+    difference = ctx.model.NewIntVar(
+        -2 * total_weekends, 2 * total_weekends, f"difference_weekends_{agent_name}"
+    )
+    squared_difference = ctx.model.NewIntVar(
+        0, (total_weekends * 2) ** 2, f"squared_difference_weekends_{agent_name}"
+    )
+
+    ctx.model.Add(difference == weekends_worked - target)
+    ctx.model.AddMultiplicationEquality(squared_difference, [difference, difference])
+    return squared_difference
+
+
+def _squared_difference_by_table(
+    ctx: SolverContext, agent_name: str, weekends_worked, total_weekends: int, target: int
+):
+    """
+    Returns the squared distance to the weekend target, read from a precomputed table.
+
+    The weekend count only takes ``total_weekends + 1`` values, so the penalty of each
+    count is computed in Python and selected with an element constraint. The values
+    are the same as the product formulation, without a non-linear constraint.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :param agent_name: The name of the agent.
+    :type agent_name: str
+    :param weekends_worked: The number of weekends worked by the agent.
+    :type weekends_worked: cp_model.IntVar
+    :param total_weekends: The number of weekends in the planning horizon.
+    :type total_weekends: int
+    :param target: The target number of weekends per agent.
+    :type target: int
+    :return: The squared difference variable.
+    :rtype: cp_model.IntVar
+    """
+    penalties = [(count - target) ** 2 for count in range(total_weekends + 1)]
+    squared_difference = ctx.model.NewIntVar(
+        min(penalties), max(penalties), f"squared_difference_weekends_{agent_name}"
+    )
+    ctx.model.AddElement(weekends_worked, penalties, squared_difference)
+    return squared_difference
+
+
+def _weekend_spread(ctx: SolverContext, weekends_worked: dict, total_weekends: int):
+    """
+    Returns the gap between the most and the least weekends worked by an agent.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :param weekends_worked: The number of weekends worked, per agent name.
+    :type weekends_worked: dict
+    :param total_weekends: The number of weekends in the planning horizon.
+    :type total_weekends: int
+    :return: The weekend spread variable.
+    :rtype: cp_model.IntVar
+    """
+    max_weekends = ctx.model.NewIntVar(0, total_weekends, "max_weekends_worked")
+    min_weekends = ctx.model.NewIntVar(0, total_weekends, "min_weekends_worked")
+    ctx.model.AddMaxEquality(max_weekends, list(weekends_worked.values()))
+    ctx.model.AddMinEquality(min_weekends, list(weekends_worked.values()))
+
+    weekend_spread = ctx.model.NewIntVar(0, total_weekends, "weekend_spread")
+    ctx.model.Add(weekend_spread == max_weekends - min_weekends)
+    return weekend_spread
@@ -1,9 +1,18 @@
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import TYPE_CHECKING, Dict, List, Set, Tuple
 
 from ortools.sat.python import cp_model
 
+from .availability import AvailabilityTensor
+from .calendar import Calendar
+from .compiled_config import CompiledConfig
+from .tensor import PlanningTensor
+
+if TYPE_CHECKING:
+    from .constraints.elastic import CapExcess
+    from .derived import DerivedVariables
+
 
 @dataclass
 class SolverContext:
@@ -27,9 +36,19 @@ class SolverContext:
         initial_shifts (dict): Dictionary containing initial shift assignments before optimization.
         holidays (List[str]): List of public holidays or special non-working dates.
         
-        weeks_split (List[List[str]]): Weekly breakdown of the schedule, partitioned into sublists.
-        planning (Dict[Tuple[str, str, str], cp_model.IntVar]): Mapping of (agent, day, shift) to CP integer variables.
-        leave_paid_hours_by_day (Dict[Tuple[str, str], int]): Paid leave hours indexed by (agent, day).
+        compiled_config (CompiledConfig): Runtime configuration compiled once (agent records, index maps, bitmasks).
+        calendar (Calendar): Typed calendar of the previous-week and planned days, aligned with ``planning.days``.
+        availability (AvailabilityTensor): Agent leave, unavailable, training, exclusion and holiday flags per calendar day.
+        planning (PlanningTensor): Integer-indexed store of (agent, day, shift) cells holding CP Boolean variables,
+            or integer constants for cells fixed before solving. Label tuples are still accepted as keys.
+        derived (DerivedVariables): Memoized literals derived from the planning cells (works on a day, works a weekend),
+            shared by all constraint modules.
+        planned_day_offset (int): Index of the first planned day in ``planning.days`` (previous-week days come first).
+        fixed_zero_cells (Set[Tuple[int, int, int]]): (agent, day, vacation) index cells fixed to zero before any variable is created.
+        previous_week_assignments (Dict[Tuple[int, int], int]): Fixed previous-week table mapping (agent, day) indices to a vacation index.
+        continuity_start (int): Index of the first day read by continuity rules; earlier than ``planned_day_offset`` when the
+            fixed previous week directly precedes the schedule.
+        leave_paid_hours_by_day (Dict[Tuple[int, int], int]): Paid leave hours indexed by (agent, day) indices.
         
         shift_durations (Dict[str, int]): Duration in tenths of hours for each configured vacation.
         staffing_requirements (Dict[str, int]): Required number of assigned agents per vacation and day.
@@ -43,9 +62,26 @@ class SolverContext:
         num_search_workers (int): Number of parallel search workers for the solver. Default: 0.
         optimize_period_balance (bool): Flag to enable period balancing optimization. Default: False.
         period_balance_weight (int): Weight factor for period balancing objectives. Default: 2.
+        previous_week_mode (str): "fixed" to read the previous week as constants, "variables" to solve it. Default: "fixed".
+        weekend_fairness_mode (str): Weekend fairness formulation, "quadratic", "table" or "spread". Default: "quadratic".
+        symmetry_breaking (bool): Flag to order the planning rows of interchangeable agents. Default: True.
+        stagnation_seconds (float): Stop the search when the objective has not improved for this long; 0 disables. Default: 0.
+        stagnation_min_improvement (float): Objective decrease needed to count as an improvement. Default: 0.
+        max_seconds_after_first_solution (float): Stop the search this long after the first solution; 0 disables. Default: 0.
+        greedy_hint (bool): Flag to hint searches without a prior planning with a greedy planning. Default: True.
+        preview_max_seconds (float): Time limit of the local search of a preview planning. Default: 0.25.
+        preflight (bool): Flag to check necessary feasibility conditions before building the model. Default: True.
+        diagnose_infeasibility (bool): Flag to report a conflicting set of rules when a solve is proven infeasible. Default: True.
+        diagnosis_scope (str): Granularity of the reported rules, "rule", "agent" or "week". Default: "rule".
+        elastic_gaps (bool): Flag to let the global and period balance gaps be exceeded with a penalty. Default: False.
+        elastic_max_weekly_hours (bool): Flag to let max_weekly_hours be exceeded with a penalty. Default: False.
+        global_gap_excess_weight (int): Objective penalty per tenth of an hour over global_max_gap. Default: 50.
+        period_gap_excess_weight (int): Objective penalty per tenth of an hour over period_max_gap. Default: 50.
+        weekly_hours_excess_weight (int): Objective penalty per tenth of an hour over max_weekly_hours. Default: 50.
         
         period_balancing_objective (cp_model.LinearExpr | int): Objective expression for balancing workload across periods.
         weekend_balancing_objective (cp_model.LinearExpr | int): Objective expression for balancing weekend assignments.
+        cap_excesses (List[CapExcess]): The elastic caps of the model, with their penalized excess.
     """
     model: cp_model.CpModel
     config: dict
@@ -58,10 +94,16 @@ class SolverContext:
     holidays: List[str]
     planning_start_date: datetime | None = None
 
-    weeks_split: List[List[str]] = field(default_factory=list)
-    planning: Dict[Tuple[str, str, str], cp_model.IntVar] = field(default_factory=dict)
-    leave_paid_hours_by_day: Dict[Tuple[str, str], int] = field(default_factory=dict)
-    day_dates: Dict[str, datetime] = field(default_factory=dict)
+    compiled_config: CompiledConfig | None = None
+    calendar: Calendar = field(default_factory=lambda: Calendar(days=()))
+    availability: AvailabilityTensor | None = None
+    planning: PlanningTensor = field(default_factory=lambda: PlanningTensor([], [], []))
+    derived: "DerivedVariables | None" = None
+    planned_day_offset: int = 0
+    fixed_zero_cells: Set[Tuple[int, int, int]] = field(default_factory=set)
+    previous_week_assignments: Dict[Tuple[int, int], int] = field(default_factory=dict)
+    continuity_start: int = 0
+    leave_paid_hours_by_day: Dict[Tuple[int, int], int] = field(default_factory=dict)
 
     shift_durations: Dict[str, int] = field(default_factory=dict)
     staffing_requirements: Dict[str, int] = field(default_factory=dict)
@@ -76,6 +118,23 @@ class SolverContext:
     optimize_period_balance: bool = False
     period_balance_weight: int = 2
     min_free_weekends_per_horizon: int = 0
+    previous_week_mode: str = "fixed"
+    weekend_fairness_mode: str = "quadratic"
+    symmetry_breaking: bool = True
+    stagnation_seconds: float = 0
+    stagnation_min_improvement: float = 0
+    max_seconds_after_first_solution: float = 0
+    greedy_hint: bool = True
+    preview_max_seconds: float = 0.25
+    preflight: bool = True
+    diagnose_infeasibility: bool = True
+    diagnosis_scope: str = "rule"
+    elastic_gaps: bool = False
+    elastic_max_weekly_hours: bool = False
+    global_gap_excess_weight: int = 50
+    period_gap_excess_weight: int = 50
+    weekly_hours_excess_weight: int = 50
 
     period_balancing_objective: cp_model.LinearExpr | int = 0
     weekend_balancing_objective: cp_model.LinearExpr | int = 0
+    cap_excesses: List["CapExcess"] = field(default_factory=list)
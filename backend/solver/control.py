@@ -0,0 +1,71 @@
+import threading
+
+from ortools.sat.python import cp_model
+
+
+class SolveControl:
+    """
+    Lets another thread stop the solves of a planning request.
+
+    The engine attaches each CP-SAT solver while it runs. ``cancel`` marks the request
+    as cancelled and calls ``StopSearch`` on the attached solvers (several chunks may be
+    solved at once), which then return the best solution found so far. Solves attached
+    after the cancellation do not run.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._solvers: list[cp_model.CpSolver] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self) -> None:
+        """Cancels the request and stops the running searches, if any."""
+        with self._lock:
+            self._cancelled = True
+            solvers = list(self._solvers)
+        for solver in solvers:
+            solver.StopSearch()
+
+    def attach(self, solver: cp_model.CpSolver) -> bool:
+        """
+        Registers the solver about to run.
+
+        :param solver: The solver about to run.
+        :type solver: cp_model.CpSolver
+        :return: False if the request is already cancelled and the solve must not run.
+        :rtype: bool
+        """
+        with self._lock:
+            if self._cancelled:
+                return False
+            self._solvers.append(solver)
+            return True
+
+    def detach(self, solver: cp_model.CpSolver) -> None:
+        with self._lock:
+            self._solvers = [attached for attached in self._solvers if attached is not solver]
+
+
+def solve_attached(solver, model: cp_model.CpModel, control: SolveControl | None) -> int | None:
+    """
+    Runs a solve that a cancellation of ``control`` stops.
+
+    :param solver: A ``cp_model.CpSolver`` or the pool's ``RemoteSolver``.
+    :param model: The model to solve.
+    :type model: cp_model.CpModel
+    :param control: Lets another thread stop the solve.
+    :type control: SolveControl | None
+    :return: The solver status, or None if the request was cancelled before the solve started.
+    :rtype: int | None
+    """
+    if control is not None and not control.attach(solver):
+        return None
+    try:
+        return solver.Solve(model)
+    finally:
+        if control is not None:
+            control.detach(solver)
@@ -0,0 +1,120 @@
+from typing import Dict, Sequence, Set, Tuple
+
+from ortools.sat.python import cp_model
+
+from .constraints.encoding import add_or_equality, split_literals
+from .domain import is_fixed
+from .tensor import PlanningTensor
+
+
+class DerivedVariables:
+    """
+    Memoizing registry of literals derived from the planning cells.
+
+    Constraint modules ask for a concept such as "agent works on this day" or "agent
+    works this weekend", and every caller receives the same literal, so the model
+    holds a single reification per concept. Literals are keyed by the solver
+    variables they are derived from: two requests over different vacations that
+    reduce to the same variables (e.g. because CDP cells are fixed to zero on
+    weekends) share one literal.
+
+    Values follow the ``ctx.planning`` convention: a derived value is an integer
+    constant when the planning cells already decide it, and a planning variable is
+    returned as is when the concept depends on it alone.
+
+    Attributes:
+        model (cp_model.CpModel): The model the literals are created in.
+        planning (PlanningTensor): The planning cells the literals are derived from.
+        definitions (Set[int]): Proto indices of the constraints defining the literals.
+    """
+
+    def __init__(self, model: cp_model.CpModel, planning: PlanningTensor):
+        self.model = model
+        self.planning = planning
+        self._works: Dict[Tuple[int, ...], cp_model.IntVar] = {}
+        self._works_weekend: Dict[Tuple[int, int], cp_model.IntVar] = {}
+        self.definitions: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._works) + len(self._works_weekend)
+
+    def works(self, agent_idx: int, day_idx: int, vacations: Sequence[int] | None = None):
+        """
+        Returns the literal true when the agent works one of the vacations on the day.
+
+        :param agent_idx: The index of the agent.
+        :type agent_idx: int
+        :param day_idx: The index of the day.
+        :type day_idx: int
+        :param vacations: Vacation indices to consider, all vacations when None.
+        :type vacations: Sequence[int] | None
+        :return: A Boolean literal, or the constant 0 or 1.
+        """
+        cells = self.planning.day_cells(agent_idx, day_idx)
+        if vacations is not None:
+            cells = [cells[vacation_idx] for vacation_idx in vacations]
+        literals, ones = split_literals(cells)
+        if ones:
+            return 1
+        if not literals:
+            return 0
+        if len(literals) == 1:
+            return literals[0]
+
+        key = tuple(sorted(literal.Index() for literal in literals))
+        works = self._works.get(key)
+        if works is None:
+            works = self.model.NewBoolVar(
+                f"works_{self.planning.agents[agent_idx]}_{self.planning.days[day_idx]}"
+            )
+            first = len(self.model.Proto().constraints)
+            add_or_equality(self.model, works, literals)
+            self._defined_from(first)
+            self._works[key] = works
+        return works
+
+    def works_weekend(
+        self,
+        agent_idx: int,
+        saturday: int,
+        sunday: int,
+        vacations: Sequence[int] | None = None,
+    ):
+        """
+        Returns the literal true when the agent works both days of a weekend.
+
+        :param agent_idx: The index of the agent.
+        :type agent_idx: int
+        :param saturday: The day index of the Saturday.
+        :type saturday: int
+        :param sunday: The day index of the Sunday.
+        :type sunday: int
+        :param vacations: Vacation indices to consider, all vacations when None.
+        :type vacations: Sequence[int] | None
+        :return: A Boolean literal, or the constant 0 or 1.
+        """
+        saturday_work = self.works(agent_idx, saturday, vacations)
+        sunday_work = self.works(agent_idx, sunday, vacations)
+        if is_fixed(saturday_work):
+            return sunday_work if saturday_work else 0
+        if is_fixed(sunday_work):
+            return saturday_work if sunday_work else 0
+
+        key = (saturday_work.Index(), sunday_work.Index())
+        works_weekend = self._works_weekend.get(key)
+        if works_weekend is None:
+            works_weekend = self.model.NewBoolVar(
+                f"works_weekend_{self.planning.agents[agent_idx]}"
+                f"_{self.planning.days[saturday]}_{self.planning.days[sunday]}"
+            )
+            first = len(self.model.Proto().constraints)
+            self.model.AddBoolAnd([saturday_work, sunday_work]).OnlyEnforceIf(works_weekend)
+            self.model.AddBoolOr([saturday_work.Not(), sunday_work.Not()]).OnlyEnforceIf(
+                works_weekend.Not()
+            )
+            self._defined_from(first)
+            self._works_weekend[key] = works_weekend
+        return works_weekend
+
+    def _defined_from(self, first: int) -> None:
+        self.definitions.update(range(first, len(self.model.Proto().constraints)))
@@ -0,0 +1,263 @@
+import time
+from typing import Dict, List, Tuple
+
+from ortools.sat.python import cp_model
+
+from .context import SolverContext
+from .control import SolveControl, solve_attached
+from .domain import is_fixed
+from .pool import SolverPool, new_solver
+
+SCOPE_RULE = "rule"
+SCOPE_AGENT = "agent"
+SCOPE_WEEK = "week"
+DIAGNOSIS_SCOPES = (SCOPE_RULE, SCOPE_AGENT, SCOPE_WEEK)
+
+DIAGNOSIS_MAX_SECONDS = 60
+
+# Constraint types CP-SAT accepts enforcement literals on; cardinality ones are rewritten
+ENFORCEABLE = ("bool_or", "bool_and", "linear")
+CARDINALITY = ("at_most_one", "exactly_one")
+
+RuleKey = Tuple[str, int | None]
+
+
+def _as_linear(constraint, kind: str) -> None:
+    """Rewrites an at-most-one or exactly-one constraint as the linear constraint it stands for."""
+    literals = list(getattr(constraint, kind).literals)
+    constraint.ClearField(kind)
+    # A negated literal counts as 1 - var
+    negated = sum(1 for literal in literals if literal < 0)
+    for literal in literals:
+        constraint.linear.vars.append(literal if literal >= 0 else -literal - 1)
+        constraint.linear.coeffs.append(1 if literal >= 0 else -1)
+    lower = 1 - negated if kind == "exactly_one" else -negated
+    constraint.linear.domain.extend([lower, 1 - negated])
+
+
+def _constraint_variables(constraint, kind: str) -> List[int]:
+    if kind == "linear":
+        return list(constraint.linear.vars)
+    literals = getattr(constraint, kind).literals
+    return [literal if literal >= 0 else -literal - 1 for literal in literals]
+
+
+class RuleLiterals:
+    """
+    Enforcement literals of the constraint functions of a ``ConstraintRegistry``.
+
+    Each constraint a function adds to the model is enforced by the literal of its
+    rule (the function name). With the "agent" or "week" scope, a constraint whose
+    planning cells all belong to one agent, or to one planned week, gets a literal of
+    its own for that agent or week; the other ones keep the literal of the rule.
+    Conjunctions spanning several agents or weeks, such as the forbidden cells of a
+    blocking rule, are split so each part gets the literal of its owner.
+
+    The constraints defining derived literals are left unenforced: they only name a
+    concept shared by several rules. So are the constraint types CP-SAT cannot enforce
+    (products and tables of the weekend fairness terms), which only define objective
+    terms. At-most-one and exactly-one constraints are rewritten as linear ones.
+
+    Attributes:
+        ctx (SolverContext): The context whose model holds the constraints.
+        scope (str): "rule", "agent" or "week".
+        literals (Dict[RuleKey, cp_model.IntVar]): The literal of each rule and scope index.
+    """
+
+    def __init__(self, ctx: SolverContext, scope: str = SCOPE_RULE):
+        if scope not in DIAGNOSIS_SCOPES:
+            raise ValueError(
+                "solver.diagnosis_scope must be one of: " + ", ".join(DIAGNOSIS_SCOPES)
+            )
+        self.ctx = ctx
+        self.scope = scope
+        self.literals: Dict[RuleKey, cp_model.IntVar] = {}
+
+        week_of_day = {
+            day_idx: week_idx
+            for week_idx, week in enumerate(ctx.calendar.weeks(ctx.planned_day_offset))
+            for day_idx in week
+        }
+        # Planning variable index -> agent or week index (None for previous-week days)
+        self._owners: Dict[int, int | None] = {}
+        agent_count, day_count, _ = ctx.planning.shape
+        for agent_idx in range(agent_count):
+            for day_idx in range(day_count):
+                owner = agent_idx if scope == SCOPE_AGENT else week_of_day.get(day_idx)
+                for cell in ctx.planning.day_cells(agent_idx, day_idx):
+                    if not is_fixed(cell):
+                        self._owners[cell.Index()] = owner
+
+    def apply(self, ctx: SolverContext, constraint_fn) -> None:
+        """
+        Applies a constraint function and enforces the constraints it added.
+
+        :param ctx: The solver context containing the problem data and the model.
+        :type ctx: SolverContext
+        :param constraint_fn: A registered constraint function.
+        :type constraint_fn: Callable[[SolverContext], None]
+        """
+        constraints = ctx.model.Proto().constraints
+        first = len(constraints)
+        constraint_fn(ctx)
+        rule = constraint_fn.__name__
+        for index in range(first, len(constraints)):
+            if index in ctx.derived.definitions:
+                continue
+            constraint = constraints[index]
+            kind = constraint.WhichOneof("constraint")
+            if kind in CARDINALITY:
+                _as_linear(constraint, kind)
+                kind = "linear"
+            elif kind == "bool_and" and self.scope != SCOPE_RULE:
+                self._split_conjunction(rule, constraint)
+                continue
+            elif kind not in ENFORCEABLE:
+                continue
+            literal = self._literal((rule, self._scope_of(constraint, kind)))
+            constraint.enforcement_literal.append(literal.Index())
+
+    def _split_conjunction(self, rule: str, constraint) -> None:
+        """Enforces the literals of a conjunction (e.g. forbidden cells) owner by owner."""
+        groups: Dict[int | None, List[int]] = {}
+        for literal in constraint.bool_and.literals:
+            var = literal if literal >= 0 else -literal - 1
+            groups.setdefault(self._owners.get(var), []).append(literal)
+        if not groups:
+            groups[None] = []
+        enforcement = list(constraint.enforcement_literal)
+        constraint.ClearField("bool_and")
+        constraint.ClearField("enforcement_literal")
+        for owner, literals in groups.items():
+            part = self.ctx.model.Proto().constraints.add()
+            part.enforcement_literal.extend(enforcement)
+            part.enforcement_literal.append(self._literal((rule, owner)).Index())
+            part.bool_and.literals.extend(literals)
+
+    def _scope_of(self, constraint, kind: str) -> int | None:
+        if self.scope == SCOPE_RULE:
+            return None
+        owners = {
+            self._owners[var]
+            for var in _constraint_variables(constraint, kind)
+            if var in self._owners
+        }
+        return owners.pop() if len(owners) == 1 else None
+
+    def _literal(self, key: RuleKey) -> cp_model.IntVar:
+        literal = self.literals.get(key)
+        if literal is None:
+            rule, index = key
+            name = f"enforce_{rule}" if index is None else f"enforce_{rule}_{index}"
+            literal = self.ctx.model.NewBoolVar(name)
+            self.literals[key] = literal
+        return literal
+
+    def describe(self, key: RuleKey) -> dict:
+        """Returns the "rule", "agents" and "days" (labels) a literal enforces."""
+        rule, index = key
+        ctx = self.ctx
+        agents = []
+        days = []
+        if index is not None and self.scope == SCOPE_AGENT:
+            agents = [ctx.agents[index]["name"]]
+        elif index is not None and self.scope == SCOPE_WEEK:
+            week = ctx.calendar.weeks(ctx.planned_day_offset)[index]
+            days = [ctx.calendar.labels[day_idx] for day_idx in week]
+        return {"rule": rule, "agents": agents, "days": days}
+
+
+def _solve_with(
+    ctx: SolverContext,
+    assumptions: List,
+    max_time_seconds: float,
+    solver_pool: SolverPool | None,
+    control: SolveControl | None,
+):
+    ctx.model.ClearAssumptions()
+    ctx.model.AddAssumptions(assumptions)
+    solver = new_solver(solver_pool)
+    # Infeasibility cores are only reliable from a single search worker
+    solver.parameters.num_search_workers = 1
+    solver.parameters.max_time_in_seconds = max(max_time_seconds, 0.01)
+    return solve_attached(solver, ctx.model, control), solver
+
+
+def find_conflict(
+    ctx: SolverContext,
+    rules: RuleLiterals,
+    max_time_seconds: float,
+    solver_pool: SolverPool | None = None,
+    control: SolveControl | None = None,
+) -> dict:
+    """
+    Finds a set of rules that cannot hold together, with the literals of ``rules``.
+
+    Every rule literal is assumed true. When the model is infeasible, CP-SAT returns
+    the assumptions it used to prove it (``SufficientAssumptionsForInfeasibility``).
+    The set is then minimized by deletion: each rule is dropped in turn and kept only
+    if the others become satisfiable without it. The reported set is "minimal" when
+    every rule was tried within ``max_time_seconds``; a rule whose check timed out, or
+    was cancelled through ``control``, is kept.
+
+    :param ctx: The solver context, built without the domain pre-pass (see ``RuleLiterals``).
+    :type ctx: SolverContext
+    :param rules: The enforcement literals of the registered constraint functions.
+    :type rules: RuleLiterals
+    :param max_time_seconds: Time limit of the whole diagnosis.
+    :type max_time_seconds: float
+    :param solver_pool: Worker processes that run the solves instead of the calling process.
+    :type solver_pool: SolverPool | None
+    :param control: Lets another thread stop the diagnosis.
+    :type control: SolveControl | None
+    :return: The "status" of the solve with every rule, the "conflict" (see ``RuleLiterals.describe``), whether it is "minimal" and the "elapsed" time.
+    :rtype: dict
+    """
+    started = time.perf_counter()
+    deadline = started + max_time_seconds
+    keys = {literal.Index(): key for key, literal in rules.literals.items()}
+    status, solver = _solve_with(
+        ctx, list(rules.literals.values()), max_time_seconds, solver_pool, control
+    )
+
+    conflict = []
+    minimal = False
+    if status == cp_model.INFEASIBLE:
+        core = [index for index in solver.SufficientAssumptionsForInfeasibility() if index in keys]
+        minimal = True
+        position = 0
+        while position < len(core):
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                minimal = False
+                break
+            trial = core[:position] + core[position + 1:]
+            trial_status, trial_solver = _solve_with(
+                ctx,
+                [rules.literals[keys[index]] for index in trial],
+                remaining,
+                solver_pool,
+                control,
+            )
+            if trial_status == cp_model.INFEASIBLE:
+                # The rule is not needed; the new proof may drop more of them
+                used = set(trial_solver.SufficientAssumptionsForInfeasibility())
+                core = [index for index in trial if index in used] or trial
+                position = min(position, len(core))
+                continue
+            if trial_status is None:
+                # Cancelled: the remaining rules are kept untried
+                minimal = False
+                break
+            if trial_status != cp_model.FEASIBLE and trial_status != cp_model.OPTIMAL:
+                minimal = False
+            position += 1
+        conflict = [rules.describe(keys[index]) for index in core]
+    ctx.model.ClearAssumptions()
+
+    return {
+        "status": solver.StatusName(status) if status is not None else "UNKNOWN",
+        "conflict": conflict,
+        "minimal": minimal,
+        "elapsed": time.perf_counter() - started,
+    }
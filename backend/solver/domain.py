@@ -0,0 +1,383 @@
+from typing import Iterator, List, Set, Tuple
+
+import numpy as np
+
+from .availability import EXCLUSION, LEAVE, TRAINING, UNAVAILABLE
+from .calendar import SATURDAY, SUNDAY
+from .context import SolverContext
+
+DAY_SHIFT = "Jour"
+NIGHT_SHIFT = "Nuit"
+CDP_SHIFT = "CDP"
+
+# Weekly caps of limit_day_shifts_per_week, limit_weekly_nights_and_hours and limit_cdp_per_week
+WEEKLY_SHIFT_LIMITS = {DAY_SHIFT: 3, NIGHT_SHIFT: 3, CDP_SHIFT: 2}
+
+Cell = Tuple[int, int, int]
+
+
+def is_fixed(cell) -> bool:
+    """
+    Checks if a planning cell is a constant instead of a solver variable.
+
+    Cells ruled out by the domain pre-pass are stored as plain integers in
+    ``ctx.planning`` so constraint functions can still index and sum them.
+
+    :param cell: A value stored in ``ctx.planning``.
+    :return: True if the cell is a constant, False if it is a solver variable.
+    :rtype: bool
+    """
+    return isinstance(cell, int)
+
+
+def required_agents(ctx: SolverContext, day_idx: int, vacation: str) -> int:
+    """
+    Returns how many agents a vacation needs on a day.
+
+    CDP is not staffed on weekends and holidays; other days use the staffing
+    requirement of the vacation, 1 by default.
+
+    :param ctx: The solver context containing the problem data.
+    :type ctx: SolverContext
+    :param day_idx: Index of the day in the calendar.
+    :type day_idx: int
+    :param vacation: The vacation name.
+    :type vacation: str
+    :return: The number of agents to assign.
+    :rtype: int
+    """
+    day = ctx.calendar[day_idx]
+    if vacation == CDP_SHIFT and (day.is_weekend or day.is_holiday):
+        return 0
+    return ctx.staffing_requirements.get(vacation, 1)
+
+
+def _all_vacations(ctx: SolverContext, agent_idx: int, day_idx: int) -> Iterator[Cell]:
+    for vacation_idx in range(len(ctx.vacations)):
+        yield (agent_idx, day_idx, vacation_idx)
+
+
+def _vacation_idx(ctx: SolverContext, vacation: str) -> int:
+    return ctx.vacations.index(vacation)
+
+
+def _planned_days(ctx: SolverContext) -> range:
+    return range(ctx.planned_day_offset, len(ctx.calendar))
+
+
+def _status_days(ctx: SolverContext, agent_idx: int, status: int) -> List[int]:
+    """
+    Returns the planned day indices where an agent has an availability status.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :param agent_idx: The index of the agent.
+    :type agent_idx: int
+    :param status: The availability status (e.g. ``UNAVAILABLE``).
+    :type status: int
+    :return: The matching planned day indices.
+    :rtype: List[int]
+    """
+    return ctx.availability.days_with(agent_idx, status, start=ctx.planned_day_offset)
+
+
+def unavailable_cells(ctx: SolverContext) -> Iterator[Cell]:
+    """
+    Yields the cells blocked by agent unavailability.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :return: An iterator over (agent, day, vacation) index cells.
+    :rtype: Iterator[Cell]
+    """
+    for agent_idx in range(len(ctx.agents)):
+        for day_idx in _status_days(ctx, agent_idx, UNAVAILABLE):
+            yield from _all_vacations(ctx, agent_idx, day_idx)
+
+
+def training_cells(ctx: SolverContext) -> Iterator[Cell]:
+    """
+    Yields the cells blocked by agent training days.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :return: An iterator over (agent, day, vacation) index cells.
+    :rtype: Iterator[Cell]
+    """
+    for agent_idx in range(len(ctx.agents)):
+        for day_idx in _status_days(ctx, agent_idx, TRAINING):
+            yield from _all_vacations(ctx, agent_idx, day_idx)
+
+
+def leave_days(ctx: SolverContext) -> Iterator[Tuple[int, int]]:
+    """
+    Yields the planned days covered by each agent's leave periods.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :return: An iterator over (agent, day) index pairs.
+    :rtype: Iterator[Tuple[int, int]]
+    """
+    for agent_idx in range(len(ctx.agents)):
+        for day_idx in _status_days(ctx, agent_idx, LEAVE):
+            yield agent_idx, day_idx
+
+
+def leave_cells(ctx: SolverContext) -> Iterator[Cell]:
+    """
+    Yields the cells blocked by leave periods.
+
+    This includes the Saturday and Sunday before a leave period starting on a Monday,
+    when those days are part of the current or previous week's schedule.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :return: An iterator over (agent, day, vacation) index cells.
+    :rtype: Iterator[Cell]
+    """
+    for agent_idx, day_idx in leave_days(ctx):
+        yield from _all_vacations(ctx, agent_idx, day_idx)
+
+    calendar = ctx.calendar
+    for agent_idx in range(len(ctx.agents)):
+        for day_idx in ctx.availability.days_with(agent_idx, LEAVE, start=2):
+            # A leave starting on a Monday: the agent is not on leave the day before.
+            if (
+                calendar[day_idx].weekday == 0
+                and not ctx.availability.has(agent_idx, day_idx - 1, LEAVE)
+                and calendar.follows(day_idx)
+                and calendar.follows(day_idx - 1)
+            ):
+                yield from _all_vacations(ctx, agent_idx, day_idx - 2)
+                yield from _all_vacations(ctx, agent_idx, day_idx - 1)
+
+
+def exclusion_cells(ctx: SolverContext) -> Iterator[Cell]:
+    """
+    Yields the cells blocked by agent exclusion days.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :return: An iterator over (agent, day, vacation) index cells.
+    :rtype: Iterator[Cell]
+    """
+    for agent_idx in range(len(ctx.agents)):
+        for day_idx in _status_days(ctx, agent_idx, EXCLUSION):
+            yield from _all_vacations(ctx, agent_idx, day_idx)
+
+
+def restriction_cells(ctx: SolverContext) -> Iterator[Cell]:
+    """
+    Yields the cells blocked by agent-specific vacation restrictions.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :return: An iterator over (agent, day, vacation) index cells.
+    :rtype: Iterator[Cell]
+    """
+    for agent in ctx.compiled_config.agents:
+        agent_idx = agent.index
+        restricted = [
+            vacation_idx
+            for vacation_idx in range(len(ctx.vacations))
+            if agent.restriction_mask >> vacation_idx & 1
+        ]
+        for day_idx in _planned_days(ctx):
+            for vacation_idx in restricted:
+                yield (agent_idx, day_idx, vacation_idx)
+
+
+def _night_before_cells(ctx: SolverContext, status: int) -> Iterator[Cell]:
+    if NIGHT_SHIFT not in ctx.vacations:
+        return
+
+    night_idx = _vacation_idx(ctx, NIGHT_SHIFT)
+    for agent_idx in range(len(ctx.agents)):
+        for day_idx in _status_days(ctx, agent_idx, status):
+            if day_idx > ctx.planned_day_offset:
+                yield (agent_idx, day_idx - 1, night_idx)
+
+
+def night_before_unavailable_cells(ctx: SolverContext) -> Iterator[Cell]:
+    """
+    Yields the night shift cells on the day before an unavailable day.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :return: An iterator over (agent, day, vacation) index cells.
+    :rtype: Iterator[Cell]
+    """
+    return _night_before_cells(ctx, UNAVAILABLE)
+
+
+def night_before_training_cells(ctx: SolverContext) -> Iterator[Cell]:
+    """
+    Yields the night shift cells on the day before a training day.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :return: An iterator over (agent, day, vacation) index cells.
+    :rtype: Iterator[Cell]
+    """
+    return _night_before_cells(ctx, TRAINING)
+
+
+def pre_post_training_cells(ctx: SolverContext) -> Iterator[Cell]:
+    """
+    Yields the cells blocked around training days.
+
+    Only CDP is allowed the day before a training day, and only CDP or night
+    shifts are allowed the day after.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :return: An iterator over (agent, day, vacation) index cells.
+    :rtype: Iterator[Cell]
+    """
+    if CDP_SHIFT not in ctx.vacations:
+        return
+
+    allowed_after_training = [CDP_SHIFT]
+    if NIGHT_SHIFT in ctx.vacations:
+        allowed_after_training.append(NIGHT_SHIFT)
+    blocked_before = [
+        vacation_idx for vacation_idx, vacation in enumerate(ctx.vacations) if vacation != CDP_SHIFT
+    ]
+    blocked_after = [
+        vacation_idx
+        for vacation_idx, vacation in enumerate(ctx.vacations)
+        if vacation not in allowed_after_training
+    ]
+
+    last_day_idx = len(ctx.calendar) - 1
+    for agent_idx in range(len(ctx.agents)):
+        for day_idx in _status_days(ctx, agent_idx, TRAINING):
+            if day_idx > ctx.planned_day_offset:
+                for vacation_idx in blocked_before:
+                    yield (agent_idx, day_idx - 1, vacation_idx)
+
+            if day_idx < last_day_idx:
+                for vacation_idx in blocked_after:
+                    yield (agent_idx, day_idx + 1, vacation_idx)
+
+
+def unstaffed_cells(ctx: SolverContext) -> Iterator[Cell]:
+    """
+    Yields the cells of vacations that can never be staffed on a given day.
+
+    A vacation cannot be staffed when its staffing requirement is zero, or when it is
+    a CDP shift on a weekend or a holiday.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :return: An iterator over (agent, day, vacation) index cells.
+    :rtype: Iterator[Cell]
+    """
+    for day_idx in _planned_days(ctx):
+        day = ctx.calendar[day_idx]
+        for vacation_idx, vacation in enumerate(ctx.vacations):
+            required_agents = ctx.staffing_requirements.get(vacation, 1)
+            closed_cdp = vacation == CDP_SHIFT and (day.is_weekend or day.is_holiday)
+            if required_agents == 0 or closed_cdp:
+                for agent_idx in range(len(ctx.agents)):
+                    yield (agent_idx, day_idx, vacation_idx)
+
+
+def _worked_previous_day(ctx: SolverContext, agent_idx: int, day_idx: int, vacation=None) -> bool:
+    assigned = ctx.previous_week_assignments.get((agent_idx, day_idx))
+    if vacation is None:
+        return assigned is not None
+    return assigned == _vacation_idx(ctx, vacation)
+
+
+def carry_over_cells(ctx: SolverContext) -> Iterator[Cell]:
+    """
+    Yields the cells blocked by the fixed previous-week assignments.
+
+    When the previous week is a fixed assignment table, continuity rules that depend
+    only on known previous-week shifts are resolved here:
+    - no shift other than a night after a night on the last previous day,
+    - no Monday night after a Saturday and Sunday night,
+    - no Sunday shift when the previous Saturday was not worked (full weekends).
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :return: An iterator over (agent, day, vacation) index cells.
+    :rtype: Iterator[Cell]
+    """
+    first_idx = ctx.planned_day_offset
+    if ctx.continuity_start >= first_idx or first_idx >= len(ctx.calendar):
+        return
+
+    last_idx = first_idx - 1
+    first_day = ctx.calendar[first_idx]
+    last_day = ctx.calendar[last_idx]
+    for agent_idx in range(len(ctx.agents)):
+        if NIGHT_SHIFT in ctx.vacations:
+            night_idx = _vacation_idx(ctx, NIGHT_SHIFT)
+            if _worked_previous_day(ctx, agent_idx, last_idx, NIGHT_SHIFT):
+                for vacation_idx in range(len(ctx.vacations)):
+                    if vacation_idx != night_idx:
+                        yield (agent_idx, first_idx, vacation_idx)
+
+            if (
+                last_idx - 1 >= ctx.continuity_start
+                and ctx.calendar[last_idx - 1].weekday == SATURDAY
+                and last_day.weekday == SUNDAY
+                and _worked_previous_day(ctx, agent_idx, last_idx - 1, NIGHT_SHIFT)
+                and _worked_previous_day(ctx, agent_idx, last_idx, NIGHT_SHIFT)
+            ):
+                yield (agent_idx, first_idx, night_idx)
+
+        if (
+            last_day.weekday == SATURDAY
+            and first_day.weekday == SUNDAY
+            and not _worked_previous_day(ctx, agent_idx, last_idx)
+        ):
+            yield from _all_vacations(ctx, agent_idx, first_idx)
+
+
+def compute_fixed_zero_cells(ctx: SolverContext) -> Set[Cell]:
+    """
+    Computes the planning cells that no feasible solution can assign.
+
+    The domain pre-pass runs before any variable is created. Every cell it returns is
+    stored as the constant 0 in ``ctx.planning``, so it costs no variable, no
+    constraint and no presolve time.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :return: The set of (agent, day, vacation) index cells fixed to zero.
+    :rtype: Set[Cell]
+    """
+    fixed_zero_cells = set()
+    for cells in (
+        unavailable_cells(ctx),
+        training_cells(ctx),
+        leave_cells(ctx),
+        exclusion_cells(ctx),
+        restriction_cells(ctx),
+        night_before_unavailable_cells(ctx),
+        night_before_training_cells(ctx),
+        pre_post_training_cells(ctx),
+        unstaffed_cells(ctx),
+        carry_over_cells(ctx),
+    ):
+        fixed_zero_cells.update(cells)
+    return fixed_zero_cells
+
+
+def allowed_cell_mask(ctx: SolverContext) -> np.ndarray:
+    """
+    Returns the cells left open by the domain pre-pass as a Boolean array.
+
+    :param ctx: The solver context, with ``ctx.fixed_zero_cells`` computed.
+    :type ctx: SolverContext
+    :return: An (agents, days, vacations) array, False on the cells fixed to zero.
+    :rtype: np.ndarray
+    """
+    allowed = np.ones((len(ctx.agents), len(ctx.calendar), len(ctx.vacations)), dtype=bool)
+    if ctx.fixed_zero_cells:
+        agent_idx, day_idx, vacation_idx = np.array(list(ctx.fixed_zero_cells)).T
+        allowed[agent_idx, day_idx, vacation_idx] = False
+    return allowed
@@ -1,12 +1,37 @@
-from datetime import datetime, timedelta
+import time
 
 from ortools.sat.python import cp_model
 
+from .availability import AvailabilityTensor
+from .calendar import Calendar
+from .compiled_config import CompiledConfig, compile_config
 from .constraints import hard, mixed, soft
+from .constraints.elastic import cap_excess_report
+from .constraints.encoding import constraint_counts
 from .context import SolverContext
+from .control import SolveControl, solve_attached
+from .derived import DerivedVariables
+from .diagnosis import DIAGNOSIS_MAX_SECONDS, DIAGNOSIS_SCOPES, RuleLiterals, find_conflict
+from .domain import compute_fixed_zero_cells, is_fixed
+from .greedy import construct_planning
 from .objective import apply_objective
+from .pool import SolverPool, new_solver
+from .preflight import check_feasibility
 from .registry import ConstraintRegistry
-from .utils import split_into_weeks
+from .stopping import STOP_PREFLIGHT, SearchWatchdog, resolve_stop_reason
+from .symmetry import break_agent_symmetry
+from .tensor import PlanningTensor
+
+PREVIOUS_WEEK_FIXED = "fixed"
+PREVIOUS_WEEK_VARIABLES = "variables"
+PREVIOUS_WEEK_MODES = (PREVIOUS_WEEK_FIXED, PREVIOUS_WEEK_VARIABLES)
+
+HINT_SOURCE_GREEDY = "greedy"
+HINT_COMPLETION_MAX_SECONDS = 10
+
+PREFLIGHT_STATUS = "INFEASIBLE"
+PREFLIGHT_FAILED_INFO = "No solution found: preflight checks failed."
+NO_SOLUTION_INFO = "No solution found."
 
 
 def _build_planning_variables(ctx: SolverContext) -> None:
@@ -16,16 +41,37 @@ def _build_planning_variables(ctx: SolverContext) -> None:
     These variables will be used to represent the planning and will be
     used to compute the objective of the model.
 
+    Cells ruled out by the domain pre-pass (``ctx.fixed_zero_cells``) are stored as
+    the constant 0 instead of a BoolVar, so constraint functions can still index them.
+
+    In the fixed previous-week mode, previous-week cells are the known 0/1 constants
+    of ``ctx.previous_week_assignments``. The derived-variable registry is created
+    over the finished planning tensor.
+
     :param ctx: The solver context containing the problem data and the model.
     :type ctx: SolverContext
     """
-    for agent in ctx.agents:
-        agent_name = agent["name"]
-        for day in set(ctx.week_schedule + ctx.previous_week_schedule):
-            for vacation in ctx.vacations:
-                ctx.planning[(agent_name, day, vacation)] = ctx.model.NewBoolVar(
-                    f"planning_{agent_name}_{day}_{vacation}"
-                )
+    ctx.planning = PlanningTensor(
+        [agent["name"] for agent in ctx.agents],
+        ctx.calendar.labels,
+        ctx.vacations,
+    )
+
+    fixed_previous_week = ctx.previous_week_mode == PREVIOUS_WEEK_FIXED
+    for agent_idx, agent_name in enumerate(ctx.planning.agents):
+        for day_idx, day in enumerate(ctx.planning.days):
+            previous_day = day_idx < ctx.planned_day_offset
+            for vacation_idx, vacation in enumerate(ctx.vacations):
+                if fixed_previous_week and previous_day:
+                    assigned = ctx.previous_week_assignments.get((agent_idx, day_idx))
+                    value = int(assigned == vacation_idx)
+                elif (agent_idx, day_idx, vacation_idx) in ctx.fixed_zero_cells:
+                    value = 0
+                else:
+                    value = ctx.model.NewBoolVar(f"planning_{agent_name}_{day}_{vacation}")
+                ctx.planning.set_at(agent_idx, day_idx, vacation_idx, value)
+
+    ctx.derived = DerivedVariables(ctx.model, ctx.planning)
 
 
 def _load_solver_settings(ctx: SolverContext) -> None:
@@ -42,6 +88,20 @@ def _load_solver_settings(ctx: SolverContext) -> None:
     - optimize_period_balance: whether to optimize the period balance.
     - period_balance_weight: the weight of the period balance objective.
     - min_free_weekends_per_horizon: minimum number of fully free weekends required per agent.
+    - previous_week_mode: "fixed" to read the previous week as constants, "variables" to solve it.
+    - weekend_fairness_mode: "quadratic", "table" or "spread" weekend fairness formulation.
+    - symmetry_breaking: whether to order the planning rows of interchangeable agents.
+    - stagnation_seconds: stop the search when the objective has not improved for this long.
+    - stagnation_min_improvement: objective decrease needed to count as an improvement.
+    - max_seconds_after_first_solution: stop the search this long after the first solution.
+    - greedy_hint: whether to hint searches without a prior planning with a greedy one.
+    - preview_max_seconds: time limit of the local search of a preview planning.
+    - preflight: whether to check necessary feasibility conditions before building the model.
+    - diagnose_infeasibility: whether to report conflicting rules when a solve is proven infeasible.
+    - diagnosis_scope: "rule", "agent" or "week" granularity of the reported rules.
+    - elastic_gaps: whether global_max_gap and period_max_gap may be exceeded with a penalty.
+    - elastic_max_weekly_hours: whether max_weekly_hours may be exceeded with a penalty.
+    - global_gap_excess_weight, period_gap_excess_weight, weekly_hours_excess_weight: objective penalties per tenth of an hour over each elastic cap.
 
     :param ctx: The solver context containing the problem data and the model.
     :type ctx: SolverContext
@@ -56,6 +116,41 @@ def _load_solver_settings(ctx: SolverContext) -> None:
     ctx.optimize_period_balance = bool(solver_config.get("optimize_period_balance", False))
     ctx.period_balance_weight = int(solver_config.get("period_balance_weight", 2))
     ctx.min_free_weekends_per_horizon = int(solver_config.get("min_free_weekends_per_horizon", 0))
+    ctx.previous_week_mode = str(
+        solver_config.get("previous_week_mode", PREVIOUS_WEEK_FIXED)
+    )
+    if ctx.previous_week_mode not in PREVIOUS_WEEK_MODES:
+        raise ValueError(
+            "solver.previous_week_mode must be one of: " + ", ".join(PREVIOUS_WEEK_MODES)
+        )
+    ctx.weekend_fairness_mode = str(
+        solver_config.get("weekend_fairness_mode", soft.WEEKEND_FAIRNESS_QUADRATIC)
+    )
+    if ctx.weekend_fairness_mode not in soft.WEEKEND_FAIRNESS_MODES:
+        raise ValueError(
+            "solver.weekend_fairness_mode must be one of: "
+            + ", ".join(soft.WEEKEND_FAIRNESS_MODES)
+        )
+    ctx.symmetry_breaking = bool(solver_config.get("symmetry_breaking", True))
+    ctx.stagnation_seconds = float(solver_config.get("stagnation_seconds", 0))
+    ctx.stagnation_min_improvement = float(solver_config.get("stagnation_min_improvement", 0))
+    ctx.max_seconds_after_first_solution = float(
+        solver_config.get("max_seconds_after_first_solution", 0)
+    )
+    ctx.greedy_hint = bool(solver_config.get("greedy_hint", True))
+    ctx.preview_max_seconds = float(solver_config.get("preview_max_seconds", 0.25))
+    ctx.preflight = bool(solver_config.get("preflight", True))
+    ctx.diagnose_infeasibility = bool(solver_config.get("diagnose_infeasibility", True))
+    ctx.diagnosis_scope = str(solver_config.get("diagnosis_scope", "rule"))
+    if ctx.diagnosis_scope not in DIAGNOSIS_SCOPES:
+        raise ValueError(
+            "solver.diagnosis_scope must be one of: " + ", ".join(DIAGNOSIS_SCOPES)
+        )
+    ctx.elastic_gaps = bool(solver_config.get("elastic_gaps", False))
+    ctx.elastic_max_weekly_hours = bool(solver_config.get("elastic_max_weekly_hours", False))
+    ctx.global_gap_excess_weight = int(solver_config.get("global_gap_excess_weight", 50))
+    ctx.period_gap_excess_weight = int(solver_config.get("period_gap_excess_weight", 50))
+    ctx.weekly_hours_excess_weight = int(solver_config.get("weekly_hours_excess_weight", 50))
 
 
 def _load_shift_durations(ctx: SolverContext) -> None:
@@ -112,28 +207,118 @@ def _build_registry() -> ConstraintRegistry:
     return registry
 
 
-def _parse_iso_date(date_value):
-    if date_value is None:
-        return None
-    if isinstance(date_value, datetime):
-        return date_value
-    if isinstance(date_value, str):
-        return datetime.strptime(date_value, "%Y-%m-%d")
-    raise ValueError("planning_start_date must be YYYY-MM-DD or datetime")
+def _build_calendar(ctx: SolverContext, calendar: Calendar | None = None) -> None:
+    """
+    Builds the typed calendar of the previous-week days followed by the planned days.
+
+    Previous-week days that are also planned are kept once, as planned days. When
+    the caller already holds a request-wide calendar, its slice is used as is;
+    otherwise the calendar is built from the day labels, anchored on
+    ``planning_start_date`` when one is given.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :param calendar: The calendar of the previous-week and planned days, if already built.
+    :type calendar: Calendar | None
+    """
+    planned_days = set(ctx.week_schedule)
+    previous_days = [day for day in dict.fromkeys(ctx.previous_week_schedule) if day not in planned_days]
+    labels = previous_days + list(ctx.week_schedule)
+    ctx.planned_day_offset = len(previous_days)
+    ctx.continuity_start = ctx.planned_day_offset
+
+    if calendar is None:
+        calendar = Calendar.from_labels(
+            labels,
+            start_date=ctx.planning_start_date,
+            start_index=ctx.planned_day_offset,
+            holidays=ctx.holidays,
+        )
+    elif calendar.labels != labels:
+        raise ValueError("calendar does not match the previous-week and planned days")
+    ctx.calendar = calendar
+
+
+def _load_compiled_config(
+    ctx: SolverContext, compiled_config: CompiledConfig | None = None
+) -> None:
+    """
+    Attaches the compiled configuration to the solver context.
 
+    Routes pass the configuration compiled when it was installed. Direct callers get
+    one compiled from the given agents, vacations and runtime config.
 
-def _build_day_dates(ctx: SolverContext) -> None:
-    start_date = _parse_iso_date(ctx.planning_start_date)
-    if start_date is None:
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :param compiled_config: The compiled runtime configuration, if already built.
+    :type compiled_config: CompiledConfig | None
+    """
+    if compiled_config is None:
+        compiled_config = compile_config(
+            {**ctx.config, "agents": ctx.agents, "vacations": ctx.vacations}
+        )
+    elif compiled_config.vacations != tuple(ctx.vacations) or [
+        record.name for record in compiled_config.agents
+    ] != [agent["name"] for agent in ctx.agents]:
+        raise ValueError("compiled_config does not match the agents and vacations")
+    ctx.compiled_config = compiled_config
+
+
+def _build_availability(
+    ctx: SolverContext, availability: AvailabilityTensor | None = None
+) -> None:
+    """
+    Builds the availability tensor of the agents over the calendar.
+
+    Agent dates are parsed once here; the domain pre-pass and the hard constraints
+    read the tensor instead of the agent configuration.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :param availability: The request availability tensor sliced to the calendar, if already built.
+    :type availability: AvailabilityTensor | None
+    """
+    if availability is None:
+        availability = AvailabilityTensor.build(ctx.compiled_config.agents, ctx.calendar)
+    elif availability.calendar.labels != ctx.calendar.labels or availability.agents != [
+        agent["name"] for agent in ctx.agents
+    ]:
+        raise ValueError("availability does not match the calendar and agents")
+    ctx.availability = availability
+
+
+def _build_previous_week_assignments(ctx: SolverContext) -> None:
+    """
+    Builds the fixed previous-week assignment table from the initial shifts.
+
+    Only valid agents, vacations and previous-week days are kept. When the previous
+    week directly precedes the planned days and holds at least one known shift,
+    ``ctx.continuity_start`` is moved back to its first day so continuity rules can read
+    them as known constants.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    """
+    if ctx.previous_week_mode != PREVIOUS_WEEK_FIXED:
         return
 
-    for idx, day in enumerate(ctx.week_schedule):
-        ctx.day_dates[day] = start_date + timedelta(days=idx)
+    agent_index = ctx.compiled_config.agent_index
+    vacation_index = ctx.compiled_config.vacation_index
+    previous_days = {
+        day.label: day.index for day in ctx.calendar.days[: ctx.planned_day_offset]
+    }
+    for agent_name, shifts in ctx.initial_shifts.items():
+        if agent_name not in agent_index:
+            continue
+        for day, vacation in shifts:
+            if vacation in vacation_index and day in previous_days:
+                ctx.previous_week_assignments[(agent_index[agent_name], previous_days[day])] = (
+                    vacation_index[vacation]
+                )
 
-    previous_start = start_date - timedelta(days=7)
-    for idx, day in enumerate(ctx.previous_week_schedule):
-        # Keep deterministic mapping for continuity constraints when previous week is provided.
-        ctx.day_dates.setdefault(day, previous_start + timedelta(days=idx))
+    # Without any known shift the previous week is unknown rather than free
+    if ctx.previous_week_assignments and ctx.calendar.follows(ctx.planned_day_offset):
+        ctx.continuity_start = 0
 
 
 def _extract_solution(ctx: SolverContext, solver: cp_model.CpSolver):
@@ -152,16 +337,269 @@ def _extract_solution(ctx: SolverContext, solver: cp_model.CpSolver):
     :rtype: Dict[str, List[Tuple[str, str]]]
     """
     result = {}
-    for agent in ctx.agents:
-        agent_name = agent["name"]
+    planning = ctx.planning
+    for agent_idx, agent_name in enumerate(planning.agents):
         result[agent_name] = []
-        for day in ctx.week_schedule:
-            for vacation in ctx.vacations:
-                if solver.Value(ctx.planning[(agent_name, day, vacation)]):
-                    result[agent_name].append((day, vacation))
+        for day_idx in range(ctx.planned_day_offset, len(planning.days)):
+            for vacation_idx, planning_var in enumerate(planning.day_cells(agent_idx, day_idx)):
+                if is_fixed(planning_var):
+                    continue
+                if solver.Value(planning_var):
+                    result[agent_name].append(
+                        (ctx.calendar[day_idx].label, planning.vacations[vacation_idx])
+                    )
     return result
 
 
+def _apply_hint(ctx: SolverContext, hint: dict) -> list:
+    """
+    Hints every planned cell with its value in a prior planning.
+
+    The hint has the format returned by ``generate_planning``. Cells of agents or
+    days missing from it are hinted as not worked; shifts of unknown agents, days or
+    vacations are ignored.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :param hint: The planning to start the search from.
+    :type hint: Dict[str, List[Tuple[str, str]]]
+    :return: The planning variables of the hinted shifts, to count how many the solution kept.
+    :rtype: List[cp_model.IntVar]
+    """
+    planning = ctx.planning
+    hinted_shifts = []
+    for agent_idx, agent_name in enumerate(planning.agents):
+        hinted = {(day, vacation) for day, vacation in hint.get(agent_name, [])}
+        for day_idx in range(ctx.planned_day_offset, len(planning.days)):
+            label = ctx.calendar[day_idx].label
+            for vacation_idx, planning_var in enumerate(planning.day_cells(agent_idx, day_idx)):
+                if is_fixed(planning_var):
+                    continue
+                worked = (label, planning.vacations[vacation_idx]) in hinted
+                ctx.model.AddHint(planning_var, worked)
+                if worked:
+                    hinted_shifts.append(planning_var)
+    return hinted_shifts
+
+
+def _complete_hint(
+    ctx: SolverContext,
+    max_time_seconds: float,
+    solver_pool: SolverPool | None = None,
+    control: SolveControl | None = None,
+) -> bool:
+    """
+    Extends a hint of the planning cells to every variable of the model.
+
+    A hint that leaves the auxiliary variables (derived literals, balance bounds,
+    symmetry-breaking prefixes) unset makes CP-SAT spend its first search trying to
+    complete it. When the hinted planning satisfies the model, a short solve with the
+    hinted cells fixed propagates the value of every other variable, and the whole
+    solution becomes the hint. Otherwise the hint is left as it is.
+
+    The completion runs like the search itself: in a pool worker when ``solver_pool``
+    is given, and stopped by a cancellation of ``control``.
+
+    :param ctx: The solver context, with its planning cells hinted.
+    :type ctx: SolverContext
+    :param max_time_seconds: Time limit of the completion solve.
+    :type max_time_seconds: float
+    :param solver_pool: Worker processes that run the completion instead of the calling process.
+    :type solver_pool: SolverPool | None
+    :param control: Lets another thread stop the completion.
+    :type control: SolveControl | None
+    :return: True if the hinted planning satisfies the model and the hint was completed.
+    :rtype: bool
+    """
+    solver = new_solver(solver_pool)
+    solver.parameters.fix_variables_to_their_hinted_value = True
+    solver.parameters.stop_after_first_solution = True
+    solver.parameters.num_search_workers = 1
+    solver.parameters.max_time_in_seconds = max_time_seconds
+    status = solve_attached(solver, ctx.model, control)
+    if status not in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
+        return False
+
+    ctx.model.ClearHints()
+    solution_hint = ctx.model.Proto().solution_hint
+    solution = solver.ResponseProto().solution
+    solution_hint.vars.extend(range(len(solution)))
+    solution_hint.values.extend(solution)
+    return True
+
+
+class PlanningSolutionCallback(cp_model.CpSolverSolutionCallback):
+    """
+    Reports each improving solution found during the search.
+
+    ``on_solution`` receives a dictionary with the objective value, the best objective
+    bound, the elapsed wall time in seconds and the extracted planning, in the format
+    returned by ``generate_planning``. When a ``SolveControl`` is given, the search is
+    also stopped at the next solution once the request is cancelled, and each solution
+    is recorded by the ``SearchWatchdog``, if any.
+    """
+
+    def __init__(
+        self,
+        ctx: SolverContext,
+        on_solution=None,
+        control: SolveControl | None = None,
+        watchdog: SearchWatchdog | None = None,
+    ):
+        super().__init__()
+        self._ctx = ctx
+        self._on_solution = on_solution
+        self._control = control
+        self._watchdog = watchdog
+
+    def on_solution_callback(self):
+        self.report(self)
+
+    def report(self, solution) -> None:
+        """
+        Reports a solution of the search.
+
+        :param solution: The solution, read through ``ObjectiveValue``, ``BestObjectiveBound``, ``WallTime``, ``Value`` and ``StopSearch``.
+        :type solution: cp_model.CpSolverSolutionCallback | RemoteSolution
+        """
+        if self._control is not None and self._control.cancelled:
+            solution.StopSearch()
+        if self._watchdog is not None:
+            self._watchdog.record_solution(solution.ObjectiveValue())
+        if self._on_solution is None:
+            return
+        self._on_solution(
+            {
+                "objective": solution.ObjectiveValue(),
+                "best_bound": solution.BestObjectiveBound(),
+                "elapsed": solution.WallTime(),
+                "planning": _extract_solution(self._ctx, solution),
+            }
+        )
+
+
+def _build_context(
+    agents,
+    vacations,
+    week_schedule,
+    dayOff,
+    previous_week_schedule,
+    initial_shifts,
+    runtime_config,
+    planning_start_date=None,
+    calendar=None,
+    availability=None,
+    compiled_config=None,
+) -> SolverContext:
+    """
+    Builds the solver context, its planning variables, constraints and objective.
+
+    :return: The solver context holding the fully built model.
+    :rtype: SolverContext
+    """
+    ctx = prepare_context(
+        agents,
+        vacations,
+        week_schedule,
+        dayOff,
+        previous_week_schedule,
+        initial_shifts,
+        runtime_config,
+        planning_start_date,
+        calendar,
+        availability,
+        compiled_config,
+    )
+    _build_model(ctx)
+    return ctx
+
+
+def _build_model(ctx: SolverContext) -> None:
+    """
+    Builds the planning variables, constraints and objective of a prepared context.
+
+    :param ctx: The solver context returned by ``prepare_context``.
+    :type ctx: SolverContext
+    """
+    _build_planning_variables(ctx)
+
+    registry = _build_registry()
+    registry.apply_hard(ctx)
+    registry.apply_soft(ctx)
+    registry.apply_mixed(ctx)
+    if ctx.symmetry_breaking:
+        break_agent_symmetry(ctx)
+    apply_objective(ctx)
+
+
+def _build_diagnosis_model(ctx: SolverContext) -> RuleLiterals:
+    """
+    Builds a feasibility model of a prepared context whose rules can be switched off.
+
+    The domain pre-pass is dropped, so cells it would fix to zero are variables
+    forbidden by the rule that blocks them, and every registered constraint function
+    is applied under its enforcement literals. Symmetry breaking, which only holds
+    while every rule holds for every agent, and the objective are left out.
+
+    :param ctx: The solver context returned by ``prepare_context``.
+    :type ctx: SolverContext
+    :return: The enforcement literals of the rules.
+    :rtype: RuleLiterals
+    """
+    ctx.fixed_zero_cells = set()
+    _build_planning_variables(ctx)
+    rules = RuleLiterals(ctx, ctx.diagnosis_scope)
+    _build_registry().apply_enforced(ctx, rules)
+    return rules
+
+
+def prepare_context(
+    agents,
+    vacations,
+    week_schedule,
+    dayOff,
+    previous_week_schedule,
+    initial_shifts,
+    runtime_config,
+    planning_start_date=None,
+    calendar=None,
+    availability=None,
+    compiled_config=None,
+) -> SolverContext:
+    """
+    Builds the solver context up to the domain pre-pass, without any model variable.
+
+    Settings, durations, compiled configuration, calendar, availability, the fixed
+    previous-week table and the fixed-zero cells are ready; the model is still empty.
+    This is all ``construct_planning`` and ``solver.preview`` read.
+
+    :return: The solver context, with an empty model.
+    :rtype: SolverContext
+    """
+    model = cp_model.CpModel()
+    ctx = SolverContext(
+        model=model,
+        config=runtime_config,
+        agents=agents,
+        vacations=vacations,
+        week_schedule=week_schedule,
+        day_off=dayOff,
+        previous_week_schedule=previous_week_schedule,
+        initial_shifts=initial_shifts,
+        holidays=runtime_config["holidays"],
+        planning_start_date=planning_start_date,
+    )
+
+    _load_solver_settings(ctx)
+    _load_shift_durations(ctx)
+    _load_compiled_config(ctx, compiled_config)
+    _build_calendar(ctx, calendar)
+    _build_availability(ctx, availability)
+    _build_previous_week_assignments(ctx)
+    ctx.fixed_zero_cells = compute_fixed_zero_cells(ctx)
+    return ctx
+
+
 def generate_planning(
     agents,
     vacations,
@@ -171,10 +609,25 @@ def generate_planning(
     initial_shifts,
     runtime_config,
     planning_start_date=None,
+    calendar=None,
+    availability=None,
+    compiled_config=None,
+    on_solution=None,
+    control=None,
+    on_finish=None,
+    solver_pool: SolverPool | None = None,
+    num_search_workers: int | None = None,
+    max_time_seconds: float | None = None,
+    hint: dict | None = None,
+    fix_hint: bool = False,
 ):
     """
     Generates a planning based on the given parameters.
 
+    The search ends at the first of ``max_time_seconds``, ``relative_gap_limit``, the
+    stagnation and post-solution limits of ``SearchWatchdog`` or a cancellation; the rule
+    that fired is printed with the solver status and reported to ``on_finish``.
+
     :param agents: A list of agent names.
     :type agents: List[str]
     :param vacations: A list of vacation types.
@@ -189,42 +642,131 @@ def generate_planning(
     :type initial_shifts: Dict[str, List[Tuple[str, str]]]
     :param runtime_config: A dictionary containing the runtime configuration.
     :type runtime_config: Dict[str, Any]
-    :return: A dictionary containing the generated planning, where each key is an agent name and each value is a list of tuples, where each tuple contains a day and a vacation type.
+    :param planning_start_date: The date of the first planned day, used to anchor the calendar.
+    :type planning_start_date: str | datetime | None
+    :param calendar: The request calendar sliced to the previous-week and planned days, if already built.
+    :type calendar: Calendar | None
+    :param availability: The request availability tensor sliced like ``calendar``, if already built.
+    :type availability: AvailabilityTensor | None
+    :param compiled_config: The runtime configuration compiled when it was installed, if available.
+    :type compiled_config: CompiledConfig | None
+    :param on_solution: Called with each improving solution found during the search (see ``PlanningSolutionCallback``).
+    :type on_solution: Callable[[dict], None] | None
+    :param control: Lets another thread stop the search; a stopped search returns the best solution found so far.
+    :type control: SolveControl | None
+    :param on_finish: Called once the search ends with its "status", "stop_reason", "objective", "best_bound" and "elapsed" time, plus the number of hinted "shifts" the solution "kept" and whether the hint was "feasible" when ``hint`` is given, the "cap_excess" of ``cap_excess_report`` when a cap is elastic, and the "diagnosis" of ``diagnose_planning`` when the model is proven infeasible.
+    :type on_finish: Callable[[dict], None] | None
+    :param solver_pool: Worker processes that run the search instead of the calling process.
+    :type solver_pool: SolverPool | None
+    :param num_search_workers: Search workers granted to this solve, overriding ``solver.num_search_workers``.
+    :type num_search_workers: int | None
+    :param max_time_seconds: Time limit of this solve, overriding ``solver.max_time_seconds``.
+    :type max_time_seconds: float | None
+    :param hint: A prior planning, in the returned format, used as a solution hint (see ``_complete_hint``). Without one, the search is hinted with ``construct_planning`` unless ``solver.greedy_hint`` is false; the summary hint then also has its "source" and "unfilled" slots.
+    :type hint: Dict[str, List[Tuple[str, str]]] | None
+    :param fix_hint: Only check whether ``hint`` satisfies the model: the hinted cells are fixed, so the solve returns ``hint`` or no solution.
+    :type fix_hint: bool
+    :return: A dictionary containing the generated planning, where each key is an agent name and each value is a list of tuples, where each tuple contains a day and a vacation type. When a preflight check fails (see ``check_feasibility``), the model is not built and the failed checks are returned as "issues" with the "info" message. When the solve is proven infeasible and ``solver.diagnose_infeasibility`` is set, the "info" message comes with the "conflict" rules of ``diagnose_planning``.
     :rtype: Dict[str, List[Tuple[str, str]]]
     """
-    model = cp_model.CpModel()
-    ctx = SolverContext(
-        model=model,
-        config=runtime_config,
-        agents=agents,
-        vacations=vacations,
-        week_schedule=week_schedule,
-        day_off=dayOff,
-        previous_week_schedule=previous_week_schedule,
-        initial_shifts=initial_shifts,
-        holidays=runtime_config["holidays"],
-        planning_start_date=planning_start_date,
+    started = time.perf_counter()
+    ctx = prepare_context(
+        agents,
+        vacations,
+        week_schedule,
+        dayOff,
+        previous_week_schedule,
+        initial_shifts,
+        runtime_config,
+        planning_start_date,
+        calendar,
+        availability,
+        compiled_config,
     )
+    issues = check_feasibility(ctx) if ctx.preflight else []
+    if issues:
+        print("Preflight :", len(issues), "failed checks:", ", ".join(issue["rule"] for issue in issues))
+        if on_finish is not None:
+            on_finish(
+                {
+                    "status": PREFLIGHT_STATUS,
+                    "stop_reason": STOP_PREFLIGHT,
+                    "objective": None,
+                    "best_bound": None,
+                    "elapsed": time.perf_counter() - started,
+                    "issues": issues,
+                }
+            )
+        return {"info": PREFLIGHT_FAILED_INFO, "issues": issues}
+    _build_model(ctx)
+
+    if num_search_workers is not None:
+        ctx.num_search_workers = num_search_workers
+    if max_time_seconds is not None:
+        ctx.max_time_seconds = max_time_seconds
+    greedy = None
+    if hint is None and ctx.greedy_hint:
+        greedy = construct_planning(ctx)
+        hint = greedy.planning
+        fix_hint = False
+    hinted_shifts = _apply_hint(ctx, hint) if hint is not None else None
+    hint_feasible = None
+    if hint is not None and not fix_hint:
+        completion_started = time.perf_counter()
+        hint_feasible = _complete_hint(
+            ctx,
+            min(ctx.max_time_seconds, HINT_COMPLETION_MAX_SECONDS),
+            solver_pool,
+            control,
+        )
+        # The completion is part of the solve's time budget
+        ctx.max_time_seconds = max(
+            0, ctx.max_time_seconds - (time.perf_counter() - completion_started)
+        )
 
-    _load_solver_settings(ctx)
-    _load_shift_durations(ctx)
-    ctx.weeks_split = split_into_weeks(ctx.week_schedule)
-    _build_day_dates(ctx)
-    _build_planning_variables(ctx)
-
-    registry = _build_registry()
-    registry.apply_hard(ctx)
-    registry.apply_soft(ctx)
-    registry.apply_mixed(ctx)
-    apply_objective(ctx)
-
-    solver = cp_model.CpSolver()
+    solver = new_solver(solver_pool)
     if ctx.num_search_workers > 0:
         solver.parameters.num_search_workers = ctx.num_search_workers
     if ctx.relative_gap_limit > 0:
         solver.parameters.relative_gap_limit = ctx.relative_gap_limit
     solver.parameters.max_time_in_seconds = ctx.max_time_seconds
-    status = solver.Solve(ctx.model)
+    if hint is not None and fix_hint:
+        solver.parameters.fix_variables_to_their_hinted_value = True
+
+    print(
+        "Model :",
+        len(ctx.model.Proto().variables),
+        "variables",
+        "     constraints :",
+        constraint_counts(ctx.model),
+    )
+    if control is not None and not control.attach(solver):
+        return {"info": "Solve cancelled."}
+    watchdog = SearchWatchdog(
+        solver,
+        stagnation_seconds=ctx.stagnation_seconds,
+        min_improvement=ctx.stagnation_min_improvement,
+        max_seconds_after_first_solution=ctx.max_seconds_after_first_solution,
+        # CP-SAT stores a maximized objective as a negated minimization
+        maximize=ctx.model.Proto().objective.scaling_factor < 0,
+    )
+    try:
+        with watchdog:
+            if on_solution is None and control is None and not watchdog.enabled:
+                status = solver.Solve(ctx.model)
+            else:
+                status = solver.Solve(
+                    ctx.model,
+                    PlanningSolutionCallback(
+                        ctx, on_solution, control, watchdog if watchdog.enabled else None
+                    ),
+                )
+    finally:
+        if control is not None:
+            control.detach(solver)
+    stop_reason = resolve_stop_reason(
+        status, solver, watchdog, cancelled=control is not None and control.cancelled
+    )
 
     print(
         "OR-Tools Status:",
@@ -235,8 +777,152 @@ def generate_planning(
         solver.NumBranches(),
         "     execution time :",
         f"{solver.WallTime():.4f} seconds",
+        "     stop reason :",
+        stop_reason,
     )
 
+    diagnosis = None
+    cancelled = control is not None and control.cancelled
+    # A fixed hint is only checked, and its infeasibility says nothing about the rules
+    if status == cp_model.INFEASIBLE and ctx.diagnose_infeasibility and not (fix_hint or cancelled):
+        diagnosis = diagnose_planning(
+            agents,
+            vacations,
+            week_schedule,
+            dayOff,
+            previous_week_schedule,
+            initial_shifts,
+            runtime_config,
+            planning_start_date,
+            calendar,
+            availability,
+            compiled_config,
+            max_time_seconds=min(ctx.max_time_seconds, DIAGNOSIS_MAX_SECONDS),
+            solver_pool=solver_pool,
+            control=control,
+        )
+        print(
+            "Diagnosis :",
+            "conflicting rules:",
+            ", ".join(rule["rule"] for rule in diagnosis["conflict"]) or "none found",
+            "     minimal :",
+            diagnosis["minimal"],
+        )
+
+    if on_finish is not None:
+        found = status in [cp_model.OPTIMAL, cp_model.FEASIBLE]
+        summary = {
+            "status": solver.StatusName(status),
+            "stop_reason": stop_reason,
+            "objective": solver.ObjectiveValue() if found else None,
+            "best_bound": solver.BestObjectiveBound() if found else None,
+            "elapsed": solver.WallTime(),
+        }
+        if hinted_shifts is not None:
+            summary["hint"] = {
+                "shifts": len(hinted_shifts),
+                "kept": sum(solver.Value(var) for var in hinted_shifts) if found else 0,
+            }
+            if hint_feasible is not None:
+                summary["hint"]["feasible"] = hint_feasible
+            if greedy is not None:
+                summary["hint"].update(source=HINT_SOURCE_GREEDY, unfilled=greedy.unfilled)
+        if found and (ctx.elastic_gaps or ctx.elastic_max_weekly_hours):
+            summary["cap_excess"] = cap_excess_report(ctx, solver)
+        if diagnosis is not None:
+            summary["diagnosis"] = diagnosis
+        on_finish(summary)
+
     if status in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
         return _extract_solution(ctx, solver)
-    return {"info": "No solution found."}
+    if diagnosis is not None:
+        return {"info": NO_SOLUTION_INFO, "conflict": diagnosis["conflict"]}
+    return {"info": NO_SOLUTION_INFO}
+
+
+def preflight_planning(
+    agents,
+    vacations,
+    week_schedule,
+    dayOff,
+    previous_week_schedule,
+    initial_shifts,
+    runtime_config,
+    planning_start_date=None,
+    calendar=None,
+    availability=None,
+    compiled_config=None,
+):
+    """
+    Runs the preflight checks of ``generate_planning`` without building the model.
+
+    Arguments are those of ``generate_planning``. Returns no issue when
+    ``solver.preflight`` is false.
+
+    :return: The failed checks (see ``check_feasibility``), empty when none failed.
+    :rtype: List[dict]
+    """
+    ctx = prepare_context(
+        agents,
+        vacations,
+        week_schedule,
+        dayOff,
+        previous_week_schedule,
+        initial_shifts,
+        runtime_config,
+        planning_start_date,
+        calendar,
+        availability,
+        compiled_config,
+    )
+    return check_feasibility(ctx) if ctx.preflight else []
+
+
+def diagnose_planning(
+    agents,
+    vacations,
+    week_schedule,
+    dayOff,
+    previous_week_schedule,
+    initial_shifts,
+    runtime_config,
+    planning_start_date=None,
+    calendar=None,
+    availability=None,
+    compiled_config=None,
+    max_time_seconds: float = DIAGNOSIS_MAX_SECONDS,
+    solver_pool: SolverPool | None = None,
+    control: SolveControl | None = None,
+):
+    """
+    Finds a set of registered rules that cannot hold together (see ``find_conflict``).
+
+    Arguments are those of ``generate_planning``. Each constraint function of the
+    registry is enforced by a literal per rule, or per rule and agent or week
+    following ``solver.diagnosis_scope``, on a model built without the domain
+    pre-pass (see ``_build_diagnosis_model``).
+
+    :param max_time_seconds: Time limit of the diagnosis.
+    :type max_time_seconds: float
+    :param solver_pool: Worker processes that run the diagnosis solves instead of the calling process.
+    :type solver_pool: SolverPool | None
+    :param control: Lets another thread stop the diagnosis.
+    :type control: SolveControl | None
+    :return: The "status" of the model with every rule, the "conflict" rules with their "rule" name, "agents" and "days" scope, whether the set is "minimal" and the "elapsed" time.
+    :rtype: dict
+    """
+    ctx = prepare_context(
+        agents,
+        vacations,
+        week_schedule,
+        dayOff,
+        previous_week_schedule,
+        initial_shifts,
+        runtime_config,
+        planning_start_date,
+        calendar,
+        availability,
+        compiled_config,
+    )
+    rules = _build_diagnosis_model(ctx)
+    return find_conflict(ctx, rules, max_time_seconds, solver_pool, control)
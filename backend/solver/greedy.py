@@ -0,0 +1,371 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .availability import LEAVE
+from .calendar import SATURDAY, SUNDAY
+from .context import SolverContext
+from .domain import NIGHT_SHIFT, WEEKLY_SHIFT_LIMITS, allowed_cell_mask, required_agents
+from .symmetry import agent_equivalence_classes
+
+# Paid hours are compared in bands of this many tenths of hours. A preferred vacation
+# moves an agent two bands ahead and an avoided one ten bands back; _rebalance then
+# brings the hours back within the balance gaps
+BALANCE_BAND = 60
+PREFERRED_BONUS = -20
+AVOIDED_PENALTY = 100
+
+UNASSIGNED = -1
+
+
+@dataclass
+class GreedyPlanning:
+    """
+    Planning built by ``construct_planning``.
+
+    Attributes:
+        planning (Dict[str, List[Tuple[str, str]]]): The shifts of each agent, in the format returned by ``generate_planning``.
+        unfilled (int): Staffing slots left empty because no agent could take them.
+        assignments (np.ndarray): Vacation index assigned to each (agent, day), or ``UNASSIGNED``.
+    """
+    planning: Dict[str, List[Tuple[str, str]]]
+    unfilled: int = 0
+    assignments: np.ndarray = field(default_factory=lambda: np.zeros((0, 0), dtype=np.int16))
+
+
+class GreedyState:
+    """
+    Assignments and running counters of the constructor, indexed like ``ctx.planning``.
+
+    ``candidates`` and ``receivers`` tell which agents may take a shift without breaking
+    a hard rule, and ``assign`` and ``unassign`` keep the counters up to date.
+    """
+
+    def __init__(self, ctx: SolverContext):
+        agent_count = len(ctx.agents)
+        day_count = len(ctx.calendar)
+        vacation_count = len(ctx.vacations)
+        self.ctx = ctx
+        self.night_idx = ctx.vacations.index(NIGHT_SHIFT) if NIGHT_SHIFT in ctx.vacations else None
+
+        self.allowed = allowed_cell_mask(ctx)
+
+        self.assignments = np.full((agent_count, day_count), UNASSIGNED, dtype=np.int16)
+        for (agent_idx, day_idx), vacation_idx in ctx.previous_week_assignments.items():
+            self.assignments[agent_idx, day_idx] = vacation_idx
+
+        self.durations = np.array(
+            [ctx.shift_durations[vacation] for vacation in ctx.vacations], dtype=np.int64
+        )
+        self.weekly_limits = np.array(
+            [WEEKLY_SHIFT_LIMITS.get(vacation, day_count) for vacation in ctx.vacations],
+            dtype=np.int64,
+        )
+        self.week_of_day = np.full(day_count, -1, dtype=np.int64)
+        weeks = ctx.calendar.weeks(ctx.planned_day_offset)
+        for week_idx, week in enumerate(weeks):
+            self.week_of_day[week] = week_idx
+        self.week_shifts = np.zeros((agent_count, len(weeks), vacation_count), dtype=np.int64)
+        self.week_hours = np.zeros((agent_count, len(weeks)), dtype=np.int64)
+
+        # Paid leave hours count in the balance, as in balance_paid_hours
+        planned = slice(ctx.planned_day_offset, None)
+        weekdays = np.array([day.weekday < 6 for day in ctx.calendar], dtype=bool)
+        leave = ctx.availability.statuses[:, planned, LEAVE] & weekdays[planned]
+        self.paid_hours = leave.sum(axis=1).astype(np.int64) * ctx.conge_duration
+        self.period_of_day = np.full(day_count, -1, dtype=np.int64)
+        periods = ctx.calendar.periods(ctx.planned_day_offset)
+        self.period_hours = np.zeros((agent_count, len(periods)), dtype=np.int64)
+        for period_idx, period in enumerate(periods):
+            self.period_of_day[period] = period_idx
+            period_leave = leave[:, np.array(period) - ctx.planned_day_offset]
+            self.period_hours[:, period_idx] = period_leave.sum(axis=1) * ctx.conge_duration
+
+        self.weekend_pairs = set(ctx.calendar.weekend_pairs(ctx.continuity_start))
+        self.worked_weekends = np.zeros(agent_count, dtype=np.int64)
+        planned_pairs = ctx.calendar.weekend_pairs(ctx.planned_day_offset)
+        self.planned_saturdays = {saturday for saturday, _ in planned_pairs}
+        min_free_weekends = max(0, int(ctx.min_free_weekends_per_horizon))
+        self.max_worked_weekends = (
+            len(planned_pairs) - min_free_weekends if min_free_weekends else len(planned_pairs)
+        )
+
+        self.preference = np.zeros((agent_count, vacation_count), dtype=np.int64)
+        for agent in ctx.compiled_config.agents:
+            for vacation_idx in range(vacation_count):
+                if agent.preferred_mask >> vacation_idx & 1:
+                    self.preference[agent.index, vacation_idx] += PREFERRED_BONUS
+                if agent.avoid_mask >> vacation_idx & 1:
+                    self.preference[agent.index, vacation_idx] += AVOIDED_PENALTY
+
+    def candidates(self, day_idx: int, vacation_idx: int) -> np.ndarray:
+        """Returns the mask of agents that can take a vacation on a day without breaking a hard rule."""
+        ctx = self.ctx
+        mask = self.allowed[:, day_idx, vacation_idx] & (self.assignments[:, day_idx] == UNASSIGNED)
+
+        # A worked Saturday also needs room for the same shift on Sunday, in the same week
+        shifts = 2 if day_idx in self.planned_saturdays else 1
+        week_idx = self.week_of_day[day_idx]
+        mask &= (
+            self.week_shifts[:, week_idx, vacation_idx] + shifts <= self.weekly_limits[vacation_idx]
+        )
+        mask &= (
+            self.week_hours[:, week_idx] + shifts * self.durations[vacation_idx]
+            <= ctx.max_weekly_hours
+        )
+
+        day = ctx.calendar[day_idx]
+        reads_previous_day = day_idx - 1 >= ctx.continuity_start and ctx.calendar.follows(day_idx)
+        if self.night_idx is not None and reads_previous_day and vacation_idx != self.night_idx:
+            mask &= self.assignments[:, day_idx - 1] != self.night_idx
+
+        if (
+            self.night_idx is not None
+            and vacation_idx == self.night_idx
+            and day.weekday == 0
+            and day_idx - 2 >= ctx.continuity_start
+            and ctx.calendar[day_idx - 2].weekday == SATURDAY
+        ):
+            mask &= ~(
+                (self.assignments[:, day_idx - 2] == self.night_idx)
+                & (self.assignments[:, day_idx - 1] == self.night_idx)
+            )
+
+        # Full weekends: Sunday is worked by the Saturday workers only
+        if day.weekday == SUNDAY and (day_idx - 1, day_idx) in self.weekend_pairs:
+            mask &= self.assignments[:, day_idx - 1] != UNASSIGNED
+        elif day_idx in self.planned_saturdays:
+            mask &= self.worked_weekends < self.max_worked_weekends
+            if vacation_idx == self.night_idx:
+                mask &= self.allowed[:, day_idx + 1, vacation_idx]
+            else:
+                mask &= self.allowed[:, day_idx + 1].any(axis=1)
+        return mask
+
+    def scores(self, day_idx: int, vacation_idx: int) -> np.ndarray:
+        """Returns the cost of giving a vacation to each agent; the lowest is picked first."""
+        scores = (self.paid_hours // BALANCE_BAND) * 10 + self.preference[:, vacation_idx]
+        if self.ctx.calendar[day_idx].weekday == SUNDAY:
+            # Saturday workers keep the same vacation, so nights stay on nights
+            scores = scores - (self.assignments[:, day_idx - 1] == vacation_idx) * 1_000_000
+        return scores
+
+    def assign(self, agent_idx: int, day_idx: int, vacation_idx: int) -> None:
+        self.assignments[agent_idx, day_idx] = vacation_idx
+        week_idx = self.week_of_day[day_idx]
+        self.week_shifts[agent_idx, week_idx, vacation_idx] += 1
+        self.week_hours[agent_idx, week_idx] += self.durations[vacation_idx]
+        self.paid_hours[agent_idx] += self.durations[vacation_idx]
+        self.period_hours[agent_idx, self.period_of_day[day_idx]] += self.durations[vacation_idx]
+        if day_idx in self.planned_saturdays:
+            self.worked_weekends[agent_idx] += 1
+
+    def unassign(self, agent_idx: int, day_idx: int) -> None:
+        vacation_idx = self.assignments[agent_idx, day_idx]
+        self.assignments[agent_idx, day_idx] = UNASSIGNED
+        week_idx = self.week_of_day[day_idx]
+        self.week_shifts[agent_idx, week_idx, vacation_idx] -= 1
+        self.week_hours[agent_idx, week_idx] -= self.durations[vacation_idx]
+        self.paid_hours[agent_idx] -= self.durations[vacation_idx]
+        self.period_hours[agent_idx, self.period_of_day[day_idx]] -= self.durations[vacation_idx]
+        if day_idx in self.planned_saturdays:
+            self.worked_weekends[agent_idx] -= 1
+
+    def receivers(self, day_idx: int, vacation_idx: int) -> np.ndarray:
+        """Returns the mask of agents that can take a shift once the following days are planned."""
+        mask = self.candidates(day_idx, vacation_idx)
+        if vacation_idx != self.night_idx or day_idx + 1 >= len(self.ctx.calendar):
+            return mask
+        next_day = self.assignments[:, day_idx + 1]
+        mask &= (next_day == UNASSIGNED) | (next_day == self.night_idx)
+
+        # A weekend night completes weekend nights followed by a Monday night
+        calendar = self.ctx.calendar
+        weekday = calendar[day_idx].weekday
+        if weekday in (SATURDAY, SUNDAY):
+            other_day = day_idx + 1 if weekday == SATURDAY else day_idx - 1
+            monday = day_idx + 2 if weekday == SATURDAY else day_idx + 1
+            if (
+                monday < len(calendar)
+                and other_day >= self.ctx.continuity_start
+                and calendar[monday].weekday == 0
+            ):
+                mask &= ~(
+                    (self.assignments[:, other_day] == self.night_idx)
+                    & (self.assignments[:, monday] == self.night_idx)
+                )
+        return mask
+
+
+def _rebalance(state: GreedyState, max_spread: int) -> None:
+    """
+    Moves weekday shifts from the most paid agents to the least paid ones.
+
+    The day-by-day construction cannot see the end of the horizon, so its paid hours
+    may end up further apart than the balance gaps allow. A shift is moved only to an
+    agent that could have taken it and that ends below the giver's current hours, so
+    every move narrows the hours and the loop ends.
+
+    :param state: The constructor state, with every day filled.
+    :type state: GreedyState
+    :param max_spread: The largest gap allowed between paid hours, in tenths of hours.
+    :type max_spread: int
+    """
+    ctx = state.ctx
+    weekdays = [
+        day_idx
+        for day_idx in range(ctx.planned_day_offset, len(ctx.calendar))
+        if ctx.calendar[day_idx].weekday < SATURDAY
+    ]
+    while state.paid_hours.max(initial=0) - state.paid_hours.min(initial=0) > max_spread:
+        floor = state.paid_hours.min()
+        givers = [
+            agent_idx
+            for agent_idx in np.argsort(-state.paid_hours, kind="stable")
+            if state.paid_hours[agent_idx] - floor > max_spread
+        ]
+        if not _move_one_shift(state, givers, weekdays):
+            return
+
+
+def _move_one_shift(state: GreedyState, givers, weekdays: List[int]) -> bool:
+    for giver in givers:
+        giver_hours = state.paid_hours[giver]
+        for day_idx in weekdays:
+            vacation_idx = int(state.assignments[giver, day_idx])
+            if vacation_idx == UNASSIGNED:
+                continue
+            state.unassign(giver, day_idx)
+            receivers = state.receivers(day_idx, vacation_idx)
+            receivers &= state.paid_hours + state.durations[vacation_idx] < giver_hours
+            if receivers.any():
+                candidates = np.flatnonzero(receivers)
+                scores = state.paid_hours[candidates] * 10 + state.preference[candidates, vacation_idx]
+                state.assign(int(candidates[np.argmin(scores)]), day_idx, vacation_idx)
+                return True
+            state.assign(giver, day_idx, vacation_idx)
+    return False
+
+
+def _vacation_order(ctx: SolverContext) -> List[int]:
+    """Returns the vacation indices in filling order: nights first, as they constrain the next day."""
+    return sorted(
+        range(len(ctx.vacations)),
+        key=lambda vacation_idx: (ctx.vacations[vacation_idx] != NIGHT_SHIFT, vacation_idx),
+    )
+
+
+def order_equivalent_agents(ctx: SolverContext, assignments: np.ndarray) -> np.ndarray:
+    """
+    Reorders the rows of interchangeable agents as ``break_agent_symmetry`` requires.
+
+    Equivalent agents can swap plannings without breaking any rule, so within each
+    class the planned rows are sorted in decreasing lexicographic order of their
+    (day, vacation) cells, where a worked cell ranks above a free one.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :param assignments: Vacation index assigned to each (agent, day), or ``UNASSIGNED``.
+    :type assignments: np.ndarray
+    :return: The reordered assignments.
+    :rtype: np.ndarray
+    """
+    assignments = assignments.copy()
+    planned = slice(ctx.planned_day_offset, None)
+    for members in agent_equivalence_classes(ctx):
+        rows = assignments[members, planned]
+        # Comparing (day, vacation) cells is comparing, day by day, the vacation
+        # worked: a lower vacation index ranks first and a free day ranks last
+        keys = np.where(rows == UNASSIGNED, len(ctx.vacations), rows)
+        order = sorted(range(len(members)), key=lambda row_idx: keys[row_idx].tolist())
+        assignments[members, planned] = rows[order]
+    return assignments
+
+
+def construct_planning(ctx: SolverContext) -> GreedyPlanning:
+    """
+    Builds a planning greedily, day by day, without calling the solver.
+
+    Each day's staffing is filled from the agents still free that day, nights first.
+    An agent is a candidate only when the hard rules of ``constraints/hard.py`` and
+    ``constraints/mixed.py`` still hold: cells fixed by the domain pre-pass, one shift
+    per day, no shift other than a night after a night, no Monday night after weekend
+    nights, weekly day, night, CDP and hour caps, full weekends and the minimum of free
+    weekends. Among candidates, the agent with the fewest paid hours is picked, shifted
+    by its preferences. Slots no candidate can take are left empty and counted. Weekday
+    shifts are then moved from the most to the least paid agents until the paid hours
+    fit the balance gaps, when the rules allow it.
+
+    The result is a starting point for CP-SAT (see ``generate_planning``); the shift
+    every agent must work is not enforced.
+
+    :param ctx: The solver context, with its domain pre-pass and previous-week table computed.
+    :type ctx: SolverContext
+    :return: The greedy planning and its number of unfilled slots.
+    :rtype: GreedyPlanning
+    """
+    state, unfilled = construct_state(ctx)
+    assignments = state.assignments
+    if ctx.symmetry_breaking:
+        assignments = order_equivalent_agents(ctx, assignments)
+    return GreedyPlanning(
+        planning=planning_from_assignments(ctx, assignments),
+        unfilled=unfilled,
+        assignments=assignments,
+    )
+
+
+def construct_state(ctx: SolverContext) -> Tuple[GreedyState, int]:
+    """
+    Fills every day and rebalances paid hours, as ``construct_planning`` does.
+
+    The state is returned as is, with its assignments in agent order, so callers such
+    as ``solver.preview`` can keep moving shifts with its hard-rule checks.
+
+    :param ctx: The solver context, with its domain pre-pass and previous-week table computed.
+    :type ctx: SolverContext
+    :return: The constructor state and its number of unfilled slots.
+    :rtype: Tuple[GreedyState, int]
+    """
+    state = GreedyState(ctx)
+    vacation_order = _vacation_order(ctx)
+    unfilled = 0
+    for day_idx in range(ctx.planned_day_offset, len(ctx.calendar)):
+        for vacation_idx in vacation_order:
+            required = required_agents(ctx, day_idx, ctx.vacations[vacation_idx])
+            if required == 0:
+                continue
+            candidates = np.flatnonzero(state.candidates(day_idx, vacation_idx))
+            scores = state.scores(day_idx, vacation_idx)[candidates]
+            # Stable sort keeps ties in agent order, so the result is deterministic
+            chosen = candidates[np.argsort(scores, kind="stable")[:required]]
+            for agent_idx in chosen:
+                state.assign(int(agent_idx), day_idx, vacation_idx)
+            unfilled += required - len(chosen)
+    _rebalance(state, min(ctx.global_max_gap, ctx.period_max_gap))
+    return state, unfilled
+
+
+def planning_from_assignments(
+    ctx: SolverContext, assignments: np.ndarray
+) -> Dict[str, List[Tuple[str, str]]]:
+    """
+    Converts an assignment table into the planning format returned by ``generate_planning``.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :param assignments: Vacation index assigned to each (agent, day), or ``UNASSIGNED``.
+    :type assignments: np.ndarray
+    :return: The planned shifts of each agent.
+    :rtype: Dict[str, List[Tuple[str, str]]]
+    """
+    planning = {}
+    for agent_idx, agent in enumerate(ctx.agents):
+        planning[agent["name"]] = [
+            (ctx.calendar[day_idx].label, ctx.vacations[vacation_idx])
+            for day_idx in range(ctx.planned_day_offset, len(ctx.calendar))
+            for vacation_idx in [assignments[agent_idx, day_idx]]
+            if vacation_idx != UNASSIGNED
+        ]
+    return planning
@@ -1,7 +1,30 @@
 from ortools.sat.python import cp_model
 
+from .constraints.elastic import CAP_GLOBAL_GAP, CAP_PERIOD_GAP, CAP_WEEKLY_HOURS
 from .context import SolverContext
 
+WEIGHT_PREFERRED = 100
+WEIGHT_OTHER = 1
+WEIGHT_AVOID = -250
+
+
+def cap_excess_weight(ctx: SolverContext, cap: str) -> int:
+    """
+    Returns the objective penalty per tenth of an hour over an elastic cap.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :param cap: The setting of the cap ("global_max_gap", "period_max_gap" or "max_weekly_hours").
+    :type cap: str
+    :return: The penalty weight configured for the cap.
+    :rtype: int
+    """
+    return {
+        CAP_GLOBAL_GAP: ctx.global_gap_excess_weight,
+        CAP_PERIOD_GAP: ctx.period_gap_excess_weight,
+        CAP_WEEKLY_HOURS: ctx.weekly_hours_excess_weight,
+    }[cap]
+
 
 def apply_objective(ctx: SolverContext) -> None:
     """
@@ -11,40 +34,26 @@ def apply_objective(ctx: SolverContext) -> None:
     The preferred vacations are given a positive weight, the other vacations are given a unit weight, and the penalized vacations are given a negative weight.
     The objective is to maximize the sum of the preferred vacations and the other vacations, and to minimize the sum of the penalized vacations.
     If the period balance is optimized, the period balancing objective is subtracted from the main objective.
+    The excess over each elastic cap is subtracted with the weight of its cap (see ``cap_excess_weight``).
     """
-    weight_preferred = 100
-    weight_other = 1
-    weight_avoid = -250
-
-    objective_preferred_vacations = cp_model.LinearExpr.Sum(
-        list(
-            ctx.planning[(agent["name"], day, vacation)] * weight_preferred
-            for agent in ctx.agents
-            for day in ctx.week_schedule
-            for vacation in ctx.vacations
-            if vacation in agent["preferences"]["preferred"]
-        )
-    )
+    planning = ctx.planning
+    planned_days = range(ctx.planned_day_offset, len(planning.days))
+    preferred_cells = []
+    other_cells = []
+    avoided_cells = []
+    for agent in ctx.compiled_config.agents:
+        for vacation_idx in range(len(ctx.vacations)):
+            cells = [planning.at(agent.index, day_idx, vacation_idx) for day_idx in planned_days]
+            if agent.preferred_mask >> vacation_idx & 1:
+                preferred_cells.extend(cells)
+            else:
+                other_cells.extend(cells)
+            if agent.avoid_mask >> vacation_idx & 1:
+                avoided_cells.extend(cells)
 
-    objective_other_vacations = cp_model.LinearExpr.Sum(
-        list(
-            ctx.planning[(agent["name"], day, vacation)] * weight_other
-            for agent in ctx.agents
-            for day in ctx.week_schedule
-            for vacation in ctx.vacations
-            if vacation not in agent["preferences"]["preferred"]
-        )
-    )
-
-    penalized_vacations = cp_model.LinearExpr.Sum(
-        list(
-            ctx.planning[(agent["name"], day, vacation)] * weight_avoid
-            for agent in ctx.agents
-            for day in ctx.week_schedule
-            for vacation in ctx.vacations
-            if vacation in agent["preferences"]["avoid"]
-        )
-    )
+    objective_preferred_vacations = cp_model.LinearExpr.Sum(preferred_cells) * WEIGHT_PREFERRED
+    objective_other_vacations = cp_model.LinearExpr.Sum(other_cells) * WEIGHT_OTHER
+    penalized_vacations = cp_model.LinearExpr.Sum(avoided_cells) * WEIGHT_AVOID
 
     objective = (
         objective_preferred_vacations
@@ -54,5 +63,10 @@ def apply_objective(ctx: SolverContext) -> None:
     )
     if ctx.optimize_period_balance:
         objective -= ctx.period_balance_weight * ctx.period_balancing_objective
+    if ctx.cap_excesses:
+        objective -= cp_model.LinearExpr.WeightedSum(
+            [record.excess for record in ctx.cap_excesses],
+            [cap_excess_weight(ctx, record.cap) for record in ctx.cap_excesses],
+        )
 
     ctx.model.Maximize(objective)
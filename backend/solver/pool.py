@@ -0,0 +1,452 @@
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+
+from ortools.sat import cp_model_pb2, sat_parameters_pb2
+from ortools.sat.python import cp_model
+
+DEFAULT_SOLVER_PROCESSES = 0
+DEFAULT_SOLVER_PROCESS_CPUS = 0
+WORKER_POLL_SECONDS = 0.1
+MONITOR_POLL_SECONDS = 1.0
+
+MSG_SOLVE = "solve"
+MSG_STOP = "stop"
+MSG_SOLUTION = "solution"
+MSG_DONE = "done"
+MSG_ERROR = "error"
+
+
+class SolverWorkerError(RuntimeError):
+    """Raised when a solver worker process dies or fails during a solve."""
+
+
+class _WorkerState:
+    """Task bookkeeping shared by the two threads of a worker process."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.task_id = 0
+        self.solver: cp_model.CpSolver | None = None
+        self.stopped_through = 0
+
+    def stopped(self, task_id: int) -> bool:
+        return task_id <= self.stopped_through
+
+    def stop(self, task_id: int) -> None:
+        with self.lock:
+            self.stopped_through = max(self.stopped_through, task_id)
+            solver = self.solver if self.task_id == task_id else None
+        if solver is not None:
+            solver.StopSearch()
+
+
+class _RelayCallback(cp_model.CpSolverSolutionCallback):
+    """Sends each solution back to the parent process, and honours stop requests."""
+
+    def __init__(self, state: _WorkerState, task_id: int, result_conn, report_solutions: bool):
+        super().__init__()
+        self._state = state
+        self._task_id = task_id
+        self._result_conn = result_conn
+        self._report_solutions = report_solutions
+
+    def on_solution_callback(self):
+        if self._state.stopped(self._task_id):
+            self.StopSearch()
+        if self._report_solutions:
+            self._result_conn.send(
+                (MSG_SOLUTION, self._task_id, self.Response().SerializeToString())
+            )
+
+
+def _listen(task_conn, tasks: queue.Queue, state: _WorkerState) -> None:
+    # Stop requests must be read while the main thread is inside Solve
+    while True:
+        try:
+            message = task_conn.recv()
+        except EOFError:
+            message = None
+        if message is None:
+            tasks.put(None)
+            return
+        if message[0] == MSG_STOP:
+            state.stop(message[1])
+        else:
+            tasks.put(message)
+
+
+def _run_task(message, state: _WorkerState, result_conn) -> None:
+    _, task_id, model_bytes, parameters_bytes, report_solutions = message
+    try:
+        model = cp_model.CpModel()
+        model.Proto().ParseFromString(model_bytes)
+        solver = cp_model.CpSolver()
+        solver.parameters.ParseFromString(parameters_bytes)
+        with state.lock:
+            state.task_id = task_id
+            state.solver = solver
+        solver.Solve(model, _RelayCallback(state, task_id, result_conn, report_solutions))
+        result_conn.send((MSG_DONE, task_id, solver.ResponseProto().SerializeToString()))
+    except Exception as exc:
+        result_conn.send((MSG_ERROR, task_id, f"{type(exc).__name__}: {exc}"))
+    finally:
+        with state.lock:
+            state.solver = None
+
+
+def _worker_main(task_conn, result_conn, cpus) -> None:
+    """Entry point of a solver worker process; ``ortools`` is imported with this module."""
+    # Ctrl+C is handled by the Flask process, which then terminates its workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if cpus and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+    state = _WorkerState()
+    tasks = queue.Queue()
+    threading.Thread(
+        target=_listen, args=(task_conn, tasks, state), name="solver-listener", daemon=True
+    ).start()
+    while True:
+        message = tasks.get()
+        if message is None:
+            return
+        _run_task(message, state, result_conn)
+
+
+class _Worker:
+    """The parent-side handle of a solver worker process."""
+
+    def __init__(self, context, slot: int, cpus: list[int]):
+        self.slot = slot
+        self.cpus = cpus
+        self._next_task_id = 0
+        task_receiver, self.task_conn = context.Pipe(duplex=False)
+        self.result_conn, result_sender = context.Pipe(duplex=False)
+        self.process = context.Process(
+            target=_worker_main,
+            args=(task_receiver, result_sender, cpus),
+            name=f"solver-worker-{slot}",
+            daemon=True,
+        )
+        self.process.start()
+        # Only the child keeps its ends open, so a dead worker reads as EOF
+        task_receiver.close()
+        result_sender.close()
+
+    def next_task_id(self) -> int:
+        self._next_task_id += 1
+        return self._next_task_id
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def receive(self):
+        """
+        Waits for the next message of the worker.
+
+        :return: The message, as sent by the worker.
+        :rtype: tuple
+        :raises SolverWorkerError: If the worker process died.
+        """
+        while not self.result_conn.poll(WORKER_POLL_SECONDS):
+            if not self.process.is_alive():
+                break
+        try:
+            return self.result_conn.recv()
+        except (EOFError, OSError):
+            self.process.join(WORKER_POLL_SECONDS)
+            raise SolverWorkerError(
+                f"Solver worker process {self.slot} exited with code {self.process.exitcode}"
+            ) from None
+
+    def close(self) -> None:
+        try:
+            self.task_conn.send(None)
+        except OSError:
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.task_conn.close()
+        self.result_conn.close()
+
+
+def _cpu_share(slot: int, cpus_per_process: int) -> list[int]:
+    if cpus_per_process <= 0:
+        return []
+    if hasattr(os, "sched_getaffinity"):
+        available = sorted(os.sched_getaffinity(0))
+    else:
+        available = list(range(os.cpu_count() or 1))
+    share = min(cpus_per_process, len(available))
+    return sorted({available[(slot * share + i) % len(available)] for i in range(share)})
+
+
+class SolverPool:
+    """
+    Pool of pre-started solver processes that run CP-SAT outside the Flask process.
+
+    Each worker imports ``ortools`` when it starts and then solves one model at a
+    time; a crash or a long native search in a worker does not hold the GIL of the
+    API process nor take it down. A monitor thread replaces dead workers with new
+    processes; a worker that dies during a solve fails that solve only.
+
+    When ``cpus_per_process`` is set, worker ``i`` is pinned to its own share of the
+    CPUs (on platforms with ``os.sched_setaffinity``) and its solves use at most that
+    many search workers.
+
+    Attributes:
+        processes (int): Number of worker processes.
+        cpus_per_process (int): CPUs available to each worker; 0 leaves them unbounded.
+    """
+
+    def __init__(
+        self,
+        processes: int,
+        cpus_per_process: int = DEFAULT_SOLVER_PROCESS_CPUS,
+        start_method: str = "spawn",
+    ):
+        if processes <= 0:
+            raise ValueError("A solver pool needs at least one process")
+        self.processes = processes
+        self.cpus_per_process = cpus_per_process
+        # Forking a threaded Flask process is unsafe, so workers start from scratch
+        self._context = multiprocessing.get_context(start_method)
+        self._lock = threading.Lock()
+        self._workers: dict[int, _Worker] = {}
+        self._busy: set[int] = set()
+        self._idle = queue.Queue()
+        self._closed = threading.Event()
+        for slot in range(processes):
+            self._workers[slot] = self._spawn(slot)
+            self._idle.put(slot)
+        self._monitor = threading.Thread(
+            target=self._watch, name="solver-pool-monitor", daemon=True
+        )
+        self._monitor.start()
+
+    def _spawn(self, slot: int) -> _Worker:
+        return _Worker(self._context, slot, _cpu_share(slot, self.cpus_per_process))
+
+    def _replace(self, slot: int) -> _Worker:
+        # Called with the lock held
+        worker = self._workers[slot]
+        print(f"Restarting solver worker {slot} (exit code {worker.process.exitcode})")
+        worker.close()
+        self._workers[slot] = self._spawn(slot)
+        return self._workers[slot]
+
+    def _watch(self) -> None:
+        while not self._closed.wait(MONITOR_POLL_SECONDS):
+            with self._lock:
+                for slot, worker in self._workers.items():
+                    if slot not in self._busy and not worker.is_alive():
+                        self._replace(slot)
+
+    @property
+    def pids(self) -> list[int]:
+        with self._lock:
+            return [worker.process.pid for _, worker in sorted(self._workers.items())]
+
+    def solver(self) -> "RemoteSolver":
+        """
+        Returns a solver whose searches run in this pool.
+
+        :return: A ``CpSolver`` stand-in (see ``RemoteSolver``).
+        :rtype: RemoteSolver
+        """
+        return RemoteSolver(self)
+
+    def acquire(self) -> _Worker:
+        """Waits for an idle worker, replacing it first if it died while idle."""
+        slot = self._idle.get()
+        with self._lock:
+            if self._closed.is_set():
+                self._idle.put(slot)
+                raise SolverWorkerError("The solver pool is closed")
+            self._busy.add(slot)
+            worker = self._workers[slot]
+            if not worker.is_alive():
+                worker = self._replace(slot)
+        return worker
+
+    def release(self, worker: _Worker) -> None:
+        """Returns a worker to the pool, replacing it if it died."""
+        with self._lock:
+            self._busy.discard(worker.slot)
+            if self._closed.is_set():
+                worker.close()
+            elif not worker.is_alive():
+                self._replace(worker.slot)
+        self._idle.put(worker.slot)
+
+    def close(self) -> None:
+        """Stops the idle workers; busy workers stop when they are released."""
+        self._closed.set()
+        self._monitor.join()
+        with self._lock:
+            for slot, worker in self._workers.items():
+                if slot not in self._busy:
+                    worker.close()
+
+
+class RemoteSolution:
+    """
+    A solution reported by a pooled search, read like a CP-SAT solution callback.
+
+    :param response: The solver response holding the solution.
+    :type response: cp_model_pb2.CpSolverResponse
+    :param solver: The remote solver running the search.
+    :type solver: RemoteSolver
+    """
+
+    def __init__(self, response: cp_model_pb2.CpSolverResponse, solver: "RemoteSolver"):
+        self._response = response
+        self._solver = solver
+
+    def Value(self, expression) -> int:
+        return cp_model.evaluate_linear_expr(expression, self._response)
+
+    def ObjectiveValue(self) -> float:
+        return self._response.objective_value
+
+    def BestObjectiveBound(self) -> float:
+        return self._response.best_objective_bound
+
+    def WallTime(self) -> float:
+        return self._response.wall_time
+
+    def StopSearch(self) -> None:
+        self._solver.StopSearch()
+
+
+class RemoteSolver(RemoteSolution):
+    """
+    A ``CpSolver`` stand-in that runs ``Solve`` in a ``SolverPool`` worker.
+
+    The model is sent to the worker as a serialized ``CpModelProto`` with
+    ``parameters``. While the worker searches, each solution is handed to the
+    ``report`` method of the solution callback as a ``RemoteSolution``, and
+    ``StopSearch`` may be called from any thread. Once ``Solve`` returns, the
+    solver reads the final response like a ``CpSolver``.
+
+    Attributes:
+        parameters (SatParameters): Parameters of the next search.
+    """
+
+    def __init__(self, pool: SolverPool):
+        super().__init__(cp_model_pb2.CpSolverResponse(), self)
+        self.parameters = sat_parameters_pb2.SatParameters()
+        self._pool = pool
+        self._lock = threading.Lock()
+        self._worker: _Worker | None = None
+        self._task_id = 0
+        self._stop_requested = False
+
+    def _send_stop(self) -> None:
+        # Called with the lock held
+        try:
+            self._worker.task_conn.send((MSG_STOP, self._task_id))
+        except OSError:
+            pass
+
+    def StopSearch(self) -> None:
+        with self._lock:
+            self._stop_requested = True
+            if self._worker is not None:
+                self._send_stop()
+
+    def Solve(self, model: cp_model.CpModel, solution_callback=None) -> int:
+        """
+        Solves a model in a pool worker.
+
+        :param model: The model to solve.
+        :type model: cp_model.CpModel
+        :param solution_callback: Object whose ``report(solution)`` receives each solution.
+        :return: The solver status.
+        :rtype: int
+        :raises SolverWorkerError: If the worker died or failed during the search.
+        """
+        parameters = sat_parameters_pb2.SatParameters()
+        parameters.CopyFrom(self.parameters)
+        share = self._pool.cpus_per_process
+        if share > 0 and not 0 < parameters.num_search_workers <= share:
+            parameters.num_search_workers = share
+
+        worker = self._pool.acquire()
+        finished = False
+        try:
+            with self._lock:
+                self._worker = worker
+                self._task_id = worker.next_task_id()
+                task_id = self._task_id
+                worker.task_conn.send(
+                    (
+                        MSG_SOLVE,
+                        task_id,
+                        model.Proto().SerializeToString(),
+                        parameters.SerializeToString(),
+                        solution_callback is not None,
+                    )
+                )
+                if self._stop_requested:
+                    self._send_stop()
+            while True:
+                kind, message_task_id, payload = worker.receive()
+                if message_task_id != task_id:
+                    continue
+                if kind == MSG_SOLUTION:
+                    solution_callback.report(
+                        RemoteSolution(cp_model_pb2.CpSolverResponse.FromString(payload), self)
+                    )
+                elif kind == MSG_DONE:
+                    finished = True
+                    self._response = cp_model_pb2.CpSolverResponse.FromString(payload)
+                    return self._response.status
+                else:
+                    finished = True
+                    raise SolverWorkerError(payload)
+        finally:
+            if not finished and worker.is_alive():
+                # Drain the interrupted search so the next task starts on a clean pipe
+                with self._lock:
+                    self._send_stop()
+                try:
+                    while worker.receive()[:2] not in ((MSG_DONE, task_id), (MSG_ERROR, task_id)):
+                        pass
+                except SolverWorkerError:
+                    pass
+            with self._lock:
+                self._worker = None
+            self._pool.release(worker)
+
+    def StatusName(self, status: int | None = None) -> str:
+        return cp_model_pb2.CpSolverStatus.Name(
+            self._response.status if status is None else status
+        )
+
+    def NumConflicts(self) -> int:
+        return self._response.num_conflicts
+
+    def NumBranches(self) -> int:
+        return self._response.num_branches
+
+    def ResponseProto(self) -> cp_model_pb2.CpSolverResponse:
+        return self._response
+
+    def SufficientAssumptionsForInfeasibility(self) -> list[int]:
+        return list(self._response.sufficient_assumptions_for_infeasibility)
+
+
+def new_solver(solver_pool: SolverPool | None):
+    """
+    Returns a solver running in ``solver_pool``, or in the calling process without a pool.
+
+    :param solver_pool: Worker processes that run the searches, if any.
+    :type solver_pool: SolverPool | None
+    :return: A ``RemoteSolver``, or a ``cp_model.CpSolver`` without a pool.
+    """
+    return solver_pool.solver() if solver_pool is not None else cp_model.CpSolver()
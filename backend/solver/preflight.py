@@ -0,0 +1,238 @@
+from typing import List, Sequence
+
+import numpy as np
+
+from .availability import EXCLUSION, LEAVE, TRAINING, UNAVAILABLE
+from .context import SolverContext
+from .domain import WEEKLY_SHIFT_LIMITS, allowed_cell_mask, required_agents
+
+RULE_STAFFING = "staffing_requirements"
+RULE_FULL_WEEKENDS = "full_weekends"
+RULE_MIN_FREE_WEEKENDS = "min_free_weekends_per_horizon"
+RULE_WEEKLY_SHIFT_LIMITS = "weekly_shift_limits"
+RULE_MAX_WEEKLY_HOURS = "max_weekly_hours"
+RULE_AT_LEAST_ONE_SHIFT = "at_least_one_shift"
+
+PERSONAL_STATUSES = [LEAVE, UNAVAILABLE, TRAINING, EXCLUSION]
+
+
+def _issue(rule: str, required, available, days=(), agents=(), vacation=None) -> dict:
+    return {
+        "rule": rule,
+        "days": list(days),
+        "agents": list(agents),
+        "vacation": vacation,
+        "required": required,
+        "available": available,
+    }
+
+
+class _Preflight:
+    """Arrays shared by the checks, restricted to the planned days."""
+
+    def __init__(self, ctx: SolverContext):
+        offset = ctx.planned_day_offset
+        self.ctx = ctx
+        self.allowed = allowed_cell_mask(ctx)[:, offset:]
+        self.works = self.allowed.any(axis=2)
+        self.labels = ctx.calendar.labels[offset:]
+        self.names = [agent["name"] for agent in ctx.agents]
+        self.required = np.array(
+            [
+                [required_agents(ctx, day_idx, vacation) for vacation in ctx.vacations]
+                for day_idx in range(offset, len(ctx.calendar))
+            ],
+            dtype=np.int64,
+        ).reshape(len(self.labels), len(ctx.vacations))
+        self.durations = np.array(
+            [ctx.shift_durations[vacation] for vacation in ctx.vacations], dtype=np.int64
+        )
+        self.weeks = [np.array(week) - offset for week in ctx.calendar.weeks(offset)]
+        self.weekends = [
+            (saturday - offset, sunday - offset)
+            for saturday, sunday in ctx.calendar.weekend_pairs(offset)
+        ]
+
+    def absent_agents(self, day: int) -> List[str]:
+        """Returns the agents on leave, unavailable, in training or excluded on a planned day."""
+        statuses = self.ctx.availability.statuses[:, self.ctx.planned_day_offset + day]
+        absent = np.flatnonzero(statuses[:, PERSONAL_STATUSES].any(axis=1))
+        return [self.names[agent_idx] for agent_idx in absent]
+
+    def day_labels(self, days: Sequence[int]) -> List[str]:
+        return [self.labels[day] for day in days]
+
+
+def _check_staffing(check: _Preflight) -> List[dict]:
+    """Each day needs enough open agents per vacation, and in total since an agent works one shift a day."""
+    issues = []
+    open_agents = check.allowed.sum(axis=0)
+    short = check.required > open_agents
+    for day, vacation_idx in zip(*np.nonzero(short)):
+        issues.append(
+            _issue(
+                RULE_STAFFING,
+                int(check.required[day, vacation_idx]),
+                int(open_agents[day, vacation_idx]),
+                days=[check.labels[day]],
+                agents=check.absent_agents(day),
+                vacation=check.ctx.vacations[vacation_idx],
+            )
+        )
+
+    required = check.required.sum(axis=1)
+    working = check.works.sum(axis=0)
+    for day in np.flatnonzero((required > working) & ~short.any(axis=1)):
+        issues.append(
+            _issue(
+                RULE_STAFFING,
+                int(required[day]),
+                int(working[day]),
+                days=[check.labels[day]],
+                agents=check.absent_agents(day),
+            )
+        )
+    return issues
+
+
+def _check_full_weekends(check: _Preflight) -> List[dict]:
+    """Saturday workers also work Sunday, so each weekend's staffing needs agents open on both days."""
+    issues = []
+    for saturday, sunday in check.weekends:
+        required = int(check.required[[saturday, sunday]].sum(axis=1).max())
+        available = int((check.works[:, saturday] & check.works[:, sunday]).sum())
+        if required > available:
+            issues.append(
+                _issue(
+                    RULE_FULL_WEEKENDS,
+                    required,
+                    available,
+                    days=check.day_labels([saturday, sunday]),
+                    agents=sorted(
+                        set(check.absent_agents(saturday)) | set(check.absent_agents(sunday))
+                    ),
+                )
+            )
+    return issues
+
+
+def _check_min_free_weekends(check: _Preflight) -> List[dict]:
+    """Weekend staffing must fit in the weekends agents may still work once their free ones are kept."""
+    min_free_weekends = max(0, int(check.ctx.min_free_weekends_per_horizon))
+    if min_free_weekends == 0 or not check.weekends:
+        return []
+    saturdays = [saturday for saturday, _ in check.weekends]
+    sundays = [sunday for _, sunday in check.weekends]
+    required = int(check.required[saturdays].sum())
+    open_weekends = (check.works[:, saturdays] & check.works[:, sundays]).sum(axis=1)
+    max_worked_weekends = len(check.weekends) - min_free_weekends
+    if max_worked_weekends < 0:
+        # Reported like enforce_min_free_weekends_per_horizon does once the model is built
+        raise ValueError(
+            "solver.min_free_weekends_per_horizon is infeasible for this planning horizon: "
+            f"requested={min_free_weekends}, available_weekends={len(check.weekends)}"
+        )
+    available = int(np.minimum(open_weekends, max_worked_weekends).sum())
+    if required <= available:
+        return []
+    return [
+        _issue(
+            RULE_MIN_FREE_WEEKENDS,
+            required,
+            available,
+            days=check.day_labels([day for pair in check.weekends for day in pair]),
+        )
+    ]
+
+
+def _check_weekly_limits(check: _Preflight) -> List[dict]:
+    """Each week's shifts must fit in the weekly shift caps and ``max_weekly_hours`` of the open agents."""
+    ctx = check.ctx
+    issues = []
+    limits = [
+        (vacation_idx, WEEKLY_SHIFT_LIMITS[vacation])
+        for vacation_idx, vacation in enumerate(ctx.vacations)
+        if vacation in WEEKLY_SHIFT_LIMITS
+    ]
+    for week in check.weeks:
+        days = check.day_labels(week)
+        for vacation_idx, limit in limits:
+            required = int(check.required[week, vacation_idx].sum())
+            open_days = check.allowed[:, week, vacation_idx].sum(axis=1)
+            available = int(np.minimum(open_days, limit).sum())
+            if required > available:
+                issues.append(
+                    _issue(
+                        RULE_WEEKLY_SHIFT_LIMITS,
+                        required,
+                        available,
+                        days=days,
+                        vacation=ctx.vacations[vacation_idx],
+                    )
+                )
+
+        if ctx.elastic_max_weekly_hours:
+            continue
+        # The longest open shift of each day bounds the hours an agent can work
+        longest = np.where(check.allowed[:, week], check.durations, 0).max(axis=2).sum(axis=1)
+        required_hours = int((check.required[week] * check.durations).sum())
+        available_hours = int(np.minimum(longest, ctx.max_weekly_hours).sum())
+        if required_hours > available_hours:
+            issues.append(
+                _issue(
+                    RULE_MAX_WEEKLY_HOURS,
+                    required_hours / 10,
+                    available_hours / 10,
+                    days=days,
+                )
+            )
+    return issues
+
+
+def _check_agent_shifts(check: _Preflight) -> List[dict]:
+    """Every agent must work at least once, so each needs one open cell."""
+    idle = np.flatnonzero(~check.works.any(axis=1))
+    if len(idle) == 0:
+        return []
+    return [
+        _issue(
+            RULE_AT_LEAST_ONE_SHIFT,
+            1,
+            0,
+            days=[check.labels[0], check.labels[-1]],
+            agents=[check.names[agent_idx] for agent_idx in idle],
+        )
+    ]
+
+
+def check_feasibility(ctx: SolverContext) -> List[dict]:
+    """
+    Checks necessary conditions of feasibility before the model is built.
+
+    Each check compares what the rules require with what the open cells of the
+    domain pre-pass can offer at best, over NumPy arrays of the planned days:
+    daily staffing per vacation and in total, staffing of full weekends, weekends
+    left once ``min_free_weekends_per_horizon`` are kept free, weekly shift caps,
+    ``max_weekly_hours`` unless it is elastic, and the shift every agent must work. A
+    failed check proves the model infeasible; passing every check does not prove it
+    feasible.
+
+    Each issue names its "rule", the offending "days" (labels), "agents" (the
+    absent agents for staffing rules) and "vacation" when it applies, with the
+    "required" and "available" counts (hours for ``max_weekly_hours``).
+
+    :param ctx: The solver context, with its domain pre-pass computed.
+    :type ctx: SolverContext
+    :return: The failed checks, empty when none failed.
+    :rtype: List[dict]
+    """
+    if len(ctx.calendar) == ctx.planned_day_offset:
+        return []
+    check = _Preflight(ctx)
+    return (
+        _check_agent_shifts(check)
+        + _check_staffing(check)
+        + _check_full_weekends(check)
+        + _check_min_free_weekends(check)
+        + _check_weekly_limits(check)
+    )
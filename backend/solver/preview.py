@@ -0,0 +1,309 @@
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .calendar import SATURDAY
+from .constraints.soft import WEEKEND_FAIRNESS_SPREAD
+from .engine import prepare_context
+from .greedy import (
+    UNASSIGNED,
+    GreedyState,
+    construct_state,
+    order_equivalent_agents,
+    planning_from_assignments,
+)
+from .objective import WEIGHT_AVOID, WEIGHT_OTHER, WEIGHT_PREFERRED
+
+PREVIEW_STATUS = "PREVIEW"
+STOP_PREVIEW_TIME_LIMIT = "preview_max_seconds"
+STOP_LOCAL_OPTIMUM = "local_optimum"
+
+# Consecutive rejected moves after which the planning is taken as a local optimum
+MAX_STALE_MOVES = 2000
+
+Block = Tuple[int, ...]
+Change = Tuple[List[Tuple[int, int, int]], List[Tuple[int, int]]]
+
+
+class _LocalSearch:
+    """
+    Hill climbing over shift moves between agents, on top of a greedy planning.
+
+    A move either transfers the shifts of a block (a weekday, or a Saturday and its
+    Sunday) from an agent to one free on it, or exchanges the shifts two agents work
+    on a block. Each new shift is checked with ``GreedyState.receivers``, so moves
+    keep the hard rules the constructor enforces, and every agent keeps a shift.
+
+    Plannings are ranked by their excess over ``global_max_gap`` and ``period_max_gap``
+    first, then by the objective of ``objective.py``: preference weights, minus the
+    weekend fairness term and the weighted period gaps when they are optimized. With
+    ``solver.elastic_gaps``, the excess is a weighted penalty of the objective instead.
+    """
+
+    def __init__(self, state: GreedyState, seed: int):
+        ctx = state.ctx
+        self.state = state
+        self.ctx = ctx
+        self.rng = np.random.default_rng(seed)
+
+        agent_count, vacation_count = state.preference.shape
+        self.values = np.full((agent_count, vacation_count), WEIGHT_OTHER, dtype=np.int64)
+        for agent in ctx.compiled_config.agents:
+            for vacation_idx in range(vacation_count):
+                if agent.preferred_mask >> vacation_idx & 1:
+                    self.values[agent.index, vacation_idx] = WEIGHT_PREFERRED
+                if agent.avoid_mask >> vacation_idx & 1:
+                    self.values[agent.index, vacation_idx] += WEIGHT_AVOID
+
+        planned_days = range(ctx.planned_day_offset, len(ctx.calendar))
+        weekend_pairs = ctx.calendar.weekend_pairs(ctx.planned_day_offset)
+        paired_days = {day_idx for pair in weekend_pairs for day_idx in pair}
+        self.blocks: List[Block] = [
+            (day_idx,) for day_idx in planned_days if day_idx not in paired_days
+        ] + list(weekend_pairs)
+        total_weekends = sum(
+            1 for day_idx in planned_days if ctx.calendar[day_idx].weekday == SATURDAY
+        )
+        self.weekend_target = total_weekends // len(ctx.agents)
+
+        planned = state.assignments[:, ctx.planned_day_offset:]
+        worked = planned != UNASSIGNED
+        self.shift_counts = worked.sum(axis=1)
+        agent_rows = np.broadcast_to(np.arange(agent_count)[:, None], planned.shape)
+        self.preference_value = int(self.values[agent_rows[worked], planned[worked]].sum())
+
+    def score(self) -> Tuple[int, int]:
+        """Returns the balance excess, in tenths of hours, and the objective of the planning."""
+        ctx = self.ctx
+        state = self.state
+        period_gaps = np.ptp(state.period_hours, axis=0)
+        global_excess = max(0, int(np.ptp(state.paid_hours)) - ctx.global_max_gap)
+        period_excess = int(np.maximum(period_gaps - ctx.period_max_gap, 0).sum())
+
+        worked_weekends = state.worked_weekends
+        if ctx.weekend_fairness_mode == WEEKEND_FAIRNESS_SPREAD:
+            weekend_penalty = int(np.ptp(worked_weekends))
+        else:
+            weekend_penalty = int(((worked_weekends - self.weekend_target) ** 2).sum())
+        objective = self.preference_value - weekend_penalty
+        if ctx.optimize_period_balance:
+            objective -= ctx.period_balance_weight * int(period_gaps.sum())
+        if ctx.elastic_gaps:
+            # Elastic gaps are penalized like in objective.py instead of ranked first
+            objective -= ctx.global_gap_excess_weight * global_excess
+            objective -= ctx.period_gap_excess_weight * period_excess
+            return 0, objective
+        return global_excess + period_excess, objective
+
+    def run(self, deadline: float) -> Tuple[int, str]:
+        """
+        Applies improving moves until ``deadline`` or a local optimum.
+
+        :param deadline: The ``time.perf_counter`` value at which the search stops.
+        :type deadline: float
+        :return: The number of accepted moves and the rule that stopped the search.
+        :rtype: Tuple[int, str]
+        """
+        moves = (self._transfer, self._exchange)
+        current = self.score()
+        accepted = 0
+        stale = 0
+        while stale < MAX_STALE_MOVES:
+            if time.perf_counter() >= deadline:
+                return accepted, STOP_PREVIEW_TIME_LIMIT
+            change = moves[self.rng.integers(len(moves))]()
+            if change is None:
+                stale += 1
+                continue
+            excess, objective = self.score()
+            if excess < current[0] or (excess == current[0] and objective > current[1]):
+                current = (excess, objective)
+                accepted += 1
+                stale = 0
+            else:
+                self._undo(*change)
+                stale += 1
+        return accepted, STOP_LOCAL_OPTIMUM
+
+    def _transfer(self) -> Change | None:
+        state = self.state
+        block = self.blocks[self.rng.integers(len(self.blocks))]
+        shifts = state.assignments[:, block]
+        workers = np.flatnonzero((shifts != UNASSIGNED).all(axis=1))
+        if len(workers) == 0:
+            return None
+        giver = int(workers[self.rng.integers(len(workers))])
+        if self.shift_counts[giver] <= len(block):
+            return None
+
+        vacations = [int(vacation_idx) for vacation_idx in shifts[giver]]
+        removed = self._remove([giver], block)
+        receivers = state.receivers(block[0], vacations[0])
+        receivers &= (state.assignments[:, block] == UNASSIGNED).all(axis=1)
+        receivers[giver] = False
+        candidates = np.flatnonzero(receivers)
+        if len(candidates) == 0:
+            self._undo(removed, [])
+            return None
+        gains = self.values[candidates[:, None], vacations].sum(axis=1)
+        # Among the best-preferred receivers, the least paid one balances hours
+        receiver = int(candidates[np.lexsort((state.paid_hours[candidates], -gains))[0]])
+        additions = [
+            (receiver, day_idx, vacation_idx) for day_idx, vacation_idx in zip(block, vacations)
+        ]
+        return self._add(removed, additions)
+
+    def _exchange(self) -> Change | None:
+        state = self.state
+        block = self.blocks[self.rng.integers(len(self.blocks))]
+        shifts = state.assignments[:, block]
+        workers = np.flatnonzero((shifts != UNASSIGNED).all(axis=1))
+        if len(workers) < 2:
+            return None
+        agent = int(workers[self.rng.integers(len(workers))])
+        partners = workers[(shifts[workers] != shifts[agent]).any(axis=1)]
+        if len(partners) == 0:
+            return None
+
+        agent_shifts = shifts[agent]
+        partner_shifts = shifts[partners]
+        gains = (
+            self.values[agent, partner_shifts].sum(axis=1)
+            + self.values[partners[:, None], agent_shifts].sum(axis=1)
+            - self.values[agent, agent_shifts].sum()
+            - self.values[partners[:, None], partner_shifts].sum(axis=1)
+        )
+        # Exchanging shifts of the same durations only changes the preference weights
+        hours_change = (
+            state.durations[partner_shifts].sum(axis=1) != state.durations[agent_shifts].sum()
+        )
+        eligible = np.flatnonzero((gains > 0) | hours_change)
+        if len(eligible) == 0:
+            return None
+        best = eligible[gains[eligible] == gains[eligible].max()]
+        partner = int(partners[best[self.rng.integers(len(best))]])
+
+        removed = self._remove([agent, partner], block)
+        additions = []
+        for offset, day_idx in enumerate(block):
+            additions.append((agent, day_idx, int(shifts[partner, offset])))
+            additions.append((partner, day_idx, int(agent_shifts[offset])))
+        return self._add(removed, additions)
+
+    def _remove(self, agents: List[int], block: Block) -> List[Tuple[int, int, int]]:
+        removed = []
+        for agent_idx in agents:
+            for day_idx in block:
+                vacation_idx = int(self.state.assignments[agent_idx, day_idx])
+                removed.append((agent_idx, day_idx, vacation_idx))
+                self._clear(agent_idx, day_idx)
+        return removed
+
+    def _add(self, removed, additions) -> Change | None:
+        """Assigns new shifts in day order, or undoes the move when one breaks a hard rule."""
+        added = []
+        for agent_idx, day_idx, vacation_idx in additions:
+            if not self.state.receivers(day_idx, vacation_idx)[agent_idx]:
+                self._undo(removed, added)
+                return None
+            self._set(agent_idx, day_idx, vacation_idx)
+            added.append((agent_idx, day_idx))
+        return removed, added
+
+    def _undo(self, removed, added) -> None:
+        for agent_idx, day_idx in reversed(added):
+            self._clear(agent_idx, day_idx)
+        for agent_idx, day_idx, vacation_idx in removed:
+            self._set(agent_idx, day_idx, vacation_idx)
+
+    def _set(self, agent_idx: int, day_idx: int, vacation_idx: int) -> None:
+        self.state.assign(agent_idx, day_idx, vacation_idx)
+        self.shift_counts[agent_idx] += 1
+        self.preference_value += int(self.values[agent_idx, vacation_idx])
+
+    def _clear(self, agent_idx: int, day_idx: int) -> None:
+        vacation_idx = self.state.assignments[agent_idx, day_idx]
+        self.state.unassign(agent_idx, day_idx)
+        self.shift_counts[agent_idx] -= 1
+        self.preference_value -= int(self.values[agent_idx, vacation_idx])
+
+
+def preview_planning(
+    agents,
+    vacations,
+    week_schedule,
+    dayOff,
+    previous_week_schedule,
+    initial_shifts,
+    runtime_config,
+    planning_start_date=None,
+    calendar=None,
+    availability=None,
+    compiled_config=None,
+    on_finish=None,
+    seed: int = 0,
+) -> Dict[str, List[Tuple[str, str]]]:
+    """
+    Builds an approximate planning without CP-SAT, in a fraction of a second.
+
+    The planning of ``construct_planning`` is improved by a local search (see
+    ``_LocalSearch``) until ``solver.preview_max_seconds`` or a local optimum. It keeps
+    the hard rules the constructor checks but is not optimal, and staffing slots the
+    constructor left empty stay empty. Arguments are those of ``generate_planning``.
+
+    :param on_finish: Called once with the "status" (``PREVIEW_STATUS``), "stop_reason", approximate "objective", "best_bound" (always None) and "elapsed" time, the "unfilled" slots, the accepted "moves" and whether the planning is "feasible": fully staffed, balanced within the gaps and with a shift for every agent.
+    :type on_finish: Callable[[dict], None] | None
+    :param seed: Seed of the random move selection, so a preview is reproducible.
+    :type seed: int
+    :return: The planning of each agent, in the format returned by ``generate_planning``.
+    :rtype: Dict[str, List[Tuple[str, str]]]
+    """
+    started = time.perf_counter()
+    ctx = prepare_context(
+        agents,
+        vacations,
+        week_schedule,
+        dayOff,
+        previous_week_schedule,
+        initial_shifts,
+        runtime_config,
+        planning_start_date,
+        calendar,
+        availability,
+        compiled_config,
+    )
+    state, unfilled = construct_state(ctx)
+    search = _LocalSearch(state, seed)
+    moves, stop_reason = search.run(started + ctx.preview_max_seconds)
+    excess, objective = search.score()
+    elapsed = time.perf_counter() - started
+
+    assignments = state.assignments
+    if ctx.symmetry_breaking:
+        assignments = order_equivalent_agents(ctx, assignments)
+
+    print(
+        "Preview :",
+        f"{moves} moves",
+        "     objective :",
+        objective,
+        "     execution time :",
+        f"{elapsed:.4f} seconds",
+        "     stop reason :",
+        stop_reason,
+    )
+    if on_finish is not None:
+        on_finish(
+            {
+                "status": PREVIEW_STATUS,
+                "stop_reason": stop_reason,
+                "objective": objective,
+                "best_bound": None,
+                "elapsed": elapsed,
+                "unfilled": unfilled,
+                "moves": moves,
+                "feasible": unfilled == 0 and excess == 0 and bool((search.shift_counts > 0).all()),
+            }
+        )
+    return planning_from_assignments(ctx, assignments)
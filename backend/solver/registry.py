@@ -1,8 +1,11 @@
 from dataclasses import dataclass, field
-from typing import Callable, List
+from typing import TYPE_CHECKING, Callable, List
 
 from .context import SolverContext
 
+if TYPE_CHECKING:
+    from .diagnosis import RuleLiterals
+
 ConstraintFn = Callable[[SolverContext], None]
 
 
@@ -30,6 +33,7 @@ class ConstraintRegistry:
         apply_hard: Apply all registered hard constraints to a solver context.
         apply_soft: Apply all registered soft constraints to a solver context.
         apply_mixed: Apply all registered mixed constraints to a solver context.
+        apply_enforced: Apply all registered constraints, each under its enforcement literals.
     """
     hard: List[ConstraintFn] = field(default_factory=list)
     soft: List[ConstraintFn] = field(default_factory=list)
@@ -55,3 +59,7 @@ class ConstraintRegistry:
     def apply_mixed(self, ctx: SolverContext) -> None:
         for constraint in self.mixed:
             constraint(ctx)
+
+    def apply_enforced(self, ctx: SolverContext, rules: "RuleLiterals") -> None:
+        for constraint in self.hard + self.soft + self.mixed:
+            rules.apply(ctx, constraint)
@@ -0,0 +1,165 @@
+import threading
+import time
+
+from ortools.sat.python import cp_model
+
+STOP_OPTIMAL = "optimal"
+STOP_GAP_LIMIT = "relative_gap_limit"
+STOP_INFEASIBLE = "infeasible"
+STOP_TIME_LIMIT = "max_time_seconds"
+STOP_STAGNATION = "stagnation"
+STOP_AFTER_FIRST_SOLUTION = "max_seconds_after_first_solution"
+STOP_CANCELLED = "cancelled"
+STOP_PREFLIGHT = "preflight"
+
+WATCHDOG_POLL_SECONDS = 0.1
+
+
+class SearchWatchdog:
+    """
+    Stops a CP-SAT search once its objective stagnates or its post-solution budget is spent.
+
+    The solution callback reports each solution with ``record_solution``. A background
+    thread then stops the search when either rule fires:
+    - stagnation: the objective has not improved (in the direction of ``maximize``)
+      by more than ``min_improvement`` during the last ``stagnation_seconds``;
+    - deadline: ``max_seconds_after_first_solution`` have passed since the first
+      solution.
+
+    Neither rule fires before the first solution; ``max_time_seconds`` still bounds
+    the search until then. A rule set to 0 is disabled.
+
+    Attributes:
+        stagnation_seconds (float): Window without improvement that stops the search.
+        min_improvement (float): Objective gain below which a solution is not an improvement.
+        max_seconds_after_first_solution (float): Search time allowed after the first solution.
+        maximize (bool): Whether the objective is maximized.
+        stop_reason (str | None): The rule that stopped the search, if any.
+    """
+
+    def __init__(
+        self,
+        solver: cp_model.CpSolver,
+        stagnation_seconds: float = 0,
+        min_improvement: float = 0,
+        max_seconds_after_first_solution: float = 0,
+        maximize: bool = False,
+    ):
+        self.stagnation_seconds = stagnation_seconds
+        self.min_improvement = min_improvement
+        self.max_seconds_after_first_solution = max_seconds_after_first_solution
+        self.maximize = maximize
+        self.stop_reason: str | None = None
+        self._solver = solver
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._best_objective: float | None = None
+        self._first_solution_at: float | None = None
+        self._last_improvement_at: float | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.stagnation_seconds > 0 or self.max_seconds_after_first_solution > 0
+
+    def __enter__(self):
+        if self.enabled:
+            self._thread = threading.Thread(
+                target=self._watch, name="search-watchdog", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._done.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def record_solution(self, objective: float) -> None:
+        """
+        Records a solution found by the search.
+
+        :param objective: The objective value of the solution.
+        :type objective: float
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._first_solution_at is None:
+                self._first_solution_at = now
+            if self._best_objective is None:
+                improvement = None
+            elif self.maximize:
+                improvement = objective - self._best_objective
+            else:
+                improvement = self._best_objective - objective
+            if improvement is None or improvement > self.min_improvement:
+                self._best_objective = objective
+                self._last_improvement_at = now
+
+    def check(self, now: float | None = None) -> str | None:
+        """
+        Returns the rule that requires the search to stop, if any.
+
+        :param now: The current ``time.monotonic()`` value, read when None.
+        :type now: float | None
+        :return: ``STOP_STAGNATION``, ``STOP_AFTER_FIRST_SOLUTION`` or None.
+        :rtype: str | None
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._first_solution_at is None:
+                return None
+            if (
+                self.max_seconds_after_first_solution > 0
+                and now - self._first_solution_at >= self.max_seconds_after_first_solution
+            ):
+                return STOP_AFTER_FIRST_SOLUTION
+            if (
+                self.stagnation_seconds > 0
+                and now - self._last_improvement_at >= self.stagnation_seconds
+            ):
+                return STOP_STAGNATION
+        return None
+
+    def _watch(self) -> None:
+        while not self._done.wait(WATCHDOG_POLL_SECONDS):
+            stop_reason = self.check()
+            if stop_reason is None:
+                continue
+            if self.stop_reason is None:
+                self.stop_reason = stop_reason
+            # StopSearch is ignored until Solve is running, so keep asking
+            self._solver.StopSearch()
+
+
+def resolve_stop_reason(
+    status: int,
+    solver: cp_model.CpSolver,
+    watchdog: SearchWatchdog | None = None,
+    cancelled: bool = False,
+) -> str:
+    """
+    Names the rule that ended a search.
+
+    :param status: The status returned by ``CpSolver.Solve``.
+    :type status: int
+    :param solver: The solver that ran the search.
+    :type solver: cp_model.CpSolver
+    :param watchdog: The watchdog of the search, if any.
+    :type watchdog: SearchWatchdog | None
+    :param cancelled: Whether the request was cancelled.
+    :type cancelled: bool
+    :return: One of the ``STOP_*`` constants.
+    :rtype: str
+    """
+    if status == cp_model.INFEASIBLE:
+        return STOP_INFEASIBLE
+    if status == cp_model.OPTIMAL:
+        if solver.ObjectiveValue() != solver.BestObjectiveBound():
+            return STOP_GAP_LIMIT
+        return STOP_OPTIMAL
+    if cancelled:
+        return STOP_CANCELLED
+    if watchdog is not None and watchdog.stop_reason is not None:
+        return watchdog.stop_reason
+    return STOP_TIME_LIMIT
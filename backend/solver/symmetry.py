@@ -0,0 +1,118 @@
+from typing import Dict, List, Tuple
+
+from .context import SolverContext
+from .domain import is_fixed
+
+
+def _agent_signature(ctx: SolverContext, agent_idx: int) -> Tuple:
+    """
+    Returns everything that distinguishes an agent in the model.
+
+    Two agents with the same signature have the same preferences, restrictions,
+    personal dates and initial shifts, so every constraint and objective term treats
+    them alike and their planning rows can be swapped in any solution.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :param agent_idx: The index of the agent.
+    :type agent_idx: int
+    :return: A hashable signature.
+    :rtype: Tuple
+    """
+    agent = ctx.compiled_config.agents[agent_idx]
+    initial_shifts = ctx.initial_shifts.get(agent.name) or []
+    return (
+        agent.preferred_mask,
+        agent.avoid_mask,
+        agent.restriction_mask,
+        agent.unavailable,
+        agent.training,
+        agent.exclusion,
+        agent.leave_periods,
+        tuple(sorted(tuple(shift) for shift in initial_shifts)),
+    )
+
+
+def agent_equivalence_classes(ctx: SolverContext) -> List[List[int]]:
+    """
+    Groups interchangeable agents into equivalence classes.
+
+    Only classes with at least two agents are returned, each sorted by agent index.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :return: The agent indices of each equivalence class.
+    :rtype: List[List[int]]
+    """
+    classes: Dict[Tuple, List[int]] = {}
+    for agent_idx in range(len(ctx.agents)):
+        classes.setdefault(_agent_signature(ctx, agent_idx), []).append(agent_idx)
+    return [members for members in classes.values() if len(members) > 1]
+
+
+def _add_lex_greater_or_equal(ctx: SolverContext, row, other_row, name: str) -> None:
+    """
+    Requires a Boolean row to be lexicographically greater than or equal to another.
+
+    ``prefix_equal[i]`` is forced true while both rows are equal before position ``i``;
+    while it holds, ``row[i] >= other_row[i]``. Everything is encoded with clauses.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :param row: The Boolean variables of the greater row.
+    :param other_row: The Boolean variables of the smaller row, aligned with ``row``.
+    :param name: The prefix of the auxiliary variable names.
+    :type name: str
+    """
+    model = ctx.model
+    prefix_equal = None
+    for position, (cell, other_cell) in enumerate(zip(row, other_row)):
+        enforcement = [] if prefix_equal is None else [prefix_equal]
+        model.AddBoolOr([cell, other_cell.Not()]).OnlyEnforceIf(enforcement)
+        if position == len(row) - 1:
+            break
+
+        next_prefix_equal = model.NewBoolVar(f"{name}_prefix_equal_{position + 1}")
+        model.AddBoolOr([cell.Not(), other_cell.Not(), next_prefix_equal]).OnlyEnforceIf(
+            enforcement
+        )
+        model.AddBoolOr([cell, other_cell, next_prefix_equal]).OnlyEnforceIf(enforcement)
+        prefix_equal = next_prefix_equal
+
+
+def break_agent_symmetry(ctx: SolverContext) -> List[List[int]]:
+    """
+    Adds lexicographic symmetry-breaking constraints between interchangeable agents.
+
+    Within each equivalence class, the planned row of each agent must be
+    lexicographically greater than or equal to the row of the next agent. Any solution
+    can be turned into one satisfying this order by swapping the rows of equivalent
+    agents, so no schedule is lost, but the search no longer explores their permutations.
+    Only the cells that are solver variables for every agent of the class are compared.
+
+    :param ctx: The solver context containing the problem data and the model.
+    :type ctx: SolverContext
+    :return: The equivalence classes that received ordering constraints.
+    :rtype: List[List[int]]
+    """
+    planning = ctx.planning
+    classes = agent_equivalence_classes(ctx)
+    for members in classes:
+        rows = [planning.agent_slice(agent_idx, ctx.planned_day_offset) for agent_idx in members]
+        positions = [
+            position
+            for position in range(len(rows[0]))
+            if not any(is_fixed(row[position]) for row in rows)
+        ]
+        if not positions:
+            continue
+        for agent_idx, next_agent_idx, row, next_row in zip(
+            members, members[1:], rows, rows[1:]
+        ):
+            _add_lex_greater_or_equal(
+                ctx,
+                [row[position] for position in positions],
+                [next_row[position] for position in positions],
+                f"symmetry_{planning.agents[agent_idx]}_{planning.agents[next_agent_idx]}",
+            )
+    return classes
@@ -0,0 +1,149 @@
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from ortools.sat.python import cp_model
+
+Cell = Tuple[str, str, str]
+CellValue = cp_model.IntVar | int
+
+
+class PlanningTensor:
+    """
+    Integer-indexed, array-backed store of planning cells.
+
+    Agents, days and vacations are mapped once to dense integer indices and the
+    cells (BoolVars or integer constants) are stored in a flat list laid out as
+    ``[agent][day][vacation]``. Constraint code can use the integer accessors and
+    slices, while ``tensor[(agent_name, day, vacation)]`` keeps the historical
+    dict-style access working.
+
+    Attributes:
+        agents (List[str]): Agent names, in index order.
+        days (List[str]): Day labels, in index order.
+        vacations (List[str]): Vacation names, in index order.
+        agent_index (Dict[str, int]): Agent name to agent index.
+        day_index (Dict[str, int]): Day label to day index.
+        vacation_index (Dict[str, int]): Vacation name to vacation index.
+        cells (List[CellValue]): Flat cell storage.
+    """
+
+    __slots__ = (
+        "agents",
+        "days",
+        "vacations",
+        "agent_index",
+        "day_index",
+        "vacation_index",
+        "cells",
+        "_agent_stride",
+        "_day_stride",
+    )
+
+    def __init__(
+        self,
+        agents: Sequence[str],
+        days: Sequence[str],
+        vacations: Sequence[str],
+        fill: CellValue = 0,
+    ):
+        self.agents = list(agents)
+        self.days = list(days)
+        self.vacations = list(vacations)
+        self.agent_index: Dict[str, int] = {name: idx for idx, name in enumerate(self.agents)}
+        self.day_index: Dict[str, int] = {day: idx for idx, day in enumerate(self.days)}
+        self.vacation_index: Dict[str, int] = {
+            vacation: idx for idx, vacation in enumerate(self.vacations)
+        }
+        self._day_stride = len(self.vacations)
+        self._agent_stride = len(self.days) * self._day_stride
+        self.cells: List[CellValue] = [fill] * (len(self.agents) * self._agent_stride)
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return len(self.agents), len(self.days), len(self.vacations)
+
+    def flat_index(self, agent_idx: int, day_idx: int, vacation_idx: int) -> int:
+        return agent_idx * self._agent_stride + day_idx * self._day_stride + vacation_idx
+
+    def key_index(self, key: Cell) -> int:
+        agent_name, day, vacation = key
+        return self.flat_index(
+            self.agent_index[agent_name], self.day_index[day], self.vacation_index[vacation]
+        )
+
+    def at(self, agent_idx: int, day_idx: int, vacation_idx: int) -> CellValue:
+        return self.cells[self.flat_index(agent_idx, day_idx, vacation_idx)]
+
+    def set_at(self, agent_idx: int, day_idx: int, vacation_idx: int, value: CellValue) -> None:
+        self.cells[self.flat_index(agent_idx, day_idx, vacation_idx)] = value
+
+    def day_cells(self, agent_idx: int, day_idx: int) -> List[CellValue]:
+        """Returns the cells of every vacation for one agent and one day."""
+        start = self.flat_index(agent_idx, day_idx, 0)
+        return self.cells[start:start + self._day_stride]
+
+    def agent_slice(self, agent_idx: int, start: int = 0, stop: int | None = None) -> List[CellValue]:
+        """Returns the cells of one agent over a day range, ordered by day then vacation."""
+        stop = len(self.days) if stop is None else stop
+        begin = self.flat_index(agent_idx, start, 0)
+        end = self.flat_index(agent_idx, stop, 0)
+        return self.cells[begin:end]
+
+    def day_slice(self, start: int, stop: int | None = None) -> List[CellValue]:
+        """Returns the cells of every agent over a day range."""
+        stop = start + 1 if stop is None else stop
+        result = []
+        for agent_idx in range(len(self.agents)):
+            result.extend(self.agent_slice(agent_idx, start, stop))
+        return result
+
+    def vacation_slice(
+        self, vacation_idx: int, start: int = 0, stop: int | None = None
+    ) -> List[CellValue]:
+        """Returns the cells of one vacation over a day range, ordered by agent then day."""
+        stop = len(self.days) if stop is None else stop
+        result = []
+        for agent_idx in range(len(self.agents)):
+            begin = self.flat_index(agent_idx, start, vacation_idx)
+            end = self.flat_index(agent_idx, stop, vacation_idx)
+            result.extend(self.cells[begin:end:self._day_stride])
+        return result
+
+    def column(self, day_idx: int, vacation_idx: int) -> List[CellValue]:
+        """Returns the cells of one vacation on one day, one per agent."""
+        offset = day_idx * self._day_stride + vacation_idx
+        return self.cells[offset::self._agent_stride] if self._agent_stride else []
+
+    # Dict-style compatibility accessors for constraint code keyed by labels.
+
+    def __getitem__(self, key: Cell) -> CellValue:
+        return self.cells[self.key_index(key)]
+
+    def __setitem__(self, key: Cell, value: CellValue) -> None:
+        self.cells[self.key_index(key)] = value
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, tuple) or len(key) != 3:
+            return False
+        agent_name, day, vacation = key
+        return (
+            agent_name in self.agent_index
+            and day in self.day_index
+            and vacation in self.vacation_index
+        )
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def keys(self) -> Iterator[Cell]:
+        for agent_name in self.agents:
+            for day in self.days:
+                for vacation in self.vacations:
+                    yield (agent_name, day, vacation)
+
+    __iter__ = keys
+
+    def values(self) -> List[CellValue]:
+        return self.cells
+
+    def items(self) -> Iterator[Tuple[Cell, CellValue]]:
+        return zip(self.keys(), self.cells)
@@ -1,73 +1,31 @@
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
 
+FRENCH_WEEKDAY_ABBREVIATIONS = ["Lun", "Mar", "Mer", "Jeu", "Ven", "Sam", "Dim"]
 
-def split_into_weeks(week_schedule):
-    """
-    Splits a list of days into separate weeks.
-
-    This function takes a list of days in the format "Day. dd-mm" and splits it into
-    separate lists, each representing a week. The splitting is done based on the day of
-    the week, with each week ending on Sunday and starting on Monday.
-
-    :param week_schedule: A list of days in the format "Day. dd-mm".
-    :type week_schedule: list[str]
-    :return: A list of lists, each representing a week
-    :rtype: list[list[str]]
-    """
-    weeks = []
-    current_week = []
 
-    for day in week_schedule:
-        current_week.append(day)
-        day_name = day.split(" ")[0]
-        if day_name == "Dim." or day == week_schedule[-1]:
-            weeks.append(current_week)
-            current_week = []
-
-    return weeks
-
-
-def split_by_month_or_period(week_schedule):
+@lru_cache(maxsize=4096)
+def parse_agent_date(date_full: str) -> date:
     """
-    Splits a list of days into separate periods based on the month.
+    Parses an agent date from the configuration.
 
-    This function takes a list of days in the format "Day. dd-mm" and splits it into
-    separate lists, each representing a period. The splitting is done based on the month,
-    with each period containing all the days of a single month.
+    Results are cached, as the same dates are shared by many agents and requests.
 
-    :param week_schedule: A list of days in the format "Day. dd-mm"
-    :type week_schedule: list[str]
-    :return: A list of lists, each representing a period
-    :rtype: list[list[str]]
+    :param date_full: A date string in the format "dd-mm-yyyy"
+    :type date_full: str
+    :return: The parsed date
+    :rtype: date
     """
-    periods = []
-    current_period = []
-    previous_month = None
-
-    for day in week_schedule:
-        current_month = day.split(" ")[1].split("-")[1]
-        if previous_month and current_month != previous_month:
-            periods.append(current_period)
-            current_period = []
-        current_period.append(day)
-        previous_month = current_month
-
-    if current_period:
-        periods.append(current_period)
-
-    return periods
+    return datetime.strptime(date_full, "%d-%m-%Y").date()
 
 
-def day_token(date_full: str) -> str:
+def weekday_index(day: str) -> int:
     """
-    Returns a shortened version of the given date string.
+    Returns the weekday index (Monday is 0) of a day label.
 
-    The shortened version is in the format "dd-mm" and is obtained by parsing the given
-    date string in the format "dd-mm-yyyy" and reformatting it.
-
-    :param date_full: A date string in the format "dd-mm-yyyy"
-    :type date_full: str
-    :return: A shortened version of the given date string
-    :rtype: str
+    :param day: A day label in the format "Day. dd-mm".
+    :type day: str
+    :return: The weekday index, from 0 (Monday) to 6 (Sunday).
+    :rtype: int
     """
-    return datetime.strptime(date_full, "%d-%m-%Y").strftime("%d-%m")
+    return FRENCH_WEEKDAY_ABBREVIATIONS.index(day.split(" ")[0].rstrip("."))
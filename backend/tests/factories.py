@@ -0,0 +1,119 @@
+"""Runtime configs and planning arguments shared by the solver test modules."""
+
+from app import get_week_schedule
+
+
+def build_runtime_config(vacations, vacation_durations, staffing_requirements=None):
+    """Three agents preferring the first vacation, with default solver settings."""
+    return {
+        "agents": [
+            {
+                "name": "Agent1",
+                "preferences": {"preferred": [vacations[0]], "avoid": []},
+                "restriction": [],
+                "unavailable": [],
+                "training": [],
+                "exclusion": [],
+                "vacations": [],
+            },
+            {
+                "name": "Agent2",
+                "preferences": {"preferred": [vacations[0]], "avoid": []},
+                "restriction": [],
+                "unavailable": [],
+                "training": [],
+                "exclusion": [],
+                "vacations": [],
+            },
+            {
+                "name": "Agent3",
+                "preferences": {"preferred": [vacations[0]], "avoid": []},
+                "restriction": [],
+                "unavailable": [],
+                "training": [],
+                "exclusion": [],
+                "vacations": [],
+            },
+        ],
+        "vacations": vacations,
+        "vacation_durations": vacation_durations,
+        "staffing_requirements": staffing_requirements or {},
+        "holidays": [],
+        "solver": {
+            "max_time_seconds": 30,
+            "relative_gap_limit": 0.1,
+            "num_search_workers": 0,
+            "global_max_gap": 240,
+            "period_max_gap": 240,
+            "optimize_period_balance": False,
+            "period_balance_weight": 2,
+            "min_free_weekends_per_horizon": 0,
+        },
+    }
+
+
+TEAM_VACATIONS = ["Jour", "Nuit", "CDP"]
+
+
+def team_config(agent_count, staffing):
+    """A team covering "Jour", "Nuit" and "CDP", with a leave, a training and a restriction."""
+    agents = [
+        {
+            "name": f"Agent{idx + 1}",
+            "preferences": {"preferred": [TEAM_VACATIONS[idx % 3]], "avoid": [TEAM_VACATIONS[(idx + 1) % 3]]},
+            "restriction": [],
+            "unavailable": [],
+            "training": [],
+            "exclusion": [],
+            "vacations": [],
+        }
+        for idx in range(agent_count)
+    ]
+    agents[0]["vacations"] = [{"start": "09-02-2026", "end": "15-02-2026"}]
+    agents[1]["training"] = ["11-02-2026"]
+    agents[2]["restriction"] = ["Nuit"]
+    return {
+        "agents": agents,
+        "vacations": TEAM_VACATIONS,
+        "vacation_durations": {"Jour": 12, "Nuit": 12, "CDP": 5.5, "Conge": 7},
+        "staffing_requirements": {vacation: staffing for vacation in TEAM_VACATIONS},
+        "holidays": [],
+        "solver": {"max_time_seconds": 30, "relative_gap_limit": 0.1},
+    }
+
+
+def team_planning_kwargs(runtime_config):
+    """Arguments of ``generate_planning`` for ``team_config`` over February 2026."""
+    return {
+        "agents": runtime_config["agents"],
+        "vacations": TEAM_VACATIONS,
+        "week_schedule": get_week_schedule("2026-02-02", "2026-03-01"),
+        "dayOff": {},
+        "previous_week_schedule": get_week_schedule("2026-01-26", "2026-02-01"),
+        "initial_shifts": {},
+        "runtime_config": runtime_config,
+        "planning_start_date": "2026-02-02",
+    }
+
+
+def jour_config(staffing=1):
+    """Three agents covering a single "Jour" vacation."""
+    return build_runtime_config(
+        vacations=["Jour"],
+        vacation_durations={"Jour": 12, "Conge": 7},
+        staffing_requirements={"Jour": staffing},
+    )
+
+
+def jour_planning_kwargs(runtime_config, end_date):
+    """Arguments of ``generate_planning`` for ``jour_config`` from Monday 5 January 2026."""
+    return {
+        "agents": runtime_config["agents"],
+        "vacations": ["Jour"],
+        "week_schedule": get_week_schedule("2026-01-05", end_date),
+        "dayOff": {},
+        "previous_week_schedule": get_week_schedule("2025-12-29", "2026-01-04"),
+        "initial_shifts": {},
+        "runtime_config": runtime_config,
+        "planning_start_date": "2026-01-05",
+    }
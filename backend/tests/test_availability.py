@@ -0,0 +1,35 @@
+from solver.availability import EXCLUSION, HOLIDAY, LEAVE, TRAINING, UNAVAILABLE, AvailabilityTensor
+from solver.calendar import Calendar
+from solver.compiled_config import compile_config
+
+
+def _agents():
+    agents = [
+        {
+            "name": "Agent1",
+            "unavailable": ["02-01-2026"],
+            "training": ["05-01-2026"],
+            "exclusion": ["05-01-2027"],
+            "vacations": [{"start": "30-12-2025", "end": "01-01-2026"}],
+        },
+        {"name": "Agent2", "vacations": "invalid"},
+    ]
+    return compile_config({"agents": agents}).agents
+
+
+def test_availability_tensor_flags_agent_dates_on_anchored_calendar():
+    calendar = Calendar.from_range("2025-12-29", "2026-01-06", holidays=["01-01"])
+    availability = AvailabilityTensor.build(_agents(), calendar)
+
+    assert availability.shape == (2, 9, 5)
+    assert availability.days_with(0, LEAVE) == [1, 2, 3]
+    assert availability.days_with(0, UNAVAILABLE) == [4]
+    assert availability.days_with(0, TRAINING) == [7]
+    # Exclusion dates from another year do not match on an anchored calendar.
+    assert availability.days_with(0, EXCLUSION) == []
+    assert availability.days_with(1, HOLIDAY) == [3]
+    assert availability.days_with(0, LEAVE, start=3) == [3]
+
+    chunk = availability.between("2026-01-01", "2026-01-06")
+    assert chunk.calendar.labels[0] == "Jeu. 01-01"
+    assert chunk.days_with(0, LEAVE) == [0]
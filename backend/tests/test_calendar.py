@@ -0,0 +1,43 @@
+from datetime import date
+
+from solver.calendar import Calendar
+
+
+def test_calendar_groups_weeks_and_months_across_year_boundary():
+    calendar = Calendar.from_range("2025-12-25", "2026-01-06", holidays=["01-01"])
+
+    assert calendar.labels[0] == "Jeu. 25-12"
+    assert calendar.labels[-1] == "Mar. 06-01"
+    assert calendar.weeks() == [[0, 1, 2, 3], [4, 5, 6, 7, 8, 9, 10], [11, 12]]
+    assert calendar.periods() == [[0, 1, 2, 3, 4, 5, 6], [7, 8, 9, 10, 11, 12]]
+    assert calendar.weekend_pairs() == [(2, 3), (9, 10)]
+    assert calendar[7].is_holiday and calendar[7].iso_week == (2026, 1)
+    assert calendar.between("2026-01-01", "2026-01-03").labels == [
+        "Jeu. 01-01",
+        "Ven. 02-01",
+        "Sam. 03-01",
+    ]
+
+
+def test_anchored_calendar_matches_full_dates_over_long_horizons():
+    calendar = Calendar.from_range("2026-01-01", "2027-01-10")
+
+    assert calendar.indices_on(date(2026, 1, 5)) == [4]
+    assert calendar.indices_between(date(2027, 1, 1), date(2027, 1, 2)) == [365, 366]
+
+    unanchored = Calendar.from_labels(calendar.labels)
+    assert unanchored.indices_on(date(2026, 1, 5)) == [4, 369]
+
+
+def test_calendar_from_labels_keeps_label_weekdays_and_dates_by_position():
+    calendar = Calendar.from_labels(
+        ["Sam. 30-12", "Dim. 31-12", "Lun. 01-01", "Mar. 02-01"],
+        start_date="2024-01-01",
+        start_index=2,
+    )
+
+    assert calendar.anchored
+    assert calendar[0].date == date(2023, 12, 30)
+    assert calendar.follows(2)
+    assert calendar.weekend_pairs() == [(0, 1)]
+    assert calendar.weeks(2) == [[2, 3]]
@@ -0,0 +1,59 @@
+from copy import deepcopy
+from datetime import date
+
+import pytest
+from app import get_active_config, get_compiled_config, load_default_config, set_active_config
+from solver.compiled_config import compile_config
+
+
+@pytest.fixture(autouse=True)
+def restore_active_config():
+    previous_config = get_active_config()
+    yield
+    set_active_config(previous_config)
+
+
+def test_compile_config_parses_agents_once():
+    compiled = compile_config(
+        {
+            "vacations": ["Jour", "Nuit", "CDP"],
+            "agents": [
+                {
+                    "name": "Agent1",
+                    "unavailable": ["02-01-2026"],
+                    "vacations": [{"start": "05-01-2026", "end": "09-01-2026"}],
+                    "preferences": {"preferred": ["Nuit"], "avoid": ["Jour", "CDP"]},
+                    "restriction": ["CDP", "Unknown"],
+                }
+            ],
+        }
+    )
+
+    agent = compiled.agent("Agent1")
+    assert compiled.agent_index == {"Agent1": 0}
+    assert agent.unavailable == (date(2026, 1, 2),)
+    assert agent.leave_periods == ((date(2026, 1, 5), date(2026, 1, 9)),)
+    assert agent.preferred_mask == 0b010
+    assert agent.avoid_mask == 0b101
+    assert agent.restriction_mask == compiled.vacation_mask(["CDP"]) == 0b100
+    assert compiled.day_off == {"Agent1": [["05-01-2026", "09-01-2026"]]}
+
+    with pytest.raises(ValueError, match="Invalid training date for agent Agent2"):
+        compile_config({"agents": [{"name": "Agent2", "training": ["2026-01-02"]}]})
+
+
+def test_installed_config_is_compiled_once_per_content_hash():
+    config = load_default_config()
+    set_active_config(config)
+    compiled = get_compiled_config()
+    assert get_compiled_config() is compiled
+
+    set_active_config(deepcopy(config))
+    reinstalled = get_compiled_config()
+    assert reinstalled.content_hash == compiled.content_hash
+    assert reinstalled.agents is compiled.agents
+
+    changed = deepcopy(config)
+    changed["solver"]["max_time_seconds"] = 321
+    set_active_config(changed)
+    assert get_compiled_config().content_hash != compiled.content_hash
@@ -4,7 +4,9 @@ from types import SimpleNamespace
 import pytest
 from ortools.sat.python import cp_model
 from app import generate_planning, get_active_config, load_default_config, set_active_config
+from solver.calendar import Calendar
 from solver.constraints.mixed import limit_weekly_nights_and_hours
+from solver.tensor import PlanningTensor
 
 
 def _solve_forced_weekly_shifts(max_weekly_hours):
@@ -12,21 +14,22 @@ def _solve_forced_weekly_shifts(max_weekly_hours):
     agent_name = "Agent1"
     vacations = ["Jour", "Nuit"]
     week = ["Lun. 01-06", "Mar. 02-06", "Mer. 03-06", "Jeu. 04-06"]
-    planning = {
-        (agent_name, day, vacation): model.NewBoolVar(
-            f"planning_{agent_name}_{day}_{vacation}"
-        )
-        for day in week
-        for vacation in vacations
-    }
+    planning = PlanningTensor([agent_name], week, vacations)
+    for day in week:
+        for vacation in vacations:
+            planning[(agent_name, day, vacation)] = model.NewBoolVar(
+                f"planning_{agent_name}_{day}_{vacation}"
+            )
 
     ctx = SimpleNamespace(
         agents=[{"name": agent_name}],
         vacations=vacations,
-        weeks_split=[week],
+        calendar=Calendar.from_labels(week),
+        planned_day_offset=0,
         planning=planning,
         shift_durations={"Jour": 120, "Nuit": 120},
         max_weekly_hours=max_weekly_hours,
+        elastic_max_weekly_hours=False,
         model=model,
     )
 
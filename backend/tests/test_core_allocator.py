@@ -0,0 +1,33 @@
+import threading
+
+from core_allocator import CoreAllocator
+
+
+def test_core_allocator_grants_fair_share_of_free_cores():
+    allocator = CoreAllocator(8)
+
+    with allocator.session():
+        with allocator.allocate() as alone:
+            assert alone == 8
+        with allocator.allocate(3) as requested:
+            assert requested == 3
+
+        with allocator.session():
+            first = allocator.acquire()
+            second = allocator.acquire(6)
+            assert (first, second) == (4, 4)
+            assert allocator.cores_in_use == 8
+
+            granted = []
+            waiter = threading.Thread(target=lambda: granted.append(allocator.acquire()))
+            waiter.start()
+            waiter.join(timeout=0.2)
+            assert waiter.is_alive()
+
+            allocator.release(first)
+            waiter.join(timeout=5)
+            assert granted == [4]
+            allocator.release(second)
+            allocator.release(granted[0])
+
+    assert allocator.cores_in_use == 0
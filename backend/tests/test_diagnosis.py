@@ -0,0 +1,64 @@
+import pytest
+
+from solver.control import SolveControl
+from solver.engine import diagnose_planning, generate_planning
+from tests.factories import jour_config, jour_planning_kwargs
+
+
+def test_generate_planning_reports_conflicting_rules_when_infeasible():
+    # Three agents must each work once, but two days only staff two shifts
+    runtime_config = jour_config()
+    summaries = []
+
+    result = generate_planning(
+        **jour_planning_kwargs(runtime_config, "2026-01-06"), on_finish=summaries.append
+    )
+
+    expected = [
+        {"rule": "require_at_least_one_shift_per_agent", "agents": [], "days": []},
+        {"rule": "cover_daily_shifts", "agents": [], "days": []},
+    ]
+    assert result == {"info": "No solution found.", "conflict": expected}
+    assert summaries[0]["status"] == "INFEASIBLE"
+    assert summaries[0]["diagnosis"]["conflict"] == expected
+    assert summaries[0]["diagnosis"]["minimal"] is True
+
+    runtime_config["solver"]["diagnose_infeasibility"] = False
+    result = generate_planning(**jour_planning_kwargs(runtime_config, "2026-01-06"))
+    assert result == {"info": "No solution found."}
+
+
+def test_diagnosis_attributes_cells_of_the_domain_pre_pass_per_agent():
+    # Agent2 and Agent3 can only work Monday, which staffs a single shift
+    runtime_config = jour_config()
+    for agent in runtime_config["agents"][1:]:
+        agent["unavailable"] = ["06-01-2026", "07-01-2026"]
+    runtime_config["solver"]["diagnosis_scope"] = "agent"
+
+    diagnosis = diagnose_planning(**jour_planning_kwargs(runtime_config, "2026-01-07"))
+
+    assert diagnosis["status"] == "INFEASIBLE"
+    assert diagnosis["minimal"] is True
+    conflict = {(rule["rule"], tuple(rule["agents"])) for rule in diagnosis["conflict"]}
+    assert conflict == {
+        ("require_at_least_one_shift_per_agent", ("Agent2",)),
+        ("require_at_least_one_shift_per_agent", ("Agent3",)),
+        ("cover_daily_shifts", ()),
+        ("block_unavailable_days", ("Agent2",)),
+        ("block_unavailable_days", ("Agent3",)),
+    }
+
+    runtime_config["solver"]["diagnosis_scope"] = "team"
+    with pytest.raises(ValueError, match="diagnosis_scope"):
+        diagnose_planning(**jour_planning_kwargs(runtime_config, "2026-01-07"))
+
+
+def test_cancelled_diagnosis_does_not_solve():
+    control = SolveControl()
+    control.cancel()
+
+    diagnosis = diagnose_planning(**jour_planning_kwargs(jour_config(), "2026-01-06"), control=control)
+
+    assert diagnosis["status"] == "UNKNOWN"
+    assert diagnosis["conflict"] == []
+    assert diagnosis["minimal"] is False
@@ -1,59 +1,23 @@
+import time
+
 from app import get_week_schedule
 import pytest
-from solver.engine import generate_planning
-
-
-def _build_runtime_config(vacations, vacation_durations, staffing_requirements=None):
-    return {
-        "agents": [
-            {
-                "name": "Agent1",
-                "preferences": {"preferred": [vacations[0]], "avoid": []},
-                "restriction": [],
-                "unavailable": [],
-                "training": [],
-                "exclusion": [],
-                "vacations": [],
-            },
-            {
-                "name": "Agent2",
-                "preferences": {"preferred": [vacations[0]], "avoid": []},
-                "restriction": [],
-                "unavailable": [],
-                "training": [],
-                "exclusion": [],
-                "vacations": [],
-            },
-            {
-                "name": "Agent3",
-                "preferences": {"preferred": [vacations[0]], "avoid": []},
-                "restriction": [],
-                "unavailable": [],
-                "training": [],
-                "exclusion": [],
-                "vacations": [],
-            },
-        ],
-        "vacations": vacations,
-        "vacation_durations": vacation_durations,
-        "staffing_requirements": staffing_requirements or {},
-        "holidays": [],
-        "solver": {
-            "max_time_seconds": 30,
-            "relative_gap_limit": 0.1,
-            "num_search_workers": 0,
-            "global_max_gap": 240,
-            "period_max_gap": 240,
-            "optimize_period_balance": False,
-            "period_balance_weight": 2,
-            "min_free_weekends_per_horizon": 0,
-        },
-    }
+from ortools.sat.python import cp_model
+from solver.constraints.encoding import constraint_counts
+from solver.engine import _build_context, generate_planning
+from solver.stopping import (
+    STOP_AFTER_FIRST_SOLUTION,
+    STOP_GAP_LIMIT,
+    STOP_OPTIMAL,
+    STOP_STAGNATION,
+    SearchWatchdog,
+)
+from tests.factories import build_runtime_config
 
 
 def test_solver_supports_multiple_agents_per_shift():
     vacations = ["Jour"]
-    runtime_config = _build_runtime_config(
+    runtime_config = build_runtime_config(
         vacations=vacations,
         vacation_durations={"Jour": 12, "Conge": 7},
         staffing_requirements={"Jour": 2},
@@ -82,7 +46,7 @@ def test_solver_supports_multiple_agents_per_shift():
 
 def test_solver_accepts_custom_vacations_without_nuit_or_cdp():
     vacations = ["Jour", "Soutien"]
-    runtime_config = _build_runtime_config(
+    runtime_config = build_runtime_config(
         vacations=vacations,
         vacation_durations={"Jour": 12, "Soutien": 10, "Conge": 7},
         staffing_requirements={"Jour": 1, "Soutien": 1},
@@ -109,7 +73,7 @@ def test_solver_accepts_custom_vacations_without_nuit_or_cdp():
 
 def test_solver_enforces_min_free_weekends_per_horizon_when_feasible():
     vacations = ["Jour"]
-    runtime_config = _build_runtime_config(
+    runtime_config = build_runtime_config(
         vacations=vacations,
         vacation_durations={"Jour": 12, "Conge": 7},
         staffing_requirements={"Jour": 1},
@@ -149,7 +113,7 @@ def test_solver_enforces_min_free_weekends_per_horizon_when_feasible():
 
 def test_solver_rejects_infeasible_min_free_weekends_per_horizon():
     vacations = ["Jour"]
-    runtime_config = _build_runtime_config(
+    runtime_config = build_runtime_config(
         vacations=vacations,
         vacation_durations={"Jour": 12, "Conge": 7},
         staffing_requirements={"Jour": 2},
@@ -171,3 +135,98 @@ def test_solver_rejects_infeasible_min_free_weekends_per_horizon():
             runtime_config=runtime_config,
             planning_start_date="2026-01-05",
         )
+
+
+def _solve_weekend_fairness(mode):
+    vacations = ["Jour"]
+    runtime_config = build_runtime_config(
+        vacations=vacations,
+        vacation_durations={"Jour": 12, "Conge": 7},
+    )
+    runtime_config["solver"]["weekend_fairness_mode"] = mode
+    agents = runtime_config["agents"]
+    ctx = _build_context(
+        agents,
+        vacations,
+        get_week_schedule("2026-01-05", "2026-01-25"),
+        {agent["name"]: [] for agent in agents},
+        get_week_schedule("2025-12-29", "2026-01-04"),
+        {},
+        runtime_config,
+        "2026-01-05",
+    )
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = 30
+    status = solver.Solve(ctx.model)
+    assert status == cp_model.OPTIMAL
+    return ctx, solver.ObjectiveValue()
+
+
+def test_weekend_fairness_table_mode_matches_quadratic_objective():
+    quadratic_ctx, quadratic_objective = _solve_weekend_fairness("quadratic")
+    table_ctx, table_objective = _solve_weekend_fairness("table")
+    spread_ctx, _ = _solve_weekend_fairness("spread")
+
+    assert table_objective == quadratic_objective
+    assert "int_prod" in constraint_counts(quadratic_ctx.model)
+    assert "int_prod" not in constraint_counts(table_ctx.model)
+    assert "int_prod" not in constraint_counts(spread_ctx.model)
+
+
+def test_solver_rejects_unknown_weekend_fairness_mode():
+    with pytest.raises(ValueError, match="weekend_fairness_mode must be one of"):
+        _solve_weekend_fairness("cubic")
+
+
+def test_search_watchdog_stops_on_stagnation_or_after_first_solution():
+    watchdog = SearchWatchdog(
+        cp_model.CpSolver(), stagnation_seconds=5, min_improvement=10, maximize=True
+    )
+    assert watchdog.check() is None
+
+    watchdog.record_solution(100)
+    start = time.monotonic()
+    # A gain of 10 or less is not an improvement and does not reset the window
+    watchdog.record_solution(110)
+    watchdog.record_solution(50)
+    assert watchdog.check(now=start + 4) is None
+    assert watchdog.check(now=start + 5) == STOP_STAGNATION
+
+    watchdog.record_solution(150)
+    assert watchdog.check(now=time.monotonic() + 4) is None
+
+    deadline = SearchWatchdog(cp_model.CpSolver(), max_seconds_after_first_solution=2)
+    deadline.record_solution(100)
+    assert deadline.check(now=time.monotonic() + 2) == STOP_AFTER_FIRST_SOLUTION
+    assert not SearchWatchdog(cp_model.CpSolver()).enabled
+
+
+def test_solver_reports_stop_reason_with_stopping_policy():
+    vacations = ["Jour"]
+    runtime_config = build_runtime_config(
+        vacations=vacations,
+        vacation_durations={"Jour": 12, "Conge": 7},
+        staffing_requirements={"Jour": 2},
+    )
+    runtime_config["solver"]["stagnation_seconds"] = 5
+    runtime_config["solver"]["max_seconds_after_first_solution"] = 10
+    agents = runtime_config["agents"]
+    summaries = []
+
+    result = generate_planning(
+        agents=agents,
+        vacations=vacations,
+        week_schedule=get_week_schedule("2026-01-05", "2026-01-06"),
+        dayOff={agent["name"]: [] for agent in agents},
+        previous_week_schedule=get_week_schedule("2025-12-29", "2026-01-04"),
+        initial_shifts={},
+        runtime_config=runtime_config,
+        planning_start_date="2026-01-05",
+        on_finish=summaries.append,
+    )
+
+    assert "info" not in result
+    assert len(summaries) == 1
+    assert summaries[0]["status"] == "OPTIMAL"
+    assert summaries[0]["stop_reason"] in (STOP_OPTIMAL, STOP_GAP_LIMIT)
+    assert summaries[0]["objective"] is not None
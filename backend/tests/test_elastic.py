@@ -0,0 +1,70 @@
+from solver.engine import _build_context, generate_planning
+from tests.factories import jour_config, jour_planning_kwargs, team_config, team_planning_kwargs
+
+
+def test_elastic_gaps_turn_infeasible_balance_caps_into_reported_excess():
+    runtime_config = team_config(30, 3)
+    runtime_config["solver"].update(
+        global_max_gap=0,
+        period_max_gap=0,
+        diagnose_infeasibility=False,
+        max_seconds_after_first_solution=1,
+    )
+    assert generate_planning(**team_planning_kwargs(runtime_config)) == {"info": "No solution found."}
+
+    runtime_config["solver"]["elastic_gaps"] = True
+    summaries = []
+    result = generate_planning(**team_planning_kwargs(runtime_config), on_finish=summaries.append)
+
+    assert "info" not in result
+    assert summaries[0]["status"] in ["OPTIMAL", "FEASIBLE"]
+    excess = {entry["cap"]: entry for entry in summaries[0]["cap_excess"]}
+    assert excess["global_max_gap"]["days"] == ["Lun. 02-02", "Dim. 01-03"]
+    assert excess["global_max_gap"]["excess"] == excess["global_max_gap"]["value"] > 0
+    assert excess["period_max_gap"]["limit"] == 0
+
+
+def test_elastic_weekly_hours_report_the_agents_over_the_cap():
+    # Seven 12-hour shifts cannot fit in three agents capped at 24 hours a week
+    runtime_config = jour_config()
+    runtime_config["solver"]["max_weekly_hours"] = 24
+    kwargs = jour_planning_kwargs(runtime_config, "2026-01-11")
+    result = generate_planning(**kwargs)
+    assert [issue["rule"] for issue in result["issues"]] == ["max_weekly_hours"]
+
+    runtime_config["solver"]["elastic_max_weekly_hours"] = True
+    summaries = []
+    result = generate_planning(**kwargs, on_finish=summaries.append)
+
+    assert sum(len(shifts) for shifts in result.values()) == 7
+    (excess,) = summaries[0]["cap_excess"]
+    assert excess["cap"] == "max_weekly_hours"
+    assert excess["days"] == ["Lun. 05-01", "Dim. 11-01"]
+    assert len(excess["agents"]) == 1
+    assert (excess["limit"], excess["value"], excess["excess"]) == (24, 36, 12)
+
+
+def test_elastic_gaps_report_the_real_gap_with_zero_weights():
+    # A zero weight leaves the excess free; the reported gap must still be the planning's
+    runtime_config = team_config(15, 1)
+    runtime_config["solver"].update(
+        elastic_gaps=True,
+        global_gap_excess_weight=0,
+        period_gap_excess_weight=0,
+        max_seconds_after_first_solution=1,
+    )
+    kwargs = team_planning_kwargs(runtime_config)
+    summaries = []
+    result = generate_planning(**kwargs, on_finish=summaries.append)
+
+    ctx = _build_context(*kwargs.values())
+    paid_hours = []
+    for agent_idx, agent in enumerate(ctx.agents):
+        worked = sum(ctx.shift_durations[vacation] for _, vacation in result.get(agent["name"], []))
+        leave = sum(
+            ctx.leave_paid_hours_by_day[(agent_idx, day_idx)]
+            for day_idx in range(ctx.planned_day_offset, len(ctx.calendar))
+        )
+        paid_hours.append(worked + leave)
+    excess = {entry["cap"]: entry for entry in summaries[0]["cap_excess"]}
+    assert excess["global_max_gap"]["value"] == (max(paid_hours) - min(paid_hours)) / 10
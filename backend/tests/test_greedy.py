@@ -0,0 +1,49 @@
+from solver.engine import _build_context, generate_planning
+from solver.greedy import construct_planning
+from tests.factories import jour_config, jour_planning_kwargs, team_config, team_planning_kwargs
+
+
+def test_greedy_planning_satisfies_every_constraint():
+    runtime_config = team_config(30, 3)
+    kwargs = team_planning_kwargs(runtime_config)
+    ctx = _build_context(*kwargs.values())
+
+    greedy = construct_planning(ctx)
+
+    assert greedy.unfilled == 0
+    assert sum(len(shifts) for shifts in greedy.planning.values()) == 28 * 6 + 20 * 3
+    leave_days = {f"{day:02d}-02" for day in range(9, 16)}
+    assert not [day for day, _ in greedy.planning["Agent1"] if day[5:] in leave_days]
+    assert all(vacation != "Nuit" for _, vacation in greedy.planning["Agent3"])
+
+    # Fixing the hinted cells leaves CP-SAT nothing to choose: it only checks the planning
+    summaries = []
+    result = generate_planning(
+        **kwargs, hint=greedy.planning, fix_hint=True, on_finish=summaries.append
+    )
+    assert summaries[0]["status"] == "OPTIMAL"
+    assert {name: sorted(shifts) for name, shifts in result.items()} == {
+        name: sorted(shifts) for name, shifts in greedy.planning.items()
+    }
+
+
+def test_generate_planning_hints_unseeded_searches_with_greedy_planning():
+    runtime_config = team_config(30, 3)
+    runtime_config["solver"]["max_seconds_after_first_solution"] = 1
+    summaries = []
+
+    generate_planning(**team_planning_kwargs(runtime_config), on_finish=summaries.append)
+
+    hint = summaries[0]["hint"]
+    assert hint["source"] == "greedy"
+    assert hint["unfilled"] == 0
+    assert hint["feasible"] is True
+    assert hint["shifts"] == 28 * 6 + 20 * 3
+
+    small_config = jour_config(staffing=2)
+    small_config["solver"]["greedy_hint"] = False
+    summaries = []
+    generate_planning(
+        **jour_planning_kwargs(small_config, "2026-01-06"), on_finish=summaries.append
+    )
+    assert "hint" not in summaries[0]
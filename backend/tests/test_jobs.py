@@ -0,0 +1,112 @@
+from threading import Event
+
+import pytest
+from jobs import (
+    DEFAULT_RETRY_AFTER_SECONDS,
+    JOB_CANCELLED,
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JOB_SUCCEEDED,
+    DuplicateJobError,
+    JobManager,
+    QueueFullError,
+)
+
+
+def test_job_manager_runs_jobs_on_bounded_pool():
+    manager = JobManager(max_workers=1)
+    release = Event()
+
+    def blocking_job(job):
+        release.wait(timeout=10)
+        return {"planning": {}}, 200
+
+    first = manager.submit(blocking_job)
+    second = manager.submit(lambda job: ({"info": "No solution found."}, 400))
+    assert second.status == JOB_QUEUED
+    assert first.status in (JOB_QUEUED, JOB_RUNNING)
+
+    release.set()
+    first.future.result(timeout=10)
+    second.future.result(timeout=10)
+    assert first.status == JOB_SUCCEEDED
+    assert first.to_dict()["result"] == {"planning": {}}
+    assert second.status == JOB_FAILED
+    assert second.to_dict()["status_code"] == 400
+    manager.shutdown()
+
+
+def test_job_manager_reports_exceptions_and_forgets_old_jobs():
+    manager = JobManager(max_workers=1, max_finished_jobs=1)
+
+    def failing_job(job):
+        raise RuntimeError("solver crashed")
+
+    first = manager.submit(failing_job)
+    first.future.result(timeout=10)
+    assert first.status == JOB_FAILED
+    assert first.status_code == 500
+    assert first.result == {"error": "solver crashed"}
+
+    second = manager.submit(lambda job: ({}, 200))
+    second.future.result(timeout=10)
+    assert manager.get(first.id) is None
+    assert manager.get(second.id) is second
+    manager.shutdown()
+
+
+def test_job_manager_cancels_running_and_queued_jobs():
+    manager = JobManager(max_workers=1)
+    started = Event()
+
+    def cancellable_job(job):
+        started.set()
+        while not job.control.cancelled:
+            job.wait_for_events(len(job.events), timeout=0.05)
+        return {"planning": {}, "cancelled": True}, 200
+
+    running = manager.submit(cancellable_job, job_id="running")
+    queued = manager.submit(cancellable_job, job_id="queued")
+    with pytest.raises(DuplicateJobError):
+        manager.submit(cancellable_job, job_id="running")
+
+    assert started.wait(timeout=10)
+    assert manager.cancel("queued") is queued
+    assert queued.status == JOB_CANCELLED
+    assert queued.status_code == 409
+
+    manager.cancel("running")
+    assert running.wait(timeout=10)
+    assert running.status == JOB_CANCELLED
+    assert running.result == {"planning": {}, "cancelled": True}
+    assert manager.cancel("unknown") is None
+    manager.shutdown()
+
+
+def test_job_manager_rejects_submissions_beyond_queue_limit():
+    manager = JobManager(max_workers=1, max_queued_jobs=1)
+    release = Event()
+
+    def blocking_job(job):
+        release.wait(timeout=10)
+        return {"planning": {}}, 200
+
+    running = manager.submit(blocking_job)
+    queued = manager.submit(blocking_job)
+    with pytest.raises(QueueFullError) as exc_info:
+        manager.submit(blocking_job)
+    assert exc_info.value.retry_after == DEFAULT_RETRY_AFTER_SECONDS
+
+    release.set()
+    running.future.result(timeout=10)
+    queued.future.result(timeout=10)
+    # Once jobs have finished, the wait is estimated from their durations
+    release.clear()
+    manager.submit(blocking_job)
+    manager.submit(blocking_job)
+    with pytest.raises(QueueFullError) as exc_info:
+        manager.submit(blocking_job)
+    assert exc_info.value.retry_after >= 1
+    release.set()
+    manager.shutdown()
@@ -0,0 +1,43 @@
+from solver.tensor import PlanningTensor
+
+
+def _tensor():
+    tensor = PlanningTensor(
+        ["Agent1", "Agent2"],
+        ["Lun. 01-01", "Mar. 02-01", "Mer. 03-01"],
+        ["Jour", "Nuit"],
+    )
+    for agent_idx, agent_name in enumerate(tensor.agents):
+        for day_idx, day in enumerate(tensor.days):
+            for vacation_idx, vacation in enumerate(tensor.vacations):
+                tensor.set_at(agent_idx, day_idx, vacation_idx, f"{agent_name}|{day}|{vacation}")
+    return tensor
+
+
+def test_planning_tensor_label_access_matches_integer_access():
+    tensor = _tensor()
+
+    assert tensor.shape == (2, 3, 2)
+    assert len(tensor) == 12
+    assert tensor[("Agent2", "Mar. 02-01", "Nuit")] == tensor.at(1, 1, 1)
+    assert ("Agent1", "Lun. 01-01", "Jour") in tensor
+    assert ("Agent3", "Lun. 01-01", "Jour") not in tensor
+
+    tensor[("Agent1", "Mer. 03-01", "Jour")] = 0
+    assert tensor.at(0, 2, 0) == 0
+    assert list(tensor.keys())[0] == ("Agent1", "Lun. 01-01", "Jour")
+
+
+def test_planning_tensor_slices():
+    tensor = _tensor()
+
+    assert tensor.day_cells(0, 1) == ["Agent1|Mar. 02-01|Jour", "Agent1|Mar. 02-01|Nuit"]
+    assert tensor.agent_slice(1, 1, 2) == ["Agent2|Mar. 02-01|Jour", "Agent2|Mar. 02-01|Nuit"]
+    assert tensor.column(2, 1) == ["Agent1|Mer. 03-01|Nuit", "Agent2|Mer. 03-01|Nuit"]
+    assert tensor.vacation_slice(0, 0, 2) == [
+        "Agent1|Lun. 01-01|Jour",
+        "Agent1|Mar. 02-01|Jour",
+        "Agent2|Lun. 01-01|Jour",
+        "Agent2|Mar. 02-01|Jour",
+    ]
+    assert len(tensor.day_slice(0, 2)) == 8
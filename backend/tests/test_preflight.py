@@ -0,0 +1,65 @@
+from solver.engine import prepare_context, generate_planning
+from solver.preflight import (
+    RULE_AT_LEAST_ONE_SHIFT,
+    RULE_MAX_WEEKLY_HOURS,
+    RULE_MIN_FREE_WEEKENDS,
+    RULE_STAFFING,
+    check_feasibility,
+)
+from tests.factories import team_config, team_planning_kwargs
+
+
+def _issues(runtime_config):
+    ctx = prepare_context(*team_planning_kwargs(runtime_config).values())
+    return check_feasibility(ctx)
+
+
+def test_feasible_team_passes_every_check():
+    assert _issues(team_config(30, 3)) == []
+
+
+def test_staffing_shortfall_names_days_and_absent_agents():
+    runtime_config = team_config(30, 3)
+    for agent in runtime_config["agents"][8:]:
+        agent["unavailable"] = ["04-02-2026"]
+
+    issues = _issues(runtime_config)
+
+    assert issues == [
+        {
+            "rule": RULE_STAFFING,
+            "days": ["Mer. 04-02"],
+            "agents": [f"Agent{idx}" for idx in range(9, 31)],
+            "vacation": None,
+            "required": 9,
+            "available": 8,
+        }
+    ]
+
+
+def test_agent_without_any_open_day_and_weekly_hours_are_reported():
+    runtime_config = team_config(30, 3)
+    runtime_config["agents"][4]["vacations"] = [{"start": "01-02-2026", "end": "01-03-2026"}]
+    runtime_config["solver"]["max_weekly_hours"] = 12
+    runtime_config["solver"]["min_free_weekends_per_horizon"] = 4
+
+    rules = [issue["rule"] for issue in _issues(runtime_config)]
+
+    assert rules[0] == RULE_AT_LEAST_ONE_SHIFT
+    assert _issues(runtime_config)[0]["agents"] == ["Agent5"]
+    assert rules.count(RULE_MAX_WEEKLY_HOURS) == 4
+    assert RULE_MIN_FREE_WEEKENDS in rules
+
+
+def test_generate_planning_skips_the_model_when_a_check_fails():
+    runtime_config = team_config(30, 3)
+    runtime_config["solver"]["max_weekly_hours"] = 12
+    summaries = []
+
+    result = generate_planning(**team_planning_kwargs(runtime_config), on_finish=summaries.append)
+
+    assert "info" in result
+    assert {issue["rule"] for issue in result["issues"]} == {RULE_MAX_WEEKLY_HOURS}
+    assert summaries[0]["status"] == "INFEASIBLE"
+    assert summaries[0]["stop_reason"] == "preflight"
+    assert summaries[0]["issues"] == result["issues"]
@@ -0,0 +1,44 @@
+import time
+
+from solver.engine import generate_planning
+from solver.preview import PREVIEW_STATUS, preview_planning
+from tests.factories import team_config, team_planning_kwargs
+
+
+def test_preview_planning_is_fast_and_keeps_hard_rules():
+    runtime_config = team_config(100, 10)
+    kwargs = team_planning_kwargs(runtime_config)
+    summaries = []
+
+    started = time.perf_counter()
+    preview = preview_planning(**kwargs, on_finish=summaries.append)
+    assert time.perf_counter() - started < 1
+
+    summary = summaries[0]
+    assert summary["status"] == PREVIEW_STATUS
+    assert summary["best_bound"] is None
+    assert summary["unfilled"] == 0
+    assert summary["feasible"] is True
+    assert summary["moves"] > 0
+
+    # The fixed-hint check accepts the preview and scores it like its approximate objective
+    check = []
+    result = generate_planning(**kwargs, hint=preview, fix_hint=True, on_finish=check.append)
+    assert check[0]["status"] == "OPTIMAL"
+    assert check[0]["objective"] == summary["objective"]
+    assert {name: sorted(shifts) for name, shifts in result.items()} == {
+        name: sorted(shifts) for name, shifts in preview.items()
+    }
+
+
+def test_preview_planning_is_reproducible():
+    runtime_config = team_config(30, 3)
+    runtime_config["solver"]["preview_max_seconds"] = 5
+    summaries = []
+
+    first = preview_planning(**team_planning_kwargs(runtime_config), on_finish=summaries.append)
+    second = preview_planning(**team_planning_kwargs(runtime_config), on_finish=summaries.append)
+
+    assert first == second
+    assert summaries[0]["stop_reason"] == "local_optimum"
+    assert summaries[0]["objective"] == summaries[1]["objective"]
@@ -0,0 +1,45 @@
+from result_cache import ResultCache, planning_cache_key
+
+
+def test_planning_cache_key_is_canonical():
+    key = planning_cache_key(
+        "hash",
+        "2026-01-05",
+        "2026-01-06",
+        {"Agent1": [("Mar. 30-12", "Jour"), ("Mer. 31-12", "Jour")], "Agent2": []},
+    )
+
+    assert key == planning_cache_key(
+        "hash", "2026-01-05", "2026-01-06", {"Agent1": [["Mer. 31-12", "Jour"], ["Mar. 30-12", "Jour"]]}
+    )
+    assert key != planning_cache_key("other", "2026-01-05", "2026-01-06", {})
+    assert key != planning_cache_key("hash", "2026-01-05", "2026-01-07", {})
+
+
+def test_result_cache_evicts_least_recently_used_entries():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", {"planning": "a"})
+    cache.put("b", {"planning": "b"})
+    assert cache.get("a") == {"planning": "a"}
+
+    cache.put("c", {"planning": "c"})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"planning": "a"}
+    assert len(cache) == 2
+
+    disabled = ResultCache(max_entries=0)
+    disabled.put("a", {"planning": "a"})
+    assert disabled.get("a") is None
+
+
+def test_result_cache_disk_tier_survives_restarts(tmp_path):
+    cache = ResultCache(max_entries=1, directory=str(tmp_path))
+    cache.put("a", {"planning": {"Agent1": [["Lun. 05-01", "Jour"]]}})
+    cache.put("b", {"planning": {}})
+
+    restarted = ResultCache(max_entries=1, directory=str(tmp_path))
+    assert restarted.get("a") == {"planning": {"Agent1": [["Lun. 05-01", "Jour"]]}}
+
+    restarted.clear()
+    assert restarted.get("b") is None
+    assert list(tmp_path.iterdir()) == []
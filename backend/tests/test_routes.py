@@ -1,15 +1,27 @@
 import json
+import time
 from copy import deepcopy
+from datetime import datetime
+from threading import Event
 from unittest.mock import mock_open, patch
 
 import pytest
 from app import (
+    _reconcile_chunk,
     app,
+    generate_planning,
     get_active_config,
+    get_chunk_cache,
+    get_job_manager,
+    get_plan_history,
+    get_result_cache,
     load_config,
     load_default_config,
+    prepare_planning_request,
     set_active_config,
 )
+from jobs import DEFAULT_RETRY_AFTER_SECONDS, JobManager
+from tests.factories import team_config
 
 
 @pytest.fixture
@@ -45,6 +57,9 @@ def reset_active_config():
     config = load_default_config()
     config.setdefault("solver", {})["min_free_weekends_per_horizon"] = 0
     set_active_config(config)
+    get_result_cache().clear()
+    get_chunk_cache().clear()
+    get_plan_history().clear()
     yield
 
 
@@ -446,3 +461,396 @@ def test_previous_week_schedule_invalid_start_date_format(client):
     )
     assert response.status_code == 400
     assert response.get_json() == {"error": "Invalid date format. Use YYYY-MM-DD."}
+
+
+def test_planning_job_route_runs_request_in_background(client):
+    """
+    Test that POST /planning-jobs returns a job id at once and that
+    GET /planning-jobs/<id> reports the planning once the job has finished.
+    """
+    data = {"start_date": "2026-01-05", "end_date": "2026-01-06"}
+    response = client.post(
+        "/planning-jobs", data=json.dumps(data), content_type="application/json"
+    )
+    assert response.status_code == 202
+    job_id = response.get_json()["job_id"]
+    assert response.headers["Location"] == f"/planning-jobs/{job_id}"
+
+    get_job_manager().get(job_id).future.result(timeout=120)
+    job_response = client.get(f"/planning-jobs/{job_id}")
+    assert job_response.status_code == 200
+    job = job_response.get_json()
+    assert job["status"] == "succeeded"
+    assert job["status_code"] == 200
+    assert len(job["result"]["week_schedule"]) == 2
+
+
+def test_planning_job_route_rejects_invalid_payload_before_queuing(client):
+    response = client.post(
+        "/planning-jobs",
+        data=json.dumps({"start_date": "2026-01-06", "end_date": "2026-01-05"}),
+        content_type="application/json",
+    )
+    assert response.status_code == 400
+    assert "job_id" not in response.get_json()
+
+
+def test_planning_job_route_unknown_job(client):
+    response = client.get("/planning-jobs/unknown")
+    assert response.status_code == 404
+
+
+def test_planning_job_events_stream_improving_solutions(client):
+    """
+    Test that GET /planning-jobs/<id>/events streams each improving solution with its
+    objective, bound, elapsed time and planning, then a final "done" event.
+    """
+    data = {"start_date": "2026-01-05", "end_date": "2026-01-06"}
+    response = client.post(
+        "/planning-jobs", data=json.dumps(data), content_type="application/json"
+    )
+    job_id = response.get_json()["job_id"]
+
+    events_response = client.get(f"/planning-jobs/{job_id}/events")
+    assert events_response.status_code == 200
+    assert events_response.mimetype == "text/event-stream"
+
+    events = []
+    for block in events_response.get_data(as_text=True).strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((int(fields["id"]), fields["event"], json.loads(fields["data"])))
+
+    assert [event_id for event_id, _, _ in events] == list(range(len(events)))
+    solutions = [data for _, event_type, data in events if event_type == "solution"]
+    assert solutions
+    assert solutions[-1]["chunk"] == 0
+    assert solutions[-1]["chunk_start"] == "2026-01-05"
+    assert {"objective", "best_bound", "elapsed", "planning"} <= set(solutions[-1])
+    assert events[-1][1] == "done"
+    assert events[-1][2]["status"] == "succeeded"
+    assert events[-1][2]["result"]["planning"] == solutions[-1]["planning"]
+
+    resumed = client.get(
+        f"/planning-jobs/{job_id}/events", headers={"Last-Event-ID": str(events[-2][0])}
+    )
+    assert resumed.get_data(as_text=True).startswith(f"id: {events[-1][0]}\nevent: done")
+
+
+def test_planning_job_route_cancels_remaining_chunks(client):
+    """
+    Test that DELETE /planning-jobs/<id> cancels a running job: the chunk being
+    solved keeps its solution, the next monthly chunks are skipped and the partial
+    planning is flagged as cancelled.
+    """
+    chunk_started = Event()
+
+    def hold_first_chunk(*args, control=None, **kwargs):
+        result = generate_planning(*args, control=control, **kwargs)
+        chunk_started.set()
+        while not control.cancelled:
+            time.sleep(0.01)
+        return result
+
+    data = {"start_date": "2026-03-30", "end_date": "2026-04-02", "request_id": "cancel-me"}
+    with patch("app.generate_planning", side_effect=hold_first_chunk) as generate:
+        response = client.post(
+            "/planning-jobs", data=json.dumps(data), content_type="application/json"
+        )
+        assert response.status_code == 202
+        assert response.get_json()["job_id"] == "cancel-me"
+
+        duplicate = client.post(
+            "/planning-jobs", data=json.dumps(data), content_type="application/json"
+        )
+        assert duplicate.status_code == 409
+
+        assert chunk_started.wait(timeout=120)
+        cancel_response = client.delete("/planning-jobs/cancel-me")
+
+    assert cancel_response.status_code == 200
+    job = cancel_response.get_json()
+    assert job["status"] == "cancelled"
+    assert job["result"]["cancelled"] is True
+    assert generate.call_count == 1
+    planned_days = {day for shifts in job["result"]["planning"].values() for day, _ in shifts}
+    assert planned_days == {"Lun. 30-03", "Mar. 31-03"}
+
+
+def test_planning_job_route_cancel_unknown_job(client):
+    response = client.delete("/planning-jobs/unknown")
+    assert response.status_code == 404
+
+
+def test_generate_planning_route_serves_repeated_requests_from_cache(client):
+    """
+    Test that an identical /generate-planning request is answered from the result
+    cache without solving again, and that PUT /config invalidates the cache.
+    """
+    data = {
+        "start_date": "2026-01-05",
+        "end_date": "2026-01-06",
+        "initial_shifts": {"Agent1": [["Mar. 30-12", "Jour"], ["Mer. 31-12", "Jour"]]},
+    }
+    with patch("app.generate_planning", side_effect=generate_planning) as generate:
+        first = client.post(
+            "/generate-planning", data=json.dumps(data), content_type="application/json"
+        )
+        # The same shifts listed in another order share the cache entry
+        data["initial_shifts"]["Agent1"].reverse()
+        second = client.post(
+            "/generate-planning", data=json.dumps(data), content_type="application/json"
+        )
+        assert generate.call_count == 1
+
+        with patch("app.save_config"):
+            client.put(
+                "/config", data=json.dumps(get_active_config()), content_type="application/json"
+            )
+        third = client.post(
+            "/generate-planning", data=json.dumps(data), content_type="application/json"
+        )
+        assert generate.call_count == 2
+
+    assert first.status_code == 200
+    assert first.get_json()["cached"] is False
+    assert second.get_json()["cached"] is True
+    assert second.get_json()["planning"] == first.get_json()["planning"]
+    assert third.get_json()["cached"] is False
+
+
+def test_generate_planning_route_reuses_solved_monthly_chunks(client):
+    """
+    Test that extending a planning horizon only solves the new monthly chunks.
+    """
+    with patch("app.generate_planning", side_effect=generate_planning) as generate:
+        march = client.post(
+            "/generate-planning",
+            data=json.dumps({"start_date": "2026-03-30", "end_date": "2026-03-31"}),
+            content_type="application/json",
+        )
+        extended = client.post(
+            "/generate-planning",
+            data=json.dumps({"start_date": "2026-03-30", "end_date": "2026-04-02"}),
+            content_type="application/json",
+        )
+        assert generate.call_count == 2
+
+    assert march.status_code == 200
+    assert extended.status_code == 200
+    result = extended.get_json()
+    assert result["cached"] is False
+    assert [run["cached"] for run in result["solver_runs"]] == [True, False]
+    assert result["solver_runs"][1]["chunk_start"] == "2026-04-01"
+    for agent_name, shifts in march.get_json()["planning"].items():
+        assert result["planning"][agent_name][: len(shifts)] == shifts
+
+
+def test_planning_routes_return_429_when_queue_is_full(client):
+    manager = JobManager(max_workers=1, max_queued_jobs=0)
+    release = Event()
+    manager.submit(lambda job: (release.wait(timeout=10), ({}, 200))[1])
+    payload = json.dumps({"start_date": "2026-01-05", "end_date": "2026-01-06"})
+
+    try:
+        with patch("app.get_job_manager", return_value=manager):
+            job_response = client.post(
+                "/planning-jobs", data=payload, content_type="application/json"
+            )
+            sync_response = client.post(
+                "/generate-planning", data=payload, content_type="application/json"
+            )
+    finally:
+        release.set()
+        manager.shutdown()
+
+    for response in (job_response, sync_response):
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == str(DEFAULT_RETRY_AFTER_SECONDS)
+        assert "retry later" in response.get_json()["error"]
+
+
+def test_parallel_chunks_reconcile_month_boundaries(client):
+    config = deepcopy(get_active_config())
+    config["solver"]["parallel_chunks"] = True
+    set_active_config(config)
+
+    response = client.post(
+        "/generate-planning",
+        data=json.dumps({"start_date": "2026-03-30", "end_date": "2026-04-02"}),
+        content_type="application/json",
+    )
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [(run["chunk_start"], run["phase"]) for run in body["solver_runs"]] == [
+        ("2026-03-30", "relaxed"),
+        ("2026-04-01", "relaxed"),
+        ("2026-04-01", "boundary_check"),
+    ]
+
+    # A relaxed chunk breaking a continuity rule at its boundary is solved again
+    planning_request, _ = prepare_planning_request(
+        {"start_date": "2026-03-30", "end_date": "2026-04-02"}
+    )
+    first_april_day = planning_request.calendar.between(
+        datetime(2026, 4, 1), datetime(2026, 4, 1)
+    ).labels[0]
+    relaxed = {
+        name: [(day, vacation) for day, vacation in shifts if day.endswith("-04")]
+        for name, shifts in body["planning"].items()
+    }
+    agent_name = next(
+        name for name, shifts in relaxed.items() if (first_april_day, "Jour") in shifts
+    )
+    last_march_day = planning_request.calendar.between(
+        datetime(2026, 3, 31), datetime(2026, 3, 31)
+    ).labels[0]
+    solver_runs = []
+
+    result, error = _reconcile_chunk(
+        planning_request,
+        {"chunk": 1, "chunks": 2, "chunk_start": "2026-04-01", "chunk_end": "2026-04-02"},
+        {agent_name: [(last_march_day, "Nuit")]},
+        relaxed,
+        solver_runs,
+    )
+
+    assert error is None
+    assert [(run["phase"], run["status"]) for run in solver_runs] == [
+        ("boundary_check", "INFEASIBLE"),
+        ("boundary_repair", "OPTIMAL"),
+    ]
+    assert (first_april_day, "Jour") not in result[agent_name]
+
+
+def test_generate_planning_route_warm_starts_from_prior_plans(client):
+    """
+    Test that a re-solve after a config change is hinted with the last plan of its range.
+    """
+    payload = {"start_date": "2026-01-05", "end_date": "2026-01-06"}
+    first = client.post(
+        "/generate-planning", data=json.dumps(payload), content_type="application/json"
+    )
+    assert first.status_code == 200
+    assert first.get_json()["solver_runs"][0]["hint"]["source"] == "greedy"
+
+    config = deepcopy(get_active_config())
+    config["agents"][0]["preferences"]["preferred"] = ["Nuit"]
+    set_active_config(config)
+    second = client.post(
+        "/generate-planning", data=json.dumps(payload), content_type="application/json"
+    )
+    assert second.status_code == 200
+    hint = second.get_json()["solver_runs"][0]["hint"]
+    assert hint["source"] == "previous_plan"
+    assert hint["shifts"] == sum(len(shifts) for shifts in first.get_json()["planning"].values())
+    assert 0 <= hint["kept"] <= hint["shifts"]
+
+    # A user draft takes precedence over prior plans
+    agent_name = config["agents"][0]["name"]
+    day = second.get_json()["week_schedule"][0]
+    get_result_cache().clear()
+    get_chunk_cache().clear()
+    drafted = client.post(
+        "/generate-planning",
+        data=json.dumps({**payload, "draft_planning": {agent_name: [[day, "Jour"]]}}),
+        content_type="application/json",
+    )
+    assert drafted.status_code == 200
+    assert drafted.get_json()["solver_runs"][0]["hint"]["source"] == "draft"
+    assert drafted.get_json()["solver_runs"][0]["hint"]["shifts"] == 1
+
+    invalid = client.post(
+        "/generate-planning",
+        data=json.dumps({**payload, "draft_planning": []}),
+        content_type="application/json",
+    )
+    assert invalid.status_code == 400
+    assert invalid.get_json() == {"error": "draft_planning must be an object"}
+
+
+def test_generate_planning_route_reports_preflight_issues_of_a_hinted_later_chunk(
+    client, monkeypatch
+):
+    """
+    Test that a later chunk failing the engine's preflight while hinted by a draft gets a 400.
+
+    The route preflights later chunks without their carried-in shifts; the engine checks
+    them again once they are known.
+    """
+    config = team_config(30, 3)
+    config["solver"]["max_seconds_after_first_solution"] = 1
+    set_active_config(config)
+    agent_names = [agent["name"] for agent in config["agents"]]
+    # Nights worked by everyone on the Sunday before the June chunk leave its Monday unstaffed
+    monkeypatch.setattr(
+        "app._carried_shifts",
+        lambda planning_request, planning, chunk_end: {
+            name: [("Dim. 31-05", "Nuit")] for name in agent_names
+        },
+    )
+    payload = {
+        "start_date": "2026-05-25",
+        "end_date": "2026-06-02",
+        "draft_planning": {agent_names[0]: [["Lun. 01-06", "Jour"]]},
+    }
+
+    response = client.post(
+        "/generate-planning", data=json.dumps(payload), content_type="application/json"
+    )
+
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body["info"] == "No solution found: preflight checks failed."
+    assert {issue["rule"] for issue in body["issues"]} == {"staffing_requirements"}
+    assert all(issue["days"] == ["Lun. 01-06"] for issue in body["issues"])
+
+
+def test_generate_planning_route_preview_mode(client):
+    """
+    Test that a preview request is planned without CP-SAT and marked as approximate.
+    """
+    set_active_config(team_config(30, 3))
+    payload = {"start_date": "2026-02-02", "end_date": "2026-03-01", "mode": "preview"}
+    started = time.perf_counter()
+    response = client.post(
+        "/generate-planning", data=json.dumps(payload), content_type="application/json"
+    )
+    assert time.perf_counter() - started < 1
+    assert response.status_code == 200
+    result = response.get_json()
+    assert result["preview"] is True
+    assert len(result["week_schedule"]) == 28
+    assert sum(len(shifts) for shifts in result["planning"].values()) == 28 * 6 + 20 * 3
+    run = result["solver_runs"][0]
+    assert run["status"] == "PREVIEW"
+    assert run["feasible"] is True
+    assert run["best_bound"] is None
+    assert "cached" not in result
+    assert len(get_result_cache()) == 0
+
+    invalid = client.post(
+        "/generate-planning",
+        data=json.dumps({**payload, "mode": "fast"}),
+        content_type="application/json",
+    )
+    assert invalid.status_code == 400
+    assert invalid.get_json() == {"error": "mode must be one of: solve, preview"}
+
+
+def test_generate_planning_route_rejects_infeasible_requests_before_solving(client):
+    """
+    Test that a request failing a preflight check gets a 400 listing the checks, without a job.
+    """
+    payload = {"start_date": "2026-01-05", "end_date": "2026-02-01", "request_id": "impossible"}
+    started = time.perf_counter()
+    response = client.post(
+        "/generate-planning", data=json.dumps(payload), content_type="application/json"
+    )
+    assert time.perf_counter() - started < 1
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body["error"].startswith("Planning is infeasible")
+    rules = {issue["rule"] for issue in body["issues"]}
+    assert {"weekly_shift_limits", "max_weekly_hours"} <= rules
+    assert all(issue["chunk_start"] == "2026-01-05" for issue in body["issues"])
+    assert get_job_manager().get("impossible") is None
@@ -1,4 +1,8 @@
-from solver.engine import _build_registry, generate_planning
+from ortools.sat.python import cp_model
+from solver.constraints.encoding import constraint_counts
+from solver.domain import is_fixed
+from solver.engine import _build_context, _build_registry, generate_planning
+from solver.symmetry import agent_equivalence_classes
 
 
 def _sample_dataset():
@@ -171,3 +175,227 @@ def test_cdp_is_limited_to_two_per_week_per_agent():
     for shifts in result.values():
         cdp_count = sum(1 for _, vacation in shifts if vacation == "CDP")
         assert cdp_count <= 2
+
+
+def test_domain_prepass_stores_blocked_cells_as_constants():
+    """
+    Tests that cells ruled out before model building cost no BoolVar.
+    """
+    agents, vacations, week_schedule = _sample_dataset()
+    agents[1]["restriction"] = ["Jour"]
+    runtime_config = _runtime_config_for_tests()
+    runtime_config["staffing_requirements"]["CDP"] = 0
+
+    ctx = _build_context(
+        agents,
+        vacations,
+        week_schedule,
+        {},
+        [],
+        {},
+        runtime_config,
+    )
+
+    # Agent1 is unavailable on 01-01 and Agent2 is restricted from "Jour".
+    assert ctx.planning[("Agent1", "Lun. 01-01", "Jour")] == 0
+    assert ctx.planning[("Agent2", "Sam. 06-01", "Jour")] == 0
+    assert not is_fixed(ctx.planning[("Agent5", "Sam. 06-01", "Jour")])
+    assert all(ctx.planning[(agent["name"], day, "CDP")] == 0 for agent in agents for day in week_schedule)
+
+    bool_vars = sum(1 for cell in ctx.planning.values() if not is_fixed(cell))
+    assert bool_vars == len(ctx.planning) - len(ctx.fixed_zero_cells)
+    assert len(ctx.model.Proto().variables) < len(ctx.planning)
+
+
+def test_boolean_rules_use_clause_native_encodings():
+    """
+    Tests that per-day Boolean rules are emitted as AtMostOne/ExactlyOne constraints.
+    """
+    agents, vacations, week_schedule = _sample_dataset()
+    ctx = _build_context(
+        agents,
+        vacations,
+        week_schedule,
+        {},
+        [],
+        {},
+        _runtime_config_for_tests(),
+    )
+
+    counts = constraint_counts(ctx.model)
+    assert counts["at_most_one"] > 0
+    assert counts["exactly_one"] > 0
+
+    # No 0/1 cardinality rule is left as a linear sum over Boolean cells.
+    for constraint in ctx.model.Proto().constraints:
+        if constraint.WhichOneof("constraint") != "linear":
+            continue
+        linear = constraint.linear
+        assert not (
+            len(linear.vars) > 1 and set(linear.coeffs) == {1} and linear.domain[-1] <= 1
+        )
+
+
+def test_weekend_rules_share_derived_literals():
+    """
+    Tests that hard and soft weekend rules share one memoized literal per weekend.
+    """
+    agents, vacations, week_schedule = _sample_dataset()
+    runtime_config = _runtime_config_for_tests()
+    runtime_config["solver"]["min_free_weekends_per_horizon"] = 1
+    ctx = _build_context(
+        agents,
+        vacations,
+        week_schedule,
+        {},
+        [],
+        {},
+        runtime_config,
+    )
+
+    saturday = ctx.calendar.index_of("Sam. 06-01")
+    sunday = ctx.calendar.index_of("Dim. 07-01")
+    working_vacations = [ctx.planning.vacation_index["Jour"], ctx.planning.vacation_index["Nuit"]]
+    derived_count = len(ctx.derived)
+
+    # CDP cells are fixed to zero on weekends, so both rules reduce to the same literal.
+    works_weekend = ctx.derived.works_weekend(4, saturday, sunday)
+    assert not is_fixed(works_weekend)
+    assert ctx.derived.works_weekend(4, saturday, sunday, working_vacations) is works_weekend
+    assert ctx.derived.works(4, saturday) is ctx.derived.works(4, saturday, working_vacations)
+    assert len(ctx.derived) == derived_count
+
+
+def test_symmetry_breaking_orders_interchangeable_agents():
+    """
+    Tests that agents with identical settings are grouped and their rows lex-ordered.
+    """
+    agents, vacations, week_schedule = _sample_dataset()
+    for agent in (agents[2], agents[5]):
+        agent["unavailable"] = []
+        agent["training"] = []
+
+    runtime_config = _runtime_config_for_tests()
+    ctx = _build_context(agents, vacations, week_schedule, {}, [], {}, runtime_config)
+    assert agent_equivalence_classes(ctx) == [[2, 5]]
+
+    solver = cp_model.CpSolver()
+    assert solver.Solve(ctx.model) == cp_model.OPTIMAL
+    rows = [
+        [solver.Value(cell) for cell in ctx.planning.agent_slice(agent_idx)]
+        for agent_idx in (2, 5)
+    ]
+    assert rows[0] >= rows[1]
+
+    runtime_config["solver"]["symmetry_breaking"] = False
+    unordered_ctx = _build_context(agents, vacations, week_schedule, {}, [], {}, runtime_config)
+    unordered_solver = cp_model.CpSolver()
+    assert unordered_solver.Solve(unordered_ctx.model) == cp_model.OPTIMAL
+    assert unordered_solver.ObjectiveValue() == solver.ObjectiveValue()
+    assert len(unordered_ctx.model.Proto().constraints) < len(ctx.model.Proto().constraints)
+
+
+def _previous_week_schedule():
+    return [
+        "Lun. 25-12",
+        "Mar. 26-12",
+        "Mer. 27-12",
+        "Jeu. 28-12",
+        "Ven. 29-12",
+        "Sam. 30-12",
+        "Dim. 31-12",
+    ]
+
+
+def test_previous_week_is_a_fixed_assignment_table():
+    """
+    Tests that previous-week days are read as 0/1 constants built from initial shifts.
+    """
+    agents, vacations, week_schedule = _sample_dataset()
+    previous_week_schedule = _previous_week_schedule()
+
+    ctx = _build_context(
+        agents,
+        vacations,
+        week_schedule,
+        {},
+        previous_week_schedule,
+        {"Agent3": [("Dim. 31-12", "Nuit")]},
+        _runtime_config_for_tests(),
+    )
+
+    assert ctx.planning[("Agent3", "Dim. 31-12", "Nuit")] == 1
+    assert all(
+        is_fixed(ctx.planning[(agent["name"], day, vacation)])
+        for agent in agents
+        for day in previous_week_schedule
+        for vacation in vacations
+    )
+    assert sum(ctx.planning[("Agent1", day, "Jour")] for day in previous_week_schedule) == 0
+    # A night on the last previous day rules out any other shift on the first planned day.
+    assert ctx.planning[("Agent3", "Lun. 01-01", "Jour")] == 0
+    assert ctx.planning[("Agent3", "Lun. 01-01", "CDP")] == 0
+    assert not is_fixed(ctx.planning[("Agent3", "Lun. 01-01", "Nuit")])
+
+
+def test_previous_week_without_known_shifts_is_not_read_by_continuity_rules():
+    """
+    Tests that an empty previous week is treated as unknown rather than as a free week.
+    """
+    agents, vacations, week_schedule = _sample_dataset()
+
+    ctx = _build_context(
+        agents,
+        vacations,
+        week_schedule,
+        {},
+        _previous_week_schedule(),
+        {},
+        _runtime_config_for_tests(),
+    )
+
+    assert not ctx.previous_week_assignments
+    assert ctx.continuity_start == ctx.planned_day_offset
+
+
+def test_previous_week_variables_mode_keeps_solver_variables():
+    """
+    Tests that the legacy previous-week mode still creates pinned solver variables.
+    """
+    agents, vacations, week_schedule = _sample_dataset()
+    runtime_config = _runtime_config_for_tests()
+    runtime_config["solver"]["previous_week_mode"] = "variables"
+
+    ctx = _build_context(
+        agents,
+        vacations,
+        week_schedule,
+        {},
+        _previous_week_schedule(),
+        {"Agent3": [("Dim. 31-12", "Nuit")]},
+        runtime_config,
+    )
+
+    assert not is_fixed(ctx.planning[("Agent3", "Dim. 31-12", "Nuit")])
+    assert not is_fixed(ctx.planning[("Agent1", "Dim. 31-12", "Jour")])
+    assert ctx.continuity_start == ctx.planned_day_offset
+
+
+def test_night_carry_over_is_respected_by_solution():
+    """
+    Tests that a night worked on the last previous-week day blocks a day shift on the first day.
+    """
+    agents, vacations, week_schedule = _sample_dataset()
+    result = generate_planning(
+        agents=agents,
+        vacations=vacations,
+        week_schedule=week_schedule,
+        dayOff={},
+        previous_week_schedule=_previous_week_schedule(),
+        initial_shifts={"Agent3": [("Dim. 31-12", "Nuit")]},
+        runtime_config=_runtime_config_for_tests(),
+    )
+
+    assert "info" not in result
+    first_day_shifts = {vacation for day, vacation in result["Agent3"] if day == "Lun. 01-01"}
+    assert first_day_shifts <= {"Nuit"}
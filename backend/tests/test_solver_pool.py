@@ -0,0 +1,137 @@
+import os
+import signal
+import threading
+import time
+
+from app import get_week_schedule
+import pytest
+from ortools.sat.python import cp_model
+from solver.engine import diagnose_planning, generate_planning
+from solver.pool import SolverPool, SolverWorkerError
+from tests.factories import build_runtime_config, jour_config, jour_planning_kwargs
+
+
+@pytest.fixture(scope="module")
+def solver_pool():
+    pool = SolverPool(1, cpus_per_process=1)
+    yield pool
+    pool.close()
+
+
+def _golomb_ruler_model(marks):
+    # Proving the optimal ruler takes far longer than these tests wait
+    model = cp_model.CpModel()
+    upper_bound = marks * marks
+    positions = [model.NewIntVar(0, upper_bound, f"mark_{i}") for i in range(marks)]
+    model.Add(positions[0] == 0)
+    for left, right in zip(positions, positions[1:]):
+        model.Add(right > left)
+    distances = []
+    for i in range(marks):
+        for j in range(i + 1, marks):
+            distance = model.NewIntVar(0, upper_bound, f"distance_{i}_{j}")
+            model.Add(distance == positions[j] - positions[i])
+            distances.append(distance)
+    model.AddAllDifferent(distances)
+    model.Minimize(positions[-1])
+    return model
+
+
+def _long_solve(pool, solution_callback=None):
+    solver = pool.solver()
+    solver.parameters.max_time_in_seconds = 60
+    outcome = {}
+
+    def solve():
+        try:
+            outcome["status"] = solver.Solve(_golomb_ruler_model(11), solution_callback)
+        except SolverWorkerError as exc:
+            outcome["error"] = exc
+
+    thread = threading.Thread(target=solve)
+    thread.start()
+    return solver, thread, outcome
+
+
+def test_solver_pool_runs_planning_out_of_process(solver_pool, monkeypatch):
+    vacations = ["Jour"]
+    runtime_config = build_runtime_config(
+        vacations=vacations,
+        vacation_durations={"Jour": 12, "Conge": 7},
+        staffing_requirements={"Jour": 2},
+    )
+    runtime_config["solver"]["relative_gap_limit"] = 0
+    agents = runtime_config["agents"]
+    kwargs = {
+        "agents": agents,
+        "vacations": vacations,
+        "week_schedule": get_week_schedule("2026-01-05", "2026-01-06"),
+        "dayOff": {agent["name"]: [] for agent in agents},
+        "previous_week_schedule": get_week_schedule("2025-12-29", "2026-01-04"),
+        "initial_shifts": {},
+        "runtime_config": runtime_config,
+        "planning_start_date": "2026-01-05",
+    }
+    local_summaries = []
+    pooled_summaries = []
+    solutions = []
+
+    generate_planning(**kwargs, on_finish=local_summaries.append)
+
+    # The greedy hint completion must run in the pool too, not in this process
+    def no_local_solver():
+        raise AssertionError("CP-SAT solve outside the solver pool")
+
+    monkeypatch.setattr(cp_model, "CpSolver", no_local_solver)
+    result = generate_planning(
+        **kwargs,
+        on_solution=solutions.append,
+        on_finish=pooled_summaries.append,
+        solver_pool=solver_pool,
+    )
+
+    assert "info" not in result
+    assert sorted(result) == ["Agent1", "Agent2", "Agent3"]
+    assert pooled_summaries[0]["status"] == "OPTIMAL"
+    assert pooled_summaries[0]["objective"] == local_summaries[0]["objective"]
+    assert pooled_summaries[0]["hint"]["feasible"] is True
+    assert solutions and solutions[-1]["planning"] == result
+
+
+def test_solver_pool_stops_searches_and_replaces_dead_workers(solver_pool):
+    class StopAtFirstSolution:
+        def report(self, solution):
+            solution.StopSearch()
+
+    solver, thread, outcome = _long_solve(solver_pool, StopAtFirstSolution())
+    thread.join(timeout=20)
+    assert not thread.is_alive()
+    assert solver.StatusName(outcome["status"]) == "FEASIBLE"
+    assert solver.WallTime() < 20
+
+    pid = solver_pool.pids[0]
+    solver, thread, outcome = _long_solve(solver_pool)
+    time.sleep(1)
+    os.kill(pid, signal.SIGKILL)
+    thread.join(timeout=20)
+    assert isinstance(outcome["error"], SolverWorkerError)
+    assert solver_pool.pids[0] != pid
+
+    model = cp_model.CpModel()
+    value = model.NewIntVar(0, 5, "value")
+    model.Maximize(value)
+    solver = solver_pool.solver()
+    assert solver.Solve(model) == cp_model.OPTIMAL
+    assert solver.Value(value) == 5
+
+
+def test_solver_pool_runs_the_infeasibility_diagnosis(solver_pool):
+    # Three agents must each work once, but two days only staff two shifts
+    kwargs = jour_planning_kwargs(jour_config(), "2026-01-06")
+
+    local = diagnose_planning(**kwargs)
+    pooled = diagnose_planning(**kwargs, solver_pool=solver_pool)
+
+    assert pooled["status"] == "INFEASIBLE"
+    assert pooled["minimal"] is True
+    assert pooled["conflict"] == local["conflict"]